@@ -7,7 +7,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config.config import API_CONFIG
+from config.config import API_CONFIG, MODEL_LOADING_CONFIG, ANOMALY_CONFIG
 
 # Setup logging
 logging.basicConfig(
@@ -22,12 +22,35 @@ def create_app():
     """
     app = Flask(__name__)
     
+    # JSON provider: orjson + numpy/pandas/date types untuk semua jsonify()
+    from api.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Enable CORS untuk semua routes
     CORS(app)
     
     # Configuration
     app.config.update(API_CONFIG)
-    
+
+    # ==================== DATABASE SCHEMA ====================
+    try:
+        from src.data.database import get_connection
+        from src.data.migrations import upgrade
+        with get_connection() as conn:
+            applied = upgrade(conn)
+        if applied:
+            print(f"✅ Applied database migrations: {applied}")
+    except Exception as e:
+        print(f"❌ Database migration failed: {e}")
+
+    try:
+        from src.services.training_jobs import get_job_manager
+        interrupted = get_job_manager().recover_interrupted()
+        if interrupted:
+            print(f"⚠️ Marked {len(interrupted)} interrupted training job(s) as failed")
+    except Exception as e:
+        print(f"❌ Training job recovery failed: {e}")
+
     # ==================== MANUAL BLUEPRINT REGISTRATION ====================
     print("🔧 Registering blueprints...")
     
@@ -47,12 +70,29 @@ def create_app():
     except Exception as e:
         print(f"❌ Analytics blueprint failed: {e}")
     
+    try:
+        # Register dashboard blueprint (summary + categories + trend dalam satu request)
+        from routes.dashboard import dashboard_bp
+        app.register_blueprint(dashboard_bp, url_prefix='/api/v1/dashboard')
+        print("✅ Dashboard blueprint registered")
+    except Exception as e:
+        print(f"❌ Dashboard blueprint failed: {e}")
+    
     try:
         # Register AI blueprint - FORCE IMPORT
         print("🔄 Attempting to import AI blueprint...")
-        from routes.ai_routes import ai_bp
+        from routes.ai_routes import ai_bp, init_ai_models
         print("✅ AI blueprint imported successfully")
         
+        if not MODEL_LOADING_CONFIG['lazy']:
+            init_ai_models()
+            print("✅ AI models preloaded")
+        elif ANOMALY_CONFIG['streaming']:
+            # Streaming scoring tidak load model di dalam write transaction, jadi load sekarang
+            from src.services.model_service import model_handles
+            model_handles['anomaly_detector'].current()
+            print("✅ Anomaly detector preloaded for streaming scoring")
+        
         app.register_blueprint(ai_bp, url_prefix='/api/v1/ai')
         print("✅ AI blueprint registered")
         
@@ -79,7 +119,17 @@ def create_app():
                     'path': str(rule)
                 })
         return jsonify({"routes": routes, "count": len(routes)})
-    
+
+    @app.route('/debug/db-pool')
+    def debug_db_pool():
+        from src.data.database import get_pool
+        return jsonify({"status": "success", "data": get_pool().stats()})
+
+    @app.route('/debug/analytics-cache')
+    def debug_analytics_cache():
+        from api.utils.response_cache import analytics_cache
+        return jsonify({"status": "success", "data": analytics_cache.stats()})
+
     # Health check endpoint
     @app.route('/api/v1/health', methods=['GET'])
     def health_check():
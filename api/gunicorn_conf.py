@@ -0,0 +1,79 @@
+"""
+Gunicorn configuration, semua nilai dari SERVER_CONFIG di config/config.py.
+
+    gunicorn -c api/gunicorn_conf.py
+
+Signals:
+    HUP   reload: models di master di-update ke versi aktif di registry,
+          worker baru di-fork lalu worker lama berhenti setelah request selesai
+    TTIN/TTOU  tambah/kurangi worker
+"""
+import gc
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config.config import SERVER_CONFIG
+
+chdir = str(Path(__file__).parent)
+wsgi_app = 'wsgi:app'
+
+bind = SERVER_CONFIG['bind']
+workers = SERVER_CONFIG['workers']
+threads = SERVER_CONFIG['threads']
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = SERVER_CONFIG['preload_app']
+max_requests = SERVER_CONFIG['max_requests']
+max_requests_jitter = SERVER_CONFIG['max_requests_jitter']
+timeout = SERVER_CONFIG['timeout']
+graceful_timeout = SERVER_CONFIG['graceful_timeout']
+keepalive = SERVER_CONFIG['keepalive']
+accesslog = SERVER_CONFIG['accesslog']
+loglevel = SERVER_CONFIG['loglevel']
+
+
+def _prepare_fork(server):
+    """Dipanggil di master sebelum fork"""
+    from src.data.database import get_pool
+
+    # Koneksi SQLite tidak boleh diwarisi worker
+    get_pool().close_all()
+    # Object hasil preload dipindah ke permanent generation: GC di worker tidak
+    # menyentuh (dan meng-copy) page-nya
+    gc.freeze()
+    server.log.info(f"Master ready to fork: {gc.get_freeze_count()} objects frozen")
+
+
+def when_ready(server):
+    if preload_app:
+        _prepare_fork(server)
+
+
+def on_reload(server):
+    """SIGHUP: load versi model terbaru di master supaya worker baru langsung memakainya"""
+    if not preload_app:
+        return
+    from src.services.model_service import model_handles
+
+    for name, handle in model_handles.items():
+        try:
+            handle.load()
+        except Exception as e:
+            server.log.warning(f"Reload of {name} failed, keeping current version: {e}")
+    _prepare_fork(server)
+
+
+def post_fork(server, worker):
+    from src.services.training_jobs import get_job_manager
+
+    # Training job milik worker yang di-recycle/mati ditandai failed
+    try:
+        get_job_manager().recover_interrupted()
+    except Exception as e:
+        server.log.warning(f"Training job recovery failed in worker {worker.pid}: {e}")
+
+
+def worker_exit(server, worker):
+    from src.services.training_jobs import shutdown_job_manager
+
+    shutdown_job_manager(wait=False)
@@ -6,32 +6,23 @@ import pandas as pd
 
 # Import ML models
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from src.models.category_predictor import CategoryPredictor
-from src.models.spending_predictor import SpendingPredictor
-from src.models.anomaly_detector import AnomalyDetector
-from config.config import DATABASE_CONFIG
+from src.models.registry import ModelNotAvailableError
+from config.config import AI_CONFIG, ANOMALY_CONFIG, DATA_LOADING_CONFIG, JOBS_CONFIG
+from src.data.database import get_connection
+from src.data import spending_features
+from src.data.loaders import load_transactions, ANOMALY_COLUMNS, CATEGORY_TRAINING_WHERE
+from src.services.training_jobs import get_job_manager, TASKS
+from src.services.model_service import model_handles, init_ai_models
+from src.services import anomaly_scoring
 
 ai_bp = Blueprint('ai', __name__)
 logger = logging.getLogger(__name__)
 
-# Global model instances
-category_model = CategoryPredictor()
-spending_predictor = SpendingPredictor()
-anomaly_detector = AnomalyDetector()
+job_manager = get_job_manager()
 
-def init_ai_models():
-    """Initialize semua AI models"""
-    try:
-        models_dir = Path(__file__).parent.parent.parent / "models"
-        
-        # Load existing models
-        category_model.load_model(models_dir / "category_model")
-        spending_predictor.load_model(models_dir / "spending_predictor") 
-        anomaly_detector.load_model(models_dir / "anomaly_detector")
-        
-        logger.info("AI models initialization completed")
-    except Exception as e:
-        logger.info("Some AI models need training")
+def _is_number(value):
+    """int/float JSON, bool tidak dihitung sebagai angka"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
 
 @ai_bp.route('/categorize', methods=['POST'])
 def categorize_transaction():
@@ -46,30 +37,26 @@ def categorize_transaction():
             }), 400
         
         description = data['description']
-        amount = data.get('amount', 0)
+        amount = data.get('amount') or 0
         
-        # Predict menggunakan ML model
-        if category_model.is_trained:
-            predicted_category, confidence = category_model.predict_single(description, amount)
-            model_type = "ml_model"
-        else:
-            # Fallback ke rule-based
-            predicted_category = categorize_by_rules(description, amount)
-            confidence = 0.6
-            model_type = "rule_based"
+        if not isinstance(description, str):
+            return jsonify({
+                "status": "error",
+                "message": "description must be a string"
+            }), 400
+        
+        if not _is_number(amount):
+            return jsonify({
+                "status": "error",
+                "message": "amount must be a number"
+            }), 400
         
-        # Get alternative categories dengan confidence
-        alternative_categories = get_alternative_categories(description, amount)
+        # Single item memakai batch path yang sama
+        result = categorize_batch([description], [amount])[0]
         
         return jsonify({
             "status": "success",
-            "data": {
-                "description": description,
-                "predicted_category": predicted_category,
-                "confidence": confidence,
-                "model_version": model_type,
-                "alternative_categories": alternative_categories
-            }
+            "data": result
         })
         
     except Exception as e:
@@ -79,73 +66,234 @@ def categorize_transaction():
             "message": f"AI categorization failed: {str(e)}"
         }), 500
 
-@ai_bp.route('/train-category-model', methods=['POST'])
-def train_category_model():
-    """Train atau retrain category prediction model"""
+@ai_bp.route('/categorize/batch', methods=['POST'])
+def categorize_transactions_batch():
+    """
+    Categorize banyak descriptions dengan satu model pass
+    Body: {"transactions": [{"description": ..., "amount": ...}], "k": 3}
+    """
     try:
-        # Get transaction data dari database
-        import sqlite3
-        conn = sqlite3.connect(DATABASE_CONFIG['path'])
+        data = request.get_json()
         
-        query = """
-            SELECT description, category, amount 
-            FROM transactions 
-            WHERE description IS NOT NULL AND category IS NOT NULL
-            AND LENGTH(description) > 3
-        """
+        if not data or not isinstance(data.get('transactions'), list) or not data['transactions']:
+            return jsonify({
+                "status": "error",
+                "message": "No transactions provided"
+            }), 400
         
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        items = data['transactions']
+        if len(items) > AI_CONFIG['categorize_batch_max']:
+            return jsonify({
+                "status": "error",
+                "message": f"Batch too large. Maximum {AI_CONFIG['categorize_batch_max']} transactions per request."
+            }), 400
         
-        if len(df) < 10:
+        if any(not isinstance(item, dict) or 'description' not in item for item in items):
             return jsonify({
                 "status": "error",
-                "message": "Not enough training data. Need at least 10 transactions."
+                "message": "Every transaction needs a description"
+            }), 400
+        
+        # Rule fallback memanggil description.lower(): satu item salah tidak boleh jadi 500 untuk semua
+        invalid = next((i for i, item in enumerate(items) if not isinstance(item['description'], str)), None)
+        if invalid is not None:
+            return jsonify({
+                "status": "error",
+                "message": f"transactions[{invalid}].description must be a string"
             }), 400
         
-        # Train model
-        accuracy = category_model.train(df)
+        # Rule fallback membandingkan amount > 5000000: amount string juga harus ditolak di sini
+        amounts = [item.get('amount') or 0 for item in items]
+        invalid = next((i for i, amount in enumerate(amounts) if not _is_number(amount)), None)
+        if invalid is not None:
+            return jsonify({
+                "status": "error",
+                "message": f"transactions[{invalid}].amount must be a number"
+            }), 400
         
-        # Save model
-        models_dir = Path(__file__).parent.parent.parent / "models" / "category_model"
-        category_model.save_model(models_dir)
+        k = data.get('k', 3)
+        if not isinstance(k, int) or isinstance(k, bool) or not 1 <= k <= 10:
+            return jsonify({
+                "status": "error",
+                "message": "k must be an integer between 1 and 10"
+            }), 400
         
-        # Convert categories to list properly
-        categories_list = []
-        if category_model.categories is not None:
-            if hasattr(category_model.categories, 'tolist'):
-                categories_list = category_model.categories.tolist()
-            else:
-                categories_list = list(category_model.categories)
+        results = categorize_batch(
+            [item['description'] for item in items],
+            amounts,
+            k=k
+        )
         
         return jsonify({
             "status": "success",
             "data": {
-                "training_samples": len(df),
-                "accuracy": accuracy,
-                "categories": categories_list,
-                "model_saved": True
+                "results": results,
+                "count": len(results)
             }
         })
         
     except Exception as e:
-        logger.error(f"Error training model: {str(e)}")
+        logger.error(f"Error in batch AI categorization: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Batch AI categorization failed: {str(e)}"
+        }), 500
+
+@ai_bp.route('/train-category-model', methods=['POST'])
+def train_category_model():
+    """Train atau retrain category prediction model (background job)"""
+    try:
+        if not check_training_data_availability():
+            return jsonify({
+                "status": "error",
+                "message": "Not enough training data. Need at least 10 transactions."
+            }), 400
+        
+        job, created = job_manager.submit('category_model')
+        
+        return jsonify({
+            "status": "accepted",
+            "message": "Training job started" if created else "Training job already running",
+            "data": job
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error starting training job: {str(e)}")
         return jsonify({
             "status": "error",
             "message": f"Model training failed: {str(e)}"
         }), 500
 
+# ==================== TRAINING JOBS ====================
+
+@ai_bp.route('/jobs', methods=['POST'])
+def create_training_job():
+    """
+    Start training di background process
+    Body: {"type": "category_model" | "spending_predictor" | "anomaly_detector", "params": {}}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        job_type = data.get('type')
+        
+        if job_type not in TASKS:
+            return jsonify({
+                "status": "error",
+                "message": f"Invalid job type. Available: {', '.join(TASKS)}"
+            }), 400
+        
+        job, created = job_manager.submit(job_type, data.get('params'))
+        
+        if not created:
+            return jsonify({
+                "status": "error",
+                "message": f"A {job_type} job is already {job['status']}",
+                "data": job
+            }), 409
+        
+        return jsonify({
+            "status": "accepted",
+            "data": job
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error creating training job: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to create training job: {str(e)}"
+        }), 500
+
+@ai_bp.route('/jobs', methods=['GET'])
+def list_training_jobs():
+    """Job history, terbaru dulu (?type=&status=&limit=)"""
+    try:
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+        jobs = job_manager.list_jobs(
+            limit=limit,
+            job_type=request.args.get('type'),
+            status=request.args.get('status')
+        )
+        
+        return jsonify({
+            "status": "success",
+            "data": jobs,
+            "count": len(jobs)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error listing training jobs: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to list training jobs: {str(e)}"
+        }), 500
+
+@ai_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_training_job(job_id):
+    """Status dan progress satu job"""
+    try:
+        job = job_manager.get(job_id)
+        
+        if not job:
+            return jsonify({
+                "status": "error",
+                "message": "Job not found"
+            }), 404
+        
+        return jsonify({
+            "status": "success",
+            "data": job
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting training job {job_id}: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to get training job: {str(e)}"
+        }), 500
+
+@ai_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_training_job(job_id):
+    """Cancel job yang masih queued/running"""
+    try:
+        job = job_manager.cancel(job_id)
+        
+        if not job:
+            return jsonify({
+                "status": "error",
+                "message": "Job not found"
+            }), 404
+        
+        if not job['cancel_requested']:
+            return jsonify({
+                "status": "error",
+                "message": f"Job already {job['status']}",
+                "data": job
+            }), 409
+        
+        return jsonify({
+            "status": "success",
+            "message": "Cancellation requested",
+            "data": job
+        })
+        
+    except Exception as e:
+        logger.error(f"Error cancelling training job {job_id}: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to cancel training job: {str(e)}"
+        }), 500
+
 @ai_bp.route('/model-status', methods=['GET'])
 def get_model_status():
     """Get AI model status"""
+    category_model = model_handles['category_model'].current()
     
     # Convert categories to list properly
     categories_list = []
-    if category_model.categories is not None:
-        if hasattr(category_model.categories, 'tolist'):
-            categories_list = category_model.categories.tolist()
-        else:
-            categories_list = list(category_model.categories)
+    if category_model.is_trained and hasattr(category_model.model, 'classes_'):
+        categories_list = [str(category) for category in category_model.model.classes_]
+    elif category_model.categories is not None:
+        categories_list = list(category_model.categories)
     
     return jsonify({
         "status": "success",
@@ -153,28 +301,60 @@ def get_model_status():
             "is_trained": category_model.is_trained,
             "model_type": "category_predictor",
             "categories": categories_list,
-            "training_ready": check_training_data_availability()
+            "training_ready": check_training_data_availability(),
+            "prediction_cache": category_model.prediction_cache.stats(),
+            "active_jobs": job_manager.list_jobs(status='running') + job_manager.list_jobs(status='queued'),
+            "models": {name: handle.status() for name, handle in model_handles.items()}
         }
     })
 
+@ai_bp.route('/models/<name>/rollback', methods=['POST'])
+def rollback_model(name):
+    """Kembali ke versi model sebelumnya"""
+    try:
+        handle = model_handles.get(name)
+        if handle is None:
+            return jsonify({
+                "status": "error",
+                "message": f"Unknown model. Available: {', '.join(model_handles)}"
+            }), 404
+        
+        version = handle.rollback()
+        
+        return jsonify({
+            "status": "success",
+            "message": f"{name} rolled back to version {version}",
+            "data": handle.status()
+        })
+        
+    except ModelNotAvailableError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 409
+    except Exception as e:
+        logger.error(f"Error rolling back {name}: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Model rollback failed: {str(e)}"
+        }), 500
+
 @ai_bp.route('/predict-spending', methods=['GET'])
 def predict_spending():
     """Predict next month's spending"""
     try:
-        # Get transaction data
-        import sqlite3
-        conn = sqlite3.connect(DATABASE_CONFIG['path'])
-        df = pd.read_sql_query("SELECT * FROM transactions", conn)
-        conn.close()
+        spending_predictor = model_handles['spending_predictor'].current()
+        if not spending_predictor.is_trained:
+            return model_not_trained_response('spending_predictor')
         
-        # Train model jika belum trained
-        if not spending_predictor.is_trained and len(df) >= 3:
-            accuracy = spending_predictor.train(df)
-            if accuracy > 0:
-                spending_predictor.save_model(Path(__file__).parent.parent.parent / "models" / "spending_predictor")
+        # Feature vector bulan terakhir di-maintain saat write, tidak perlu baca semua transaksi
+        with get_connection() as conn:
+            features = spending_features.latest(conn)
         
-        # Get prediction
-        prediction = spending_predictor.predict_next_month(df)
+        if features is None:
+            prediction = {"error": "No expense data available"}
+        else:
+            prediction = spending_predictor.predict_from_features(features)
         
         return jsonify({
             "status": "success",
@@ -192,20 +372,26 @@ def predict_spending():
 def detect_anomalies():
     """Detect anomalous transactions"""
     try:
-        # Get transaction data
-        import sqlite3
-        conn = sqlite3.connect(DATABASE_CONFIG['path'])
-        df = pd.read_sql_query("SELECT * FROM transactions", conn)
-        conn.close()
+        anomaly_detector = model_handles['anomaly_detector'].current()
+        if not anomaly_detector.is_trained:
+            return model_not_trained_response('anomaly_detector')
         
-        # Train model jika belum trained
-        if not anomaly_detector.is_trained and len(df) >= 10:
-            accuracy = anomaly_detector.train(df)
-            if accuracy > 0:
-                anomaly_detector.save_model(Path(__file__).parent.parent.parent / "models" / "anomaly_detector")
+        top_n = ANOMALY_CONFIG['top_n']
         
-        # Detect anomalies
-        anomalies = anomaly_detector.detect_anomalies(df)
+        if ANOMALY_CONFIG['streaming']:
+            # Score sudah disimpan saat insert: cukup baca index (is_anomaly, anomaly_score)
+            with get_connection() as conn:
+                anomalies = anomaly_scoring.top_anomalies(conn, anomaly_detector, top_n=top_n)
+        else:
+            # Hanya expense dan kolom yang dipakai detector
+            with get_connection() as conn:
+                df = load_transactions(
+                    conn, ANOMALY_COLUMNS, where="transaction_type = 'expense'",
+                    engine=DATA_LOADING_CONFIG['engine']
+                )
+            
+            # Detect anomalies
+            anomalies = anomaly_detector.detect_anomalies(df, top_n=top_n)
         
         return jsonify({
             "status": "success",
@@ -223,24 +409,25 @@ def detect_anomalies():
 def get_financial_insights():
     """Get comprehensive financial insights"""
     try:
-        import sqlite3
-        conn = sqlite3.connect(DATABASE_CONFIG['path'])
-        df = pd.read_sql_query("SELECT * FROM transactions", conn)
-        conn.close()
+        # Rollup cuma berisi (bulan x tipe x kategori), bukan semua transaksi
+        with get_connection() as conn:
+            df = pd.read_sql_query("""
+                SELECT year_month, transaction_type, NULLIF(category, '') as category, total_amount
+                FROM transaction_rollups
+            """, conn)
         
         # Basic analytics
-        total_income = df[df['transaction_type'] == 'income']['amount'].sum()
-        total_expense = df[df['transaction_type'] == 'expense']['amount'].sum()
+        total_income = df[df['transaction_type'] == 'income']['total_amount'].sum()
+        total_expense = df[df['transaction_type'] == 'expense']['total_amount'].sum()
         savings_rate = (total_income - total_expense) / total_income if total_income > 0 else 0
         
         # Category insights
-        expense_by_category = df[df['transaction_type'] == 'expense'].groupby('category')['amount'].sum()
+        expense_df = df[df['transaction_type'] == 'expense']
+        expense_by_category = expense_df.groupby('category')['total_amount'].sum()
         top_category = expense_by_category.idxmax() if not expense_by_category.empty else "No data"
         
         # Monthly trends
-        df['date'] = pd.to_datetime(df['date'])
-        df['month'] = df['date'].dt.to_period('M')
-        monthly_expense = df[df['transaction_type'] == 'expense'].groupby('month')['amount'].sum()
+        monthly_expense = expense_df.groupby('year_month')['total_amount'].sum()
         
         insights = {
             "financial_health": {
@@ -299,51 +486,101 @@ def categorize_by_rules(description, amount=0):
     else:
         return "Lainnya"
 
-def get_alternative_categories(description, amount=0):
-    """Get alternative categories dengan confidence scores"""
-    alternatives = []
+DEFAULT_ALTERNATIVES = [
+    {"category": "Makanan", "confidence": 0.3},
+    {"category": "Transportasi", "confidence": 0.3},
+    {"category": "Lainnya", "confidence": 0.4}
+]
+
+def categorize_batch(descriptions, amounts, k=3):
+    """Predict category + alternatives untuk semua descriptions dari satu probability matrix"""
+    predictions = None
+    category_model = model_handles['category_model'].current()
     
     if category_model.is_trained:
         try:
-            # Get probabilities for all categories
-            processed_desc = category_model.preprocess_text(description)
-            features = category_model.prepare_features([processed_desc])
-            probabilities = category_model.model.predict_proba(features)[0]
-            
-            for category, prob in zip(category_model.categories, probabilities):
-                if prob > 0.1:  # Only show categories with >10% probability
-                    alternatives.append({
-                        "category": category,
-                        "confidence": float(prob)
-                    })
-            
-            # Sort by confidence
-            alternatives.sort(key=lambda x: x["confidence"], reverse=True)
-            
+            # Only show alternatives with >10% probability
+            predictions = category_model.predict_topk(descriptions, k=k, amounts=amounts, min_confidence=0.1)
         except Exception as e:
-            logger.error(f"Error getting alternatives: {e}")
+            logger.error(f"Error in batch prediction: {e}")
     
-    # Jika tidak ada alternatives, berikan default
-    if not alternatives:
-        alternatives = [
-            {"category": "Makanan", "confidence": 0.3},
-            {"category": "Transportasi", "confidence": 0.3},
-            {"category": "Lainnya", "confidence": 0.4}
-        ]
+    results = []
+    for i, (description, amount) in enumerate(zip(descriptions, amounts)):
+        if predictions is not None:
+            prediction = predictions[i]
+            predicted_category = prediction["predicted_category"]
+            confidence = prediction["confidence"]
+            alternatives = prediction["alternatives"]
+            model_type = "ml_model"
+        else:
+            # Fallback ke rule-based
+            predicted_category = categorize_by_rules(description, amount)
+            confidence = 0.6
+            alternatives = []
+            model_type = "rule_based"
+        
+        results.append({
+            "description": description,
+            "predicted_category": predicted_category,
+            "confidence": confidence,
+            "model_version": model_type,
+            # Jika tidak ada alternatives, berikan default
+            "alternative_categories": alternatives or DEFAULT_ALTERNATIVES[:k]
+        })
+    
+    return results
+
+def model_not_trained_response(job_type):
+    """
+    Jangan train di request thread: queue background job dan minta client poll /jobs/<id>.
+    Tidak ada job baru jika data belum cukup atau job terakhir baru saja failed.
+    """
+    if not check_training_data_availability(job_type):
+        return jsonify({
+            "status": "success",
+            "data": {
+                "error": f"Model not trained yet. Not enough training data. {TRAINING_DATA_REQUIREMENTS[job_type][2]}"
+            }
+        })
     
-    return alternatives[:3]  # Return top 3 alternatives
+    job, created = job_manager.submit(job_type, retry_after=JOBS_CONFIG['auto_retry_after'])
+    if not created and job['status'] == 'failed':
+        message = f"Model not trained yet. Last training job failed: {job['error']}"
+    else:
+        message = "Model not trained yet. Training started in background, try again shortly."
+    
+    return jsonify({
+        "status": "success",
+        "data": {
+            "error": message,
+            "training_job": job
+        }
+    })
+
+# job_type -> (COUNT query, minimum, pesan) sesuai syarat minimum di training task
+TRAINING_DATA_REQUIREMENTS = {
+    'category_model': (
+        f"SELECT COUNT(*) FROM transactions WHERE {CATEGORY_TRAINING_WHERE}",
+        10, "Need at least 10 transactions."
+    ),
+    'spending_predictor': (
+        "SELECT COUNT(*) FROM monthly_spending_features",
+        3, "Need at least 3 months of expenses."
+    ),
+    'anomaly_detector': (
+        "SELECT COUNT(*) FROM transactions WHERE transaction_type = 'expense'",
+        10, "Need at least 10 expense transactions."
+    ),
+}
 
-def check_training_data_availability():
+def check_training_data_availability(job_type='category_model'):
     """Check if enough data available for training"""
+    query, minimum, _ = TRAINING_DATA_REQUIREMENTS[job_type]
     try:
-        import sqlite3
-        conn = sqlite3.connect(DATABASE_CONFIG['path'])
+        with get_connection() as conn:
+            result = conn.execute(query).fetchone()
         
-        query = "SELECT COUNT(*) as count FROM transactions WHERE description IS NOT NULL AND category IS NOT NULL"
-        result = conn.execute(query).fetchone()
-        conn.close()
-        
-        return result[0] >= 10  # Minimum 10 samples
+        return result[0] >= minimum
     except:
         return False
 
@@ -356,7 +593,4 @@ def get_financial_recommendation(savings_rate):
     elif savings_rate >= 0:
         return "Positive savings. Look for opportunities to reduce expenses."
     else:
-        return "Spending exceeds income. Review expenses and create a budget."
-
-# Initialize models on import
-init_ai_models()
\ No newline at end of file
+        return "Spending exceeds income. Review expenses and create a budget."
\ No newline at end of file
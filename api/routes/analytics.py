@@ -1,105 +1,166 @@
 from flask import Blueprint, request, jsonify
-import sqlite3
-import pandas as pd
 from datetime import datetime, timedelta
 import logging
-import numpy as np
 import sys
 from pathlib import Path
 
 # Import config
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import DATABASE_CONFIG
+from src.data.database import get_connection
+from api.utils.response_cache import cached_response
+from api.utils.json_provider import fetch_records
 
 # Blueprint Definition
 analytics_bp = Blueprint('analytics', __name__)
 logger = logging.getLogger(__name__)
 
-def convert_to_serializable(obj):
-    """Convert numpy/pandas types to native Python types for JSON serialization"""
-    if pd.isna(obj) or obj is None:
-        return 0
-    elif isinstance(obj, (np.integer, np.int64)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64)):
-        return float(obj)
-    elif isinstance(obj, (np.bool_)):
-        return bool(obj)
+# Sentinel tanpa as_of: lebih besar dari semua year_month/date ISO
+NO_CUTOFF = '9999-99-99'
+
+# Satu query: bulan penuh dari rollup + (jika as_of) sisa bulan as_of dari range date di index
+SUMMARY_QUERY = """
+    WITH scoped AS (
+        SELECT year_month, transaction_type, NULLIF(category, '') as category,
+               total_amount as amount, txn_count
+        FROM transaction_rollups
+        WHERE year_month < :cutoff_month
+        UNION ALL
+        SELECT year_month, transaction_type, category, amount, 1
+        FROM transactions
+        WHERE date >= :cutoff_start AND date < :end_date
+    )
+    SELECT 
+        SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END) as total_income,
+        SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) as total_expense,
+        SUM(txn_count) as total_transactions,
+        COUNT(DISTINCT category) as unique_categories,
+        SUM(CASE WHEN year_month = :month AND transaction_type = 'income' THEN amount ELSE 0 END) as monthly_income,
+        SUM(CASE WHEN year_month = :month AND transaction_type = 'expense' THEN amount ELSE 0 END) as monthly_expense,
+        (SELECT MIN(date) FROM transactions WHERE date < :end_date) as first_transaction_date,
+        (SELECT MAX(date) FROM transactions WHERE date < :end_date) as last_transaction_date
+    FROM scoped
+"""
+
+def parse_summary_period(args):
+    """
+    month (YYYY-MM, default bulan berjalan atau bulan as_of) dan as_of (YYYY-MM-DD, inklusif).
+    Raise ValueError jika format tidak valid.
+    """
+    as_of = args.get('as_of')
+    month = args.get('month')
+    
+    if as_of:
+        try:
+            as_of = datetime.strptime(as_of, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError("Invalid as_of. Use YYYY-MM-DD")
+    
+    if month:
+        try:
+            month = datetime.strptime(month, '%Y-%m').strftime('%Y-%m')
+        except ValueError:
+            raise ValueError("Invalid month. Use YYYY-MM")
+    else:
+        month = (as_of or datetime.now()).strftime('%Y-%m')
+    
+    return month, as_of
+
+def query_financial_summary(conn, month, as_of=None):
+    """Overall + monthly summary dalam satu query, dibaca langsung dari cursor"""
+    if as_of:
+        params = {
+            "cutoff_month": as_of.strftime('%Y-%m'),
+            "cutoff_start": as_of.replace(day=1).isoformat(),
+            "end_date": (as_of + timedelta(days=1)).isoformat()
+        }
     else:
-        return obj
+        params = {"cutoff_month": NO_CUTOFF, "cutoff_start": NO_CUTOFF, "end_date": NO_CUTOFF}
+    params["month"] = month
+    
+    (total_income, total_expense, total_transactions, unique_categories,
+     monthly_income, monthly_expense, first_date, last_date) = conn.execute(SUMMARY_QUERY, params).fetchone()
+    
+    total_income = total_income or 0
+    total_expense = total_expense or 0
+    monthly_income = monthly_income or 0
+    monthly_expense = monthly_expense or 0
+    
+    return {
+        "overall": {
+            "total_income": total_income,
+            "total_expense": total_expense,
+            "balance": total_income - total_expense,
+            "total_transactions": total_transactions or 0,
+            "unique_categories": unique_categories,
+            "first_transaction_date": str(first_date) if first_date else None,
+            "last_transaction_date": str(last_date) if last_date else None,
+            "as_of": as_of.isoformat() if as_of else None
+        },
+        "current_month": {
+            "income": monthly_income,
+            "expense": monthly_expense,
+            "balance": monthly_income - monthly_expense,
+            "month": month
+        }
+    }
 
-def get_db_connection():
-    conn = sqlite3.connect(DATABASE_CONFIG['path'])
-    return conn
+CATEGORY_QUERY = """
+    SELECT 
+        NULLIF(category, '') as category,
+        transaction_type,
+        SUM(txn_count) as transaction_count,
+        SUM(total_amount) as total_amount,
+        SUM(total_amount) / SUM(txn_count) as average_amount
+    FROM transaction_rollups
+    GROUP BY category, transaction_type
+    ORDER BY total_amount DESC
+"""
+
+TREND_QUERY = """
+    SELECT 
+        year_month as month,
+        SUM(CASE WHEN transaction_type = 'income' THEN total_amount ELSE 0 END) as income,
+        SUM(CASE WHEN transaction_type = 'expense' THEN total_amount ELSE 0 END) as expense,
+        SUM(txn_count) as transaction_count
+    FROM transaction_rollups
+    GROUP BY year_month
+    ORDER BY month DESC
+    LIMIT ?
+"""
+
+def query_category_breakdown(conn):
+    """Breakdown per category + type dari rollups"""
+    return {"breakdown": fetch_records(conn, CATEGORY_QUERY)}
+
+def query_monthly_trend(conn, months):
+    """Income/expense/balance per bulan, bulan terbaru dulu"""
+    trend = fetch_records(conn, TREND_QUERY, (months,))
+    for month in trend:
+        month['balance'] = month['income'] - month['expense']
+    return {"trend": trend, "period_months": months}
 
 @analytics_bp.route('/summary', methods=['GET'])
+@cached_response(ttl=60)
 def get_financial_summary():
     """
     Get overall financial summary
+    Query parameters: month (YYYY-MM), as_of (YYYY-MM-DD, hanya transaksi sampai tanggal ini)
     """
     try:
-        conn = get_db_connection()
-        
-        # Basic summary
-        summary_query = """
-            SELECT 
-                SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END) as total_income,
-                SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) as total_expense,
-                COUNT(*) as total_transactions,
-                COUNT(DISTINCT category) as unique_categories,
-                MIN(date) as first_transaction_date,
-                MAX(date) as last_transaction_date
-            FROM transactions
-        """
-        
-        summary_df = pd.read_sql_query(summary_query, conn)
-        
-        # Current month summary
-        current_month = datetime.now().strftime('%Y-%m')
-        monthly_query = """
-            SELECT 
-                SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END) as monthly_income,
-                SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) as monthly_expense
-            FROM transactions
-            WHERE strftime('%Y-%m', date) = ?
-        """
+        try:
+            month, as_of = parse_summary_period(request.args)
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
         
-        monthly_df = pd.read_sql_query(monthly_query, conn, params=(current_month,))
-        
-        conn.close()
-        
-        # Convert to native Python types
-        total_income = convert_to_serializable(summary_df.iloc[0]['total_income'])
-        total_expense = convert_to_serializable(summary_df.iloc[0]['total_expense'])
-        total_transactions = convert_to_serializable(summary_df.iloc[0]['total_transactions'])
-        unique_categories = convert_to_serializable(summary_df.iloc[0]['unique_categories'])
-        
-        monthly_income = convert_to_serializable(monthly_df.iloc[0]['monthly_income'])
-        monthly_expense = convert_to_serializable(monthly_df.iloc[0]['monthly_expense'])
-        
-        # Calculate additional metrics
-        balance = total_income - total_expense
-        monthly_balance = monthly_income - monthly_expense
+        with get_connection() as conn:
+            summary = query_financial_summary(conn, month, as_of)
         
         return jsonify({
             "status": "success",
-            "data": {
-                "overall": {
-                    "total_income": total_income,
-                    "total_expense": total_expense,
-                    "balance": balance,
-                    "total_transactions": total_transactions,
-                    "unique_categories": unique_categories,
-                    "first_transaction_date": str(summary_df.iloc[0]['first_transaction_date']) if summary_df.iloc[0]['first_transaction_date'] else None,
-                    "last_transaction_date": str(summary_df.iloc[0]['last_transaction_date']) if summary_df.iloc[0]['last_transaction_date'] else None
-                },
-                "current_month": {
-                    "income": monthly_income,
-                    "expense": monthly_expense,
-                    "balance": monthly_balance,
-                    "month": current_month
-                }
-            }
+            "data": summary
         })
         
     except Exception as e:
@@ -110,37 +171,18 @@ def get_financial_summary():
         }), 500
 
 @analytics_bp.route('/categories', methods=['GET'])
+@cached_response()
 def get_category_breakdown():
     """
     Get spending/income breakdown by category
     """
     try:
-        conn = get_db_connection()
-        
-        category_query = """
-            SELECT 
-                category,
-                transaction_type,
-                COUNT(*) as transaction_count,
-                SUM(amount) as total_amount,
-                AVG(amount) as average_amount
-            FROM transactions
-            GROUP BY category, transaction_type
-            ORDER BY total_amount DESC
-        """
-        
-        df = pd.read_sql_query(category_query, conn)
-        conn.close()
-        
-        # Convert all numeric columns to native Python types
-        for col in ['transaction_count', 'total_amount', 'average_amount']:
-            df[col] = df[col].apply(convert_to_serializable)
+        with get_connection() as conn:
+            breakdown = query_category_breakdown(conn)
         
         return jsonify({
             "status": "success",
-            "data": {
-                "breakdown": df.to_dict('records')
-            }
+            "data": breakdown
         })
         
     except Exception as e:
@@ -151,6 +193,7 @@ def get_category_breakdown():
         }), 500
 
 @analytics_bp.route('/monthly-trend', methods=['GET'])
+@cached_response()
 def get_monthly_trend():
     """
     Get monthly income/expense trend
@@ -159,36 +202,12 @@ def get_monthly_trend():
     try:
         months = request.args.get('months', 6, type=int)
         
-        conn = get_db_connection()
-        
-        trend_query = """
-            SELECT 
-                strftime('%Y-%m', date) as month,
-                SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END) as income,
-                SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) as expense,
-                COUNT(*) as transaction_count
-            FROM transactions
-            GROUP BY strftime('%Y-%m', date)
-            ORDER BY month DESC
-            LIMIT ?
-        """
-        
-        df = pd.read_sql_query(trend_query, conn, params=(months,))
-        conn.close()
-        
-        # Convert numeric columns to native Python types
-        for col in ['income', 'expense', 'transaction_count']:
-            df[col] = df[col].apply(convert_to_serializable)
-        
-        # Calculate balance for each month
-        df['balance'] = df['income'] - df['expense']
+        with get_connection() as conn:
+            trend = query_monthly_trend(conn, months)
         
         return jsonify({
             "status": "success",
-            "data": {
-                "trend": df.to_dict('records'),
-                "period_months": months
-            }
+            "data": trend
         })
         
     except Exception as e:
@@ -0,0 +1,80 @@
+from flask import Blueprint, request, jsonify
+import logging
+import sys
+from pathlib import Path
+
+# Import config
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.data.database import get_connection
+from api.utils.response_cache import cached_response
+from routes.analytics import (
+    parse_summary_period, query_financial_summary, query_category_breakdown, query_monthly_trend
+)
+
+# Blueprint Definition
+dashboard_bp = Blueprint('dashboard', __name__)
+logger = logging.getLogger(__name__)
+
+# Field -> payload yang sama dengan data endpoint analytics masing-masing
+DASHBOARD_FIELDS = ('summary', 'categories', 'trend')
+
+def parse_fields(value):
+    """fields=summary,trend -> tuple sesuai urutan DASHBOARD_FIELDS; raise ValueError untuk field tidak dikenal"""
+    if not value:
+        return DASHBOARD_FIELDS
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = requested - set(DASHBOARD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(DASHBOARD_FIELDS)}")
+    return tuple(field for field in DASHBOARD_FIELDS if field in requested)
+
+def query_dashboard(conn, fields, month, as_of=None, months=6):
+    """
+    Semua view dashboard dalam satu read transaction: angka summary, breakdown dan trend
+    berasal dari snapshot data yang sama walaupun ada write di antaranya.
+    """
+    data = {}
+    conn.execute("BEGIN")
+    try:
+        if 'summary' in fields:
+            data['summary'] = query_financial_summary(conn, month, as_of)
+        if 'categories' in fields:
+            data['categories'] = query_category_breakdown(conn)
+        if 'trend' in fields:
+            data['trend'] = query_monthly_trend(conn, months)
+    finally:
+        conn.rollback()
+    return data
+
+@dashboard_bp.route('/', methods=['GET'])
+@cached_response(ttl=60)
+def get_dashboard():
+    """
+    Summary, category breakdown dan monthly trend dalam satu response
+    Query parameters: fields (comma separated: summary,categories,trend), month, as_of, months
+    """
+    try:
+        try:
+            fields = parse_fields(request.args.get('fields'))
+            month, as_of = parse_summary_period(request.args)
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
+        months = request.args.get('months', 6, type=int)
+
+        with get_connection() as conn:
+            data = query_dashboard(conn, fields, month, as_of, months)
+
+        return jsonify({
+            "status": "success",
+            "data": data
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting dashboard: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to get dashboard: {str(e)}"
+        }), 500
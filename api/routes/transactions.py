@@ -1,82 +1,256 @@
-from flask import Blueprint, request, jsonify
-import sqlite3
-import pandas as pd
-from datetime import datetime
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from datetime import date
+import base64
+import json
 import logging
-import numpy as np
 import sys
 from pathlib import Path
 
 # Add parent directory to path untuk import config
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import DATABASE_CONFIG
-from api.models.transaction_model import TransactionCreate, TransactionResponse, BulkTransactionCreate
+from config.config import PAGINATION_CONFIG, BULK_INGEST_CONFIG, EXPORT_CONFIG
+from api.models.transaction_model import TransactionCreate
+from src.data.database import get_connection, bump_data_version
+from src.data import rollups, search
+from src.services import anomaly_scoring
+from api.utils.bulk_ingest import ingest_rows, iter_json_rows, iter_ndjson_rows, iter_csv_rows
+from api.utils.json_provider import dumps_bytes
+from api.utils.exporters import EXPORT_COLUMNS, EXPORT_FORMATS, export_rows
 
 transactions_bp = Blueprint('transactions', __name__)
 logger = logging.getLogger(__name__)
 
-def get_db_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DATABASE_CONFIG['path'])
-    conn.row_factory = sqlite3.Row  # This enables column access by name
-    return conn
+# sort parameter -> kolom; '-' di depan = descending, id selalu jadi tiebreaker
+SORT_COLUMNS = {'date': 'date', 'amount': 'amount', 'id': 'id'}
+DEFAULT_SORT = '-date'
+
+TOTALS_QUERY = """
+    SELECT
+        COUNT(*) as count,
+        COALESCE(SUM(CASE WHEN transaction_type = 'income' THEN amount END), 0) as total_income,
+        COALESCE(SUM(CASE WHEN transaction_type = 'expense' THEN amount END), 0) as total_expense
+    FROM transactions
+"""
+
+def parse_sort(value):
+    """'-date' (default), 'date', '-amount', 'amount', '-id', 'id' -> (sort, column, descending)"""
+    sort = value or DEFAULT_SORT
+    column = SORT_COLUMNS.get(sort.lstrip('-'))
+    if column is None or sort.count('-') > 1:
+        options = ', '.join(f"{key}, -{key}" for key in SORT_COLUMNS)
+        raise ValueError(f"Invalid sort '{sort}'. Available: {options}")
+    return sort, column, sort.startswith('-')
+
+def encode_cursor(value, transaction_id, sort=DEFAULT_SORT):
+    """Encode posisi (nilai kolom sort, id) terakhir jadi opaque cursor"""
+    raw = json.dumps([value, transaction_id, sort]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor, sort=DEFAULT_SORT):
+    """Decode cursor dari encode_cursor untuk urutan sort ini, raise ValueError jika tidak valid"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded))
+        # Cursor lama [date, id] selalu untuk urutan default
+        value, transaction_id, cursor_sort = decoded if len(decoded) == 3 else (*decoded, DEFAULT_SORT)
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            raise ValueError
+        transaction_id = int(transaction_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was created for sort '{cursor_sort}', not '{sort}'")
+    return value, transaction_id
+
+def cursor_condition(column, descending):
+    """Keyset condition setelah row terakhir; row value comparison tetap bisa pakai index (column, id)"""
+    operator = '<' if descending else '>'
+    if column == 'id':
+        return f" AND id {operator} ?", 1
+    return f" AND ({column}, id) {operator} (?, ?)", 2
+
+def parse_amount(args, name):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}. Use a number")
+
+def build_transaction_filters(args):
+    """
+    Build WHERE clause dari query parameters: type, category, start_date, end_date,
+    search (full-text description), min_amount, max_amount. Raise ValueError untuk amount tidak valid.
+    """
+    filters = {
+        "type": args.get('type'),
+        "category": args.get('category'),
+        "start_date": args.get('start_date'),
+        "end_date": args.get('end_date'),
+        "search": args.get('search'),
+        "min_amount": parse_amount(args, 'min_amount'),
+        "max_amount": parse_amount(args, 'max_amount')
+    }
+    
+    where = " WHERE 1=1"
+    params = []
+    
+    if filters["type"]:
+        where += " AND transaction_type = ?"
+        params.append(filters["type"])
+    
+    if filters["category"]:
+        where += " AND category = ?"
+        params.append(filters["category"])
+        
+    if filters["start_date"]:
+        where += " AND date >= ?"
+        params.append(filters["start_date"])
+        
+    if filters["end_date"]:
+        where += " AND date <= ?"
+        params.append(filters["end_date"])
+    
+    search_query = search.match_query(filters["search"])
+    if search_query:
+        where += " AND " + search.SEARCH_FILTER
+        params.append(search_query)
+    
+    if filters["min_amount"] is not None:
+        where += " AND amount >= ?"
+        params.append(filters["min_amount"])
+    
+    if filters["max_amount"] is not None:
+        where += " AND amount <= ?"
+        params.append(filters["max_amount"])
+    
+    return where, params, filters
+
+def query_totals(conn, where, params):
+    """Count + total income/expense atas seluruh hasil filter (bukan hanya satu halaman)"""
+    count, total_income, total_expense = conn.execute(TOTALS_QUERY + where, params).fetchone()
+    return {
+        "count": count,
+        "total_income": total_income,
+        "total_expense": total_expense,
+        "balance": total_income - total_expense
+    }
+
+def stream_transactions(query, params, limit, sort, column, footer):
+    """Generate JSON response chunk per chunk langsung dari DB cursor"""
+    chunk_size = PAGINATION_CONFIG['stream_chunk_size']
+    
+    with get_connection() as conn:
+        cursor = conn.execute(query, params)
+        
+        yield b'{"status":"success","data":['
+        count = 0
+        last_row = None
+        has_more = False
+        
+        while limit is None or count < limit:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            
+            if limit is not None and count + len(rows) >= limit:
+                has_more = count + len(rows) > limit or cursor.fetchone() is not None
+                rows = rows[:limit - count]
+            
+            # Satu encoder call per chunk; sqlite3.Row di-handle provider tanpa dict() per row di sini
+            chunk = dumps_bytes(rows)[1:-1]
+            yield (b',' if count else b'') + chunk
+            
+            count += len(rows)
+            last_row = rows[-1]
+        
+        cursor.close()
+    
+    next_cursor = encode_cursor(last_row[column], last_row['id'], sort) if has_more else None
+    yield b'],' + dumps_bytes({
+        "count": count,
+        "next_cursor": next_cursor,
+        **footer
+    })[1:]
 
 @transactions_bp.route('/', methods=['GET'])
 def get_transactions():
     """
-    Get all transactions with optional filtering
-    Query parameters: type, category, start_date, end_date, limit
+    Get transactions with optional filtering, sorting and keyset pagination
+    Query parameters: type, category, start_date, end_date, search, min_amount, max_amount,
+    sort (date, amount, id; prefix '-' untuk descending), limit, cursor, stream, include_totals
     """
     try:
-        # Get query parameters
-        transaction_type = request.args.get('type')
-        category = request.args.get('category')
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
-        limit = request.args.get('limit', 100, type=int)
+        stream = request.args.get('stream', 'false').lower() in ('1', 'true', 'yes')
+        include_totals = request.args.get('include_totals', 'false').lower() in ('1', 'true', 'yes')
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
         
-        conn = get_db_connection()
-        
-        # Build query dynamically based on filters
-        query = "SELECT * FROM transactions WHERE 1=1"
-        params = []
-        
-        if transaction_type:
-            query += " AND transaction_type = ?"
-            params.append(transaction_type)
-        
-        if category:
-            query += " AND category = ?"
-            params.append(category)
-            
-        if start_date:
-            query += " AND date >= ?"
-            params.append(start_date)
-            
-        if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
+        # LIMIT negatif di SQLite berarti tanpa batas, jadi tolak sebelum sampai query
+        if limit is not None and limit < 1:
+            return jsonify({
+                "status": "error",
+                "message": "limit must be a positive integer"
+            }), 400
         
-        query += " ORDER BY date DESC, id DESC LIMIT ?"
-        params.append(limit)
+        if not stream:
+            limit = min(limit or PAGINATION_CONFIG['default_limit'], PAGINATION_CONFIG['max_limit'])
         
-        # Execute query
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
+        # Build query dynamically based on filters
+        try:
+            where, params, filters = build_transaction_filters(request.args)
+            sort, column, descending = parse_sort(request.args.get('sort'))
+            cursor_values = decode_cursor(cursor, sort) if cursor else None
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
         
-        # Convert to list of dictionaries
-        transactions = df.to_dict('records')
+        footer = {"filters": filters, "sort": sort}
+        if include_totals:
+            # Totals atas seluruh filter, tidak terpengaruh cursor/limit
+            with get_connection() as conn:
+                footer["totals"] = query_totals(conn, where, params)
+        
+        page_where, page_params = where, list(params)
+        if cursor_values:
+            condition, size = cursor_condition(column, descending)
+            page_where += condition
+            page_params += list(cursor_values[-size:])
+        
+        direction = "DESC" if descending else "ASC"
+        query = f"SELECT * FROM transactions{page_where} ORDER BY {column} {direction}"
+        if column != 'id':
+            query += f", id {direction}"
+        
+        if stream:
+            return Response(
+                stream_with_context(stream_transactions(query, page_params, limit, sort, column, footer)),
+                mimetype='application/json'
+            )
+        
+        # Ambil satu row ekstra untuk tahu apakah masih ada halaman berikutnya
+        query += " LIMIT ?"
+        page_params.append(limit + 1)
+        
+        with get_connection() as conn:
+            rows = conn.execute(query, page_params).fetchall()
+        
+        has_more = len(rows) > limit
+        transactions = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if has_more:
+            last = transactions[-1]
+            next_cursor = encode_cursor(last[column], last['id'], sort)
         
         return jsonify({
             "status": "success",
             "data": transactions,
             "count": len(transactions),
-            "filters": {
-                "type": transaction_type,
-                "category": category,
-                "start_date": start_date,
-                "end_date": end_date
-            }
+            "next_cursor": next_cursor,
+            **footer
         })
         
     except Exception as e:
@@ -86,6 +260,64 @@ def get_transactions():
             "message": f"Failed to get transactions: {str(e)}"
         }), 500
 
+def stream_export(export_format, query, params, chunk_size):
+    """Generate file export langsung dari DB cursor, chunk_size rows per fetchmany()"""
+    with get_connection() as conn:
+        cursor = conn.execute(query, params)
+        yield from export_rows(export_format, cursor, chunk_size)
+        cursor.close()
+
+@transactions_bp.route('/export', methods=['GET'])
+def export_transactions():
+    """
+    Export semua transaksi yang cocok dengan filter sebagai file download
+    Query parameters: format (csv, ndjson, xlsx, parquet), filter yang sama dengan GET /, chunk_size
+    """
+    try:
+        export_format = request.args.get('format', 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                "status": "error",
+                "message": f"Unsupported format '{export_format}'. Available: {', '.join(EXPORT_FORMATS)}"
+            }), 400
+        
+        chunk_size = request.args.get('chunk_size', EXPORT_CONFIG['chunk_size'], type=int)
+        chunk_size = max(1, min(chunk_size, EXPORT_CONFIG['max_chunk_size']))
+        
+        try:
+            where, params, filters = build_transaction_filters(request.args)
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
+        
+        if export_format == 'xlsx':
+            with get_connection() as conn:
+                count = conn.execute("SELECT COUNT(*) FROM transactions" + where, params).fetchone()[0]
+            if count > EXPORT_CONFIG['xlsx_max_rows']:
+                return jsonify({
+                    "status": "error",
+                    "message": f"{count} rows exceed the Excel limit of {EXPORT_CONFIG['xlsx_max_rows']}. "
+                               "Use csv, ndjson or parquet, or narrow the filters"
+                }), 400
+        
+        query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM transactions" + where + " ORDER BY date DESC, id DESC"
+        mimetype, extension = EXPORT_FORMATS[export_format]
+        
+        return Response(
+            stream_with_context(stream_export(export_format, query, params, chunk_size)),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename=transactions_{date.today()}.{extension}"}
+        )
+        
+    except Exception as e:
+        logger.error(f"Error exporting transactions: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": f"Failed to export transactions: {str(e)}"
+        }), 500
+
 @transactions_bp.route('/', methods=['POST'])
 def create_transaction():
     """
@@ -104,31 +336,35 @@ def create_transaction():
         # Validate using Pydantic model
         transaction_data = TransactionCreate(**data)
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Insert transaction
-        cursor.execute('''
-            INSERT INTO transactions (date, amount, transaction_type, category, description)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            transaction_data.date.isoformat(),
-            transaction_data.amount,
-            transaction_data.type.value,
-            transaction_data.category,
-            transaction_data.description
-        ))
-        
-        transaction_id = cursor.lastrowid
-        
-        # Get the created transaction
-        created_transaction = cursor.execute(
-            'SELECT * FROM transactions WHERE id = ?', 
-            (transaction_id,)
-        ).fetchone()
-        
-        conn.commit()
-        conn.close()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            
+            values = (
+                transaction_data.date.isoformat(),
+                transaction_data.amount,
+                transaction_data.type.value,
+                transaction_data.category,
+                transaction_data.description
+            )
+            
+            # Insert transaction
+            cursor.execute('''
+                INSERT INTO transactions (date, amount, transaction_type, category, description)
+                VALUES (?, ?, ?, ?, ?)
+            ''', values)
+            
+            transaction_id = cursor.lastrowid
+            rollups.apply_insert(conn, [values])
+            anomaly_scoring.score_new_rows(conn, [transaction_id], [values])
+            bump_data_version(conn)
+            
+            # Get the created transaction
+            created_transaction = cursor.execute(
+                'SELECT * FROM transactions WHERE id = ?', 
+                (transaction_id,)
+            ).fetchone()
+            
+            conn.commit()
         
         # Convert to dictionary
         transaction_dict = dict(created_transaction)
@@ -152,14 +388,11 @@ def get_transaction(transaction_id):
     Get a specific transaction by ID
     """
     try:
-        conn = get_db_connection()
-        
-        transaction = conn.execute(
-            'SELECT * FROM transactions WHERE id = ?', 
-            (transaction_id,)
-        ).fetchone()
-        
-        conn.close()
+        with get_connection() as conn:
+            transaction = conn.execute(
+                'SELECT * FROM transactions WHERE id = ?', 
+                (transaction_id,)
+            ).fetchone()
         
         if not transaction:
             return jsonify({
@@ -183,45 +416,48 @@ def get_transaction(transaction_id):
 def create_bulk_transactions():
     """
     Create multiple transactions at once
+    Body: JSON {"transactions": [...]}, NDJSON (application/x-ndjson) atau CSV (text/csv)
+    Query parameters: chunk_size
     """
     try:
-        data = request.get_json()
+        content_type = (request.mimetype or '').lower()
+        chunk_size = request.args.get('chunk_size', BULK_INGEST_CONFIG['chunk_size'], type=int)
+        chunk_size = max(1, min(chunk_size, BULK_INGEST_CONFIG['max_chunk_size']))
+        
+        if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+            rows = iter_ndjson_rows(request.stream)
+        elif content_type in ('text/csv', 'application/csv'):
+            rows = iter_csv_rows(request.stream)
+        else:
+            data = request.get_json(silent=True)
+            
+            if not data or 'transactions' not in data:
+                return jsonify({
+                    "status": "error",
+                    "message": "No transactions data provided"
+                }), 400
+            
+            rows = iter_json_rows(data)
+        
+        with get_connection() as conn:
+            result = ingest_rows(
+                conn, rows,
+                chunk_size=chunk_size,
+                max_errors=BULK_INGEST_CONFIG['max_reported_errors']
+            )
         
-        if not data or 'transactions' not in data:
+        if result["inserted"] == 0:
             return jsonify({
                 "status": "error",
-                "message": "No transactions data provided"
+                "message": f"No valid transactions in {result['received']} rows",
+                "data": result
             }), 400
         
-        bulk_data = BulkTransactionCreate(**data)
-        
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        created_ids = []
-        
-        for transaction in bulk_data.transactions:
-            cursor.execute('''
-                INSERT INTO transactions (date, amount, transaction_type, category, description)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                transaction.date.isoformat(),
-                transaction.amount,
-                transaction.type.value,
-                transaction.category,
-                transaction.description
-            ))
-            created_ids.append(cursor.lastrowid)
-        
-        conn.commit()
-        conn.close()
-        
         return jsonify({
-            "status": "success",
-            "message": f"Successfully created {len(created_ids)} transactions",
-            "data": {
-                "created_ids": created_ids
-            }
+            "status": "success" if result["failed"] == 0 else "partial",
+            "message": f"Successfully created {result['inserted']} transactions"
+                       + (f", {result['failed']} rows rejected" if result["failed"] else ""),
+            "data": result
         }), 201
         
     except Exception as e:
@@ -237,25 +473,26 @@ def delete_transaction(transaction_id):
     Delete a transaction
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if transaction exists
-        existing = cursor.execute(
-            'SELECT id FROM transactions WHERE id = ?', 
-            (transaction_id,)
-        ).fetchone()
-        
-        if not existing:
-            return jsonify({
-                "status": "error",
-                "message": f"Transaction with ID {transaction_id} not found"
-            }), 404
-        
-        # Delete transaction
-        cursor.execute('DELETE FROM transactions WHERE id = ?', (transaction_id,))
-        conn.commit()
-        conn.close()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check if transaction exists
+            existing = cursor.execute(
+                'SELECT date, amount, transaction_type, category FROM transactions WHERE id = ?', 
+                (transaction_id,)
+            ).fetchone()
+            
+            if not existing:
+                return jsonify({
+                    "status": "error",
+                    "message": f"Transaction with ID {transaction_id} not found"
+                }), 404
+            
+            # Delete transaction
+            cursor.execute('DELETE FROM transactions WHERE id = ?', (transaction_id,))
+            rollups.apply_delete(conn, tuple(existing))
+            bump_data_version(conn)
+            conn.commit()
         
         return jsonify({
             "status": "success",
@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import time
+import logging
+
+from pydantic import ValidationError
+
+from api.models.transaction_model import TransactionCreate
+from src.data import rollups
+from src.data.database import bump_data_version
+from src.services import anomaly_scoring
+
+logger = logging.getLogger(__name__)
+
+INSERT_SQL = '''
+    INSERT INTO transactions (date, amount, transaction_type, category, description)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+def iter_json_rows(payload):
+    """Yield (row_number, row) dari body JSON {"transactions": [...]}"""
+    for i, row in enumerate(payload.get('transactions') or [], start=1):
+        yield i, row
+
+
+def iter_ndjson_rows(stream):
+    """Yield (row_number, row) dari NDJSON stream, satu object per baris"""
+    text = io.TextIOWrapper(stream, encoding='utf-8')
+    row_number = 0
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        row_number += 1
+        try:
+            yield row_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, ValueError(f"Invalid JSON: {e.msg}")
+
+
+def iter_csv_rows(stream):
+    """Yield (row_number, row) dari CSV stream dengan header row"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    for i, row in enumerate(csv.DictReader(text), start=1):
+        # Bank statement export kadang pakai 'transaction_type' bukan 'type'
+        if 'type' not in row and 'transaction_type' in row:
+            row['type'] = row.pop('transaction_type')
+        if not row.get('category'):
+            row['category'] = None
+        yield i, row
+
+
+def validate_row(row):
+    """Validate satu row, return (values_tuple, None) atau (None, errors)"""
+    if isinstance(row, Exception):
+        return None, [{"field": None, "message": str(row)}]
+    if not isinstance(row, dict):
+        return None, [{"field": None, "message": "Row must be an object"}]
+
+    try:
+        transaction = TransactionCreate(**row)
+    except ValidationError as e:
+        return None, [
+            {"field": ".".join(str(part) for part in error['loc']), "message": error['msg']}
+            for error in e.errors()
+        ]
+
+    return (
+        transaction.date.isoformat(),
+        transaction.amount,
+        transaction.type.value,
+        transaction.category,
+        transaction.description
+    ), None
+
+
+def insert_chunk(conn, values):
+    """Insert satu chunk dalam satu transaction, return list of new ids"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(INSERT_SQL, values)
+        # BEGIN IMMEDIATE memegang write lock, jadi id AUTOINCREMENT berurutan
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        ids = list(range(last_id - len(values) + 1, last_id + 1))
+        rollups.apply_insert(conn, values)
+        anomaly_scoring.score_new_rows(conn, ids, values)
+        bump_data_version(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return ids
+
+
+def ingest_rows(conn, rows, chunk_size=5000, max_errors=100):
+    """
+    Validate dan insert rows per chunk.
+    Row yang tidak valid dilaporkan, row lain tetap masuk.
+    """
+    start = time.perf_counter()
+    received = 0
+    failed = 0
+    errors = []
+    created_ids = []
+    chunks = []
+    pending = []
+
+    def flush():
+        chunk_start = time.perf_counter()
+        created_ids.extend(insert_chunk(conn, pending))
+        chunk_ms = (time.perf_counter() - chunk_start) * 1000
+        chunks.append({"rows": len(pending), "elapsed_ms": round(chunk_ms, 2)})
+        pending.clear()
+
+    for row_number, row in rows:
+        received += 1
+        values, row_errors = validate_row(row)
+        if row_errors:
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+            continue
+
+        pending.append(values)
+        if len(pending) >= chunk_size:
+            flush()
+
+    if pending:
+        flush()
+
+    elapsed = time.perf_counter() - start
+    inserted = len(created_ids)
+
+    return {
+        "received": received,
+        "inserted": inserted,
+        "failed": failed,
+        "created_ids": created_ids,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+        "stats": {
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else 0,
+            "chunk_size": chunk_size,
+            "chunks": chunks
+        }
+    }
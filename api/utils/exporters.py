@@ -0,0 +1,126 @@
+import csv
+import io
+import tempfile
+import logging
+
+from api.utils.json_provider import dumps_bytes
+from src.data.snapshots import SNAPSHOT_COLUMNS, rows_to_table
+
+logger = logging.getLogger(__name__)
+
+# Kolom export = kolom snapshot Parquet (tanpa year_month / kolom anomaly internal)
+EXPORT_COLUMNS = SNAPSHOT_COLUMNS
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+XLSX_BLOCK_SIZE = 1024 * 1024
+
+
+def iter_chunks(cursor, chunk_size):
+    """fetchmany() sampai habis; paling banyak chunk_size rows di memory"""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+def _drain(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def export_csv(chunks, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield _drain(buffer).encode('utf-8')
+    for rows in chunks:
+        writer.writerows(rows)
+        yield _drain(buffer).encode('utf-8')
+
+
+def export_ndjson(chunks, columns):
+    for rows in chunks:
+        yield b''.join(dumps_bytes(dict(zip(columns, row))) + b'\n' for row in rows)
+
+
+def export_xlsx(chunks, columns):
+    """
+    openpyxl write_only: rows langsung ditulis ke temp file, bukan disimpan di workbook.
+    Zip baru lengkap setelah row terakhir, jadi file dikirim per block setelah save.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('transactions')
+    sheet.append(columns)
+    for rows in chunks:
+        for row in rows:
+            sheet.append(tuple(row))
+
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            block = output.read(XLSX_BLOCK_SIZE)
+            if not block:
+                break
+            yield block
+
+
+class _StreamSink(io.RawIOBase):
+    """File-like write-only untuk ParquetWriter: bytes yang sudah ditulis diambil per row group"""
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = io.BytesIO()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        written = self._buffer.write(data)
+        self._position += written
+        return written
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        return _drain(self._buffer)
+
+
+def export_parquet(chunks, columns):
+    """Satu row group per chunk dengan schema snapshot (date/created_at timestamp, category dictionary)"""
+    import pyarrow.parquet as pq
+
+    sink = _StreamSink()
+    with pq.ParquetWriter(sink, rows_to_table([]).schema) as writer:
+        for rows in chunks:
+            writer.write_table(rows_to_table(rows))
+            yield sink.drain()
+    yield sink.drain()
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+    'xlsx': export_xlsx,
+    'parquet': export_parquet,
+}
+
+
+def export_rows(export_format, cursor, chunk_size):
+    """Generate bytes file export dari cursor (SELECT EXPORT_COLUMNS ...)"""
+    columns = [column[0] for column in cursor.description]
+    yield from EXPORTERS[export_format](iter_chunks(cursor, chunk_size), columns)
@@ -0,0 +1,141 @@
+import dataclasses
+import decimal
+import json
+import logging
+import sqlite3
+import uuid
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import JSONProvider
+
+from config.config import JSON_CONFIG
+
+try:
+    import orjson
+except ImportError:  # Fallback ke stdlib json
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+ENCODERS = ('auto', 'orjson', 'json')
+
+
+def _frame_records(df):
+    """DataFrame -> list of dict lewat Arrow (konversi per kolom di C++, bukan per cell di Python)"""
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=False).to_pylist()
+
+
+def _default(obj):
+    """
+    Type yang tidak di-handle encoder secara native.
+    orjson sudah handle datetime/date/uuid/dataclass/numpy, stdlib json tidak.
+    """
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return _frame_records(obj)
+    if isinstance(obj, pd.Series):
+        return obj.tolist()
+    if hasattr(obj, 'to_pylist'):
+        # pyarrow Table / RecordBatch / Array
+        return obj.to_pylist()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def resolve_encoder(name=None):
+    """'auto' -> orjson jika terinstall, selain itu stdlib json"""
+    name = name or JSON_CONFIG['encoder']
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON encoder '{name}'. Available: {', '.join(ENCODERS)}")
+    if name == 'orjson' and orjson is None:
+        raise ValueError("JSON encoder 'orjson' requested but orjson is not installed")
+    if name == 'auto':
+        return 'orjson' if orjson is not None else 'json'
+    return name
+
+
+def make_dumps(encoder=None, sort_keys=None):
+    """Return fungsi obj -> bytes untuk encoder yang dipilih"""
+    encoder = resolve_encoder(encoder)
+    sort_keys = JSON_CONFIG['sort_keys'] if sort_keys is None else sort_keys
+
+    if encoder == 'orjson':
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        def dumps(obj):
+            return orjson.dumps(obj, default=_default, option=option)
+    else:
+        encoder = json.JSONEncoder(
+            default=_default, ensure_ascii=False, sort_keys=sort_keys, separators=(',', ':')
+        )
+
+        def dumps(obj):
+            return encoder.encode(obj).encode('utf-8')
+
+    return dumps
+
+
+# Encoder default proses ini (dipakai juga di luar request context, mis. streaming generator)
+dumps_bytes = make_dumps()
+
+
+def dumps(obj):
+    return dumps_bytes(obj).decode('utf-8')
+
+
+def fetch_records(conn, query, params=()):
+    """Hasil query sebagai list of dict langsung dari cursor tuple (value SQLite sudah native Python)"""
+    cursor = conn.execute(query, params)
+    names = [column[0] for column in cursor.description]
+    records = [dict(zip(names, row)) for row in cursor]
+    cursor.close()
+    return records
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSON provider untuk app: orjson (fallback stdlib json) dengan support numpy, pandas,
+    pyarrow, sqlite3.Row dan date/datetime (ISO 8601).
+    """
+
+    mimetype = 'application/json'
+
+    def __init__(self, app, encoder=None):
+        super().__init__(app)
+        self.encoder = resolve_encoder(encoder)
+        self._dumps = make_dumps(self.encoder)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Argumen json.dumps eksplisit (indent dsb.) -> stdlib
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return self._dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Body langsung bytes, tanpa decode/encode str
+        return self._app.response_class(self._dumps(obj), mimetype=self.mimetype)
@@ -0,0 +1,176 @@
+import hashlib
+import threading
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request, make_response
+
+from config.config import CACHE_CONFIG
+from src.data.database import get_connection, get_data_version
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """LRU cache untuk response body, dibatasi jumlah entry dan total bytes"""
+
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024, default_ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale': 0,
+            'not_modified': 0,
+            'evictions': 0
+        }
+
+    def get(self, key, version):
+        """Return entry jika masih fresh untuk data version ini"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            if entry['version'] != version or entry['expires_at'] < time.monotonic():
+                self._remove(key)
+                self._stats['stale'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+
+    def set(self, key, version, body, mimetype, last_modified, ttl=None):
+        size = len(body)
+        if size > self.max_bytes:
+            return None
+
+        entry = {
+            'version': version,
+            'body': body,
+            'mimetype': mimetype,
+            'etag': f'{version}-{hashlib.md5(body).hexdigest()[:16]}',
+            'last_modified': last_modified,
+            'expires_at': time.monotonic() + (ttl or self.default_ttl),
+            'size': size
+        }
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+        return entry
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry['size']
+
+    def record_not_modified(self):
+        with self._lock:
+            self._stats['not_modified'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+
+analytics_cache = ResponseCache(
+    max_entries=CACHE_CONFIG['max_entries'],
+    max_bytes=CACHE_CONFIG['max_bytes'],
+    default_ttl=CACHE_CONFIG['default_ttl']
+)
+
+
+def _parse_db_timestamp(value):
+    """CURRENT_TIMESTAMP SQLite (UTC) -> aware datetime"""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+
+def _is_not_modified(entry):
+    if request.if_none_match and request.if_none_match.contains(entry['etag']):
+        return True
+    if not request.if_none_match and request.if_modified_since and entry['last_modified']:
+        return entry['last_modified'] <= request.if_modified_since
+    return False
+
+
+def _build_response(entry, cache_status):
+    if _is_not_modified(entry):
+        analytics_cache.record_not_modified()
+        response = make_response('', 304)
+    else:
+        response = make_response(entry['body'])
+        response.mimetype = entry['mimetype']
+
+    response.set_etag(entry['etag'])
+    if entry['last_modified']:
+        response.last_modified = entry['last_modified']
+    response.cache_control.no_cache = True
+    response.headers['X-Cache'] = cache_status
+    return response
+
+
+def cached_response(ttl=None):
+    """
+    Decorator untuk GET endpoint analytics.
+    Cache di-invalidate otomatis saat data_version naik (setiap write).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not CACHE_CONFIG.get('enabled', True):
+                return view(*args, **kwargs)
+
+            with get_connection() as conn:
+                version, updated_at = get_data_version(conn)
+
+            key = f"{request.path}?{'&'.join(sorted(f'{k}={v}' for k, v in request.args.items(multi=True)))}"
+            entry = analytics_cache.get(key, version)
+            if entry is not None:
+                return _build_response(entry, 'HIT')
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            entry = analytics_cache.set(
+                key, version, response.get_data(), response.mimetype,
+                _parse_db_timestamp(updated_at), ttl=ttl
+            )
+            if entry is None:
+                return response
+            return _build_response(entry, 'MISS')
+        return wrapper
+    return decorator
@@ -0,0 +1,23 @@
+"""
+Production WSGI entry point.
+
+    gunicorn -c api/gunicorn_conf.py
+
+Dengan preload_app, module ini di-import sekali di master process:
+app, database pool dan AI models sudah siap sebelum worker di-fork.
+"""
+import sys
+from pathlib import Path
+
+# routes.* di-import relatif ke folder api/
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.config import SERVER_CONFIG
+from app import create_app
+
+app = create_app()
+
+if SERVER_CONFIG['preload_models']:
+    from src.services.model_service import init_ai_models
+    init_ai_models()
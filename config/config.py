@@ -5,6 +5,7 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 DATABASE_DIR = DATA_DIR / "database"
+MODELS_DIR = BASE_DIR / "models"
 
 # Create directories if they don't exist
 DATABASE_DIR.mkdir(parents=True, exist_ok=True)
@@ -12,7 +13,20 @@ DATABASE_DIR.mkdir(parents=True, exist_ok=True)
 # Database Configuration
 DATABASE_CONFIG = {
     'path': DATABASE_DIR / "finance.db",
-    'echo': False
+    'echo': False,
+    # Connection pool
+    'pool_size': 8,          # Max koneksi yang boleh dipakai bersamaan
+    'pool_timeout': 10.0,    # Detik menunggu koneksi kosong sebelum error
+    'busy_timeout': 5000,    # ms, SQLite menunggu lock dari writer lain
+    'leak_threshold': 30.0,  # Detik, koneksi yang dipegang lebih lama dianggap bocor
+    'pragmas': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -20000,        # ~20MB page cache per koneksi
+        'mmap_size': 268435456,      # 256MB memory-mapped I/O
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON'
+    }
 }
 
 # API Configuration
@@ -24,6 +38,109 @@ API_CONFIG = {
     'MAX_CONTENT_LENGTH': 16 * 1024 * 1024  # 16MB
 }
 
+# Production WSGI server (gunicorn -c api/gunicorn_conf.py)
+SERVER_CONFIG = {
+    'bind': f"{API_CONFIG['HOST']}:{API_CONFIG['PORT']}",
+    'workers': int(os.getenv('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1)),
+    # > 1 memakai gthread worker. Default sync: gthread (gunicorn 23.0) me-reset koneksi yang
+    # sudah di-accept saat worker di-recycle oleh max_requests, sync worker tidak
+    'threads': int(os.getenv('GUNICORN_THREADS', 1)),
+    'preload_app': True,           # Import app, models dan pool di master sebelum fork (copy-on-write)
+    'preload_models': True,        # Load semua AI models di master, bukan lazy per worker
+    'max_requests': 1000,          # Recycle worker setelah N requests
+    'max_requests_jitter': 100,    # Supaya worker tidak restart bersamaan
+    'timeout': 60,
+    'graceful_timeout': 30,
+    'keepalive': 5,
+    'accesslog': '-',
+    'loglevel': 'info'
+}
+
+# Transaction list pagination / streaming
+PAGINATION_CONFIG = {
+    'default_limit': 100,
+    'max_limit': 1000,
+    'stream_chunk_size': 1000  # Rows per fetchmany() saat streaming
+}
+
+# Bulk import (/transactions/bulk)
+BULK_INGEST_CONFIG = {
+    'chunk_size': 5000,         # Rows per executemany() transaction
+    'max_chunk_size': 50000,
+    'max_reported_errors': 100  # Detail error per row yang dikembalikan
+}
+
+# Export (/transactions/export)
+EXPORT_CONFIG = {
+    'chunk_size': 10000,        # Rows per fetchmany(), juga ukuran row group Parquet
+    'max_chunk_size': 100000,
+    'xlsx_max_rows': 1048575    # Batas sheet Excel dikurangi header
+}
+
+# Analytics response cache
+CACHE_CONFIG = {
+    'enabled': True,
+    'default_ttl': 300,              # Detik
+    'max_entries': 256,
+    'max_bytes': 16 * 1024 * 1024    # Batas memory total body yang di-cache
+}
+
+# JSON response encoding (api/utils/json_provider.py)
+JSON_CONFIG = {
+    'encoder': os.getenv('JSON_ENCODER', 'auto'),  # 'auto' (orjson jika terinstall), 'orjson' atau 'json'
+    'sort_keys': False  # Urutan key = urutan kolom query
+}
+
+# AI endpoints
+AI_CONFIG = {
+    'categorize_batch_max': 1000,  # Max descriptions per /ai/categorize/batch
+    'prediction_cache_size': 10000,  # Processed descriptions yang di-cache
+    'prediction_cache_ttl': 3600     # Detik
+}
+
+# Data loading untuk AI endpoints dan training (src/data/loaders.py)
+DATA_LOADING_CONFIG = {
+    'engine': 'arrow'  # 'arrow' (pyarrow) atau 'pandas'
+}
+
+# Parquet snapshot tabel transactions (src/data/snapshots.py)
+SNAPSHOT_CONFIG = {
+    'dir': DATA_DIR / "processed" / "transactions",
+    # 'snapshot': training job membaca Parquet, bukan database
+    'training_source': os.getenv('TRAINING_SOURCE', 'sqlite'),
+    'refresh_before_training': True,  # Export incremental (bulan yang berubah saja) sebelum training
+    'row_group_size': 100000
+}
+
+# Anomaly detection
+ANOMALY_CONFIG = {
+    # Opt-in: score expense baru saat insert, /detect-anomalies baca score tersimpan
+    'streaming': os.getenv('ANOMALY_STREAMING', '0').lower() in ('1', 'true', 'yes'),
+    'top_n': 5,           # Anomalies yang dikembalikan /ai/detect-anomalies
+    'rescore_chunk_size': 5000  # Rows per batch saat score ulang setelah training
+}
+
+# Background training jobs (/ai/jobs)
+JOBS_CONFIG = {
+    'max_workers': 1,          # Training process yang jalan bersamaan
+    'start_method': 'spawn',   # Process baru, tidak mewarisi thread/koneksi Flask
+    'history_limit': 200,      # Job selesai yang disimpan di database
+    'auto_retry_after': 600    # Detik, auto-training dari GET AI endpoint tidak diulang setelah job failed
+}
+
+# Versioned model artifacts (MODELS_DIR/<name>/versions/<version>)
+MODEL_REGISTRY_CONFIG = {
+    'keep_versions': 5,      # Versi lama yang disimpan untuk rollback
+    'check_interval': 5.0    # Detik antar cek CURRENT pointer (versi dari process lain)
+}
+
+# Model loading di API process
+MODEL_LOADING_CONFIG = {
+    'lazy': True,        # Load saat endpoint AI pertama kali dipakai, bukan saat startup
+    'mmap_mode': 'r',    # joblib memory-map untuk numpy arrays (None = load ke memory)
+    'warm_up': True      # Prediksi dummy setelah load
+}
+
 # App Configuration
 APP_CONFIG = {
     'name': 'Smart Finance Tracker',
@@ -31,6 +148,24 @@ APP_CONFIG = {
     'debug': True
 }
 
+# Streamlit -> Flask API client (web_app/utils/api_client.py)
+API_CLIENT_CONFIG = {
+    'base_url': os.getenv('API_BASE_URL', 'http://127.0.0.1:5000/api/v1'),
+    'timeout': 10,             # Detik per request
+    'pool_connections': 4,     # Host yang di-pool (keep-alive)
+    'pool_maxsize': 16,        # Koneksi per host
+    'max_retries': 3,          # Hanya method idempotent (GET/PUT/DELETE/...) + connect error
+    'backoff_factor': 0.3,     # Sleep 0s, 0.6s, 1.2s antar retry (exponential)
+    'retry_statuses': (502, 503, 504)
+}
+
+# Streamlit st.cache_data TTL (web_app/utils/cached_api.py), detik
+WEB_CACHE_CONFIG = {
+    'health_ttl': 10,   # Status API, dipakai ulang sidebar + halaman
+    'data_ttl': 60,     # Transactions + analytics, di-clear setelah create_transaction
+    'ai_ttl': 300       # Hasil AI endpoints, di-clear setelah create_transaction / training selesai
+}
+
 # Categories Configuration
 CATEGORIES = {
     'income': ['Gaji', 'Investasi', 'Bonus', 'Lainnya'],
@@ -0,0 +1,69 @@
+import argparse
+import random
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.models.anomaly_detector import AnomalyDetector
+
+CATEGORIES = ['Makanan', 'Transportasi', 'Belanja', 'Hiburan', 'Kesehatan', 'Lainnya', 'Pendidikan', None]
+
+def make_transactions(rows):
+    """Generate transaksi sintetis (90% expense)"""
+    random.seed(42)
+    return pd.DataFrame({
+        'id': range(1, rows + 1),
+        'date': ['2025-01-01'] * rows,
+        'amount': [round(random.uniform(5000, 2000000), 2) for _ in range(rows)],
+        'transaction_type': ['expense' if random.random() < 0.9 else 'income' for _ in range(rows)],
+        'category': [random.choice(CATEGORIES) for _ in range(rows)],
+        'description': [random.choice(['Makan siang', 'Gojek ke kantor', None, 'Belanja bulanan']) for _ in range(rows)]
+    })
+
+def legacy_prepare_features(detector, transactions_df):
+    """Implementasi lama (iterrows + mean per row) sebagai pembanding"""
+    expense_data = transactions_df[transactions_df['transaction_type'] == 'expense'].copy()
+    features = []
+    for _, transaction in expense_data.iterrows():
+        features.append([
+            transaction['amount'],
+            len(str(transaction['description'])),
+            detector._get_category_encoding(transaction['category']),
+            transaction['amount'] / expense_data['amount'].mean() if expense_data['amount'].mean() > 0 else 0
+        ])
+    return np.array(features), expense_data
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AnomalyDetector feature extraction")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000, 300000])
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Skip legacy implementation above this row count (O(N^2))")
+    args = parser.parse_args()
+
+    detector = AnomalyDetector()
+    print(f"{'rows':>10} {'vectorized':>12} {'legacy':>12} {'speedup':>10} {'identical':>10}")
+
+    for rows in args.rows:
+        df = make_transactions(rows)
+        (features, _), vectorized_time = time_call(detector._prepare_features, df)
+
+        if rows <= args.legacy_max:
+            (legacy_features, _), legacy_time = time_call(legacy_prepare_features, detector, df)
+            identical = np.array_equal(features, legacy_features)
+            print(f"{rows:>10,} {vectorized_time * 1000:>10.1f}ms {legacy_time * 1000:>10.1f}ms "
+                  f"{legacy_time / vectorized_time:>9.0f}x {str(identical):>10}")
+        else:
+            print(f"{rows:>10,} {vectorized_time * 1000:>10.1f}ms {'skipped':>12} {'-':>10} {'-':>10}")
+
+if __name__ == "__main__":
+    main()
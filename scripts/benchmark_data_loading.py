@@ -0,0 +1,84 @@
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.data.loaders import load_transactions, ANOMALY_COLUMNS
+from src.data.migrations import upgrade
+
+CATEGORIES = ['Makanan', 'Transportasi', 'Belanja', 'Hiburan', 'Kesehatan', 'Lainnya', 'Pendidikan', None]
+DESCRIPTIONS = ['Makan siang di warung', 'Gojek ke kantor', None, 'Belanja bulanan supermarket', 'Nonton bioskop']
+
+def populate(conn, rows):
+    """Isi database dengan transaksi sintetis"""
+    random.seed(42)
+    batch = []
+    for _ in range(rows):
+        batch.append((
+            f"20{random.randint(20, 25)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+            round(random.uniform(5000, 2000000), 2),
+            'expense' if random.random() < 0.9 else 'income',
+            random.choice(CATEGORIES),
+            random.choice(DESCRIPTIONS)
+        ))
+        if len(batch) >= 100000:
+            conn.executemany(
+                "INSERT INTO transactions (date, amount, transaction_type, category, description) VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+            batch.clear()
+    if batch:
+        conn.executemany(
+            "INSERT INTO transactions (date, amount, transaction_type, category, description) VALUES (?, ?, ?, ?, ?)",
+            batch
+        )
+    conn.commit()
+
+def measure(label, load, repeat):
+    """Best-of-N load time + memory DataFrame (deep)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    memory_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    print(f"{label:>34} {best * 1000:>10.0f}ms {memory_mb:>10.1f}MB  {len(df.columns)} cols")
+    return best, memory_mb
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SELECT * vs column-pruned typed loading")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "benchmark.db")
+        upgrade(conn)
+        print(f"📥 Generating {args.rows:,} transactions...")
+        populate(conn, args.rows)
+
+        print(f"\n{'mode':>34} {'load':>12} {'memory':>12}")
+        baseline, baseline_mb = measure(
+            "SELECT * (inferred dtypes)",
+            lambda: pd.read_sql_query("SELECT * FROM transactions", conn),
+            args.repeat
+        )
+        for engine in ('pandas', 'arrow'):
+            elapsed, memory_mb = measure(
+                f"pruned + typed ({engine})",
+                lambda: load_transactions(conn, ANOMALY_COLUMNS, engine=engine),
+                args.repeat
+            )
+            print(f"{'':>34} {baseline / elapsed:>11.1f}x {baseline_mb / memory_mb:>11.1f}x less memory")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from api.utils.json_provider import fetch_records, make_dumps, orjson
+
+CATEGORIES = ['Makanan', 'Transportasi', 'Belanja', 'Hiburan', 'Kesehatan', 'Lainnya', None]
+
+QUERY = "SELECT id, date, amount, transaction_type, category, description FROM transactions LIMIT ?"
+
+def legacy_convert(obj):
+    """convert_to_serializable lama dari analytics.py"""
+    if pd.isna(obj) or obj is None:
+        return 0
+    elif isinstance(obj, (np.integer, np.int64)):
+        return int(obj)
+    elif isinstance(obj, (np.floating, np.float64)):
+        return float(obj)
+    elif isinstance(obj, (np.bool_)):
+        return bool(obj)
+    else:
+        return obj
+
+def legacy(conn, rows):
+    """read_sql -> apply per kolom numeric -> to_dict('records') -> json.dumps"""
+    df = pd.read_sql_query(QUERY, conn, params=(rows,))
+    for col in ['id', 'amount']:
+        df[col] = df[col].apply(legacy_convert)
+    return json.dumps({"status": "success", "data": df.to_dict('records')}).encode()
+
+def per_request_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response encoding for query results")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, date TEXT, amount REAL, transaction_type TEXT, category TEXT, description TEXT)")
+    conn.executemany(
+        "INSERT INTO transactions (date, amount, transaction_type, category, description) VALUES (?, ?, ?, ?, ?)",
+        [
+            (f"2025-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}", round(random.uniform(5000, 2000000), 2),
+             random.choice(['expense', 'income']), random.choice(CATEGORIES), 'Transaksi harian')
+            for _ in range(max(args.rows))
+        ]
+    )
+
+    modes = {'legacy (pandas + apply + json)': legacy}
+    for encoder in ('json', 'orjson') if orjson is not None else ('json',):
+        dumps = make_dumps(encoder)
+        modes[f'cursor records + {encoder}'] = (
+            lambda conn, rows, dumps=dumps: dumps({"status": "success", "data": fetch_records(conn, QUERY, (rows,))})
+        )
+
+    print(f"{'rows':>8} " + " ".join(f"{name:>32}" for name in modes))
+    for rows in args.rows:
+        timings = [per_request_ms(lambda: run(conn, rows), args.repeat) for run in modes.values()]
+        print(f"{rows:>8,} " + " ".join(f"{timing:>30.2f}ms" for timing in timings))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+import warnings
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "api"))
+
+MODES = {
+    # nama: (lazy, mmap_mode)
+    'eager': (False, None),
+    'eager-mmap': (False, 'r'),
+    'lazy-mmap': (True, 'r'),
+}
+
+def memory_kb():
+    """RSS dan private (unshared) memory process ini dari /proc"""
+    usage = {}
+    for path, keys in (("/proc/self/status", ("VmRSS",)),
+                       ("/proc/self/smaps_rollup", ("Private_Clean", "Private_Dirty"))):
+        try:
+            with open(path) as f:
+                for line in f:
+                    name, _, value = line.partition(":")
+                    if name in keys:
+                        usage[name] = int(value.split()[0])
+        except OSError:
+            pass
+    return {
+        'rss_mb': usage.get('VmRSS', 0) / 1024,
+        'private_mb': (usage.get('Private_Clean', 0) + usage.get('Private_Dirty', 0)) / 1024
+    }
+
+def run_child(mode):
+    """Ukur satu mode di process baru supaya import dan memory tidak tercampur"""
+    warnings.filterwarnings("ignore")
+    import config.config as config
+
+    lazy, mmap_mode = MODES[mode]
+    config.DATABASE_CONFIG['path'] = Path(tempfile.mkdtemp()) / "benchmark.db"
+    config.MODEL_LOADING_CONFIG.update({'lazy': lazy, 'mmap_mode': mmap_mode})
+
+    import logging
+    logging.disable(logging.CRITICAL)
+    import contextlib, io
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import create_app
+        app = create_app()
+    startup = time.perf_counter() - start
+    after_startup = memory_kb()
+
+    client = app.test_client()
+    start = time.perf_counter()
+    client.post('/api/v1/ai/categorize', json={"description": "Makan siang di warung padang", "amount": 25000})
+    first_request = time.perf_counter() - start
+
+    from src.services.model_service import init_ai_models
+    init_ai_models()
+    all_loaded = memory_kb()
+
+    print(json.dumps({
+        'mode': mode,
+        'startup_s': startup,
+        'first_categorize_ms': first_request * 1000,
+        'startup_rss_mb': after_startup['rss_mb'],
+        'loaded_rss_mb': all_loaded['rss_mb'],
+        'loaded_private_mb': all_loaded['private_mb'],
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API startup time and memory per model loading mode")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    print(f"{'mode':>12} {'startup':>10} {'1st categorize':>15} {'RSS startup':>12} {'RSS loaded':>11} {'private':>9}")
+    for mode in args.modes:
+        runs = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode],
+                capture_output=True, text=True, check=True, env=dict(os.environ, PYTHONWARNINGS="ignore")
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+
+        best = min(runs, key=lambda run: run['startup_s'])
+        print(f"{mode:>12} {best['startup_s'] * 1000:>8.0f}ms {best['first_categorize_ms']:>13.1f}ms "
+              f"{best['startup_rss_mb']:>10.1f}MB {best['loaded_rss_mb']:>9.1f}MB {best['loaded_private_mb']:>7.1f}MB")
+
+if __name__ == "__main__":
+    main()
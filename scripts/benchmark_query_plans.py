@@ -0,0 +1,114 @@
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.data.migrations import upgrade
+
+CATEGORIES = ['Makanan', 'Transportasi', 'Hiburan', 'Belanja', 'Kesehatan', 'Pendidikan', 'Lainnya', 'Gaji']
+
+# (name, query sebelum migration, query sesudah migration, params)
+QUERIES = [
+    (
+        "transactions list (type + range)",
+        "SELECT * FROM transactions WHERE 1=1 AND transaction_type = ? AND date >= ? "
+        "ORDER BY date DESC, id DESC LIMIT 100",
+        "SELECT * FROM transactions WHERE 1=1 AND transaction_type = ? AND date >= ? "
+        "ORDER BY date DESC, id DESC LIMIT 100",
+        ('expense', '2024-01-01')
+    ),
+    (
+        "transactions list (category)",
+        "SELECT * FROM transactions WHERE 1=1 AND category = ? ORDER BY date DESC, id DESC LIMIT 100",
+        "SELECT * FROM transactions WHERE 1=1 AND category = ? ORDER BY date DESC, id DESC LIMIT 100",
+        ('Makanan',)
+    ),
+    (
+        "summary current month",
+        "SELECT SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END), "
+        "SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) "
+        "FROM transactions WHERE strftime('%Y-%m', date) = ?",
+        "SELECT SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END), "
+        "SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) "
+        "FROM transactions WHERE year_month = ?",
+        ('2024-06',)
+    ),
+    (
+        "category breakdown",
+        "SELECT category, transaction_type, COUNT(*), SUM(amount), AVG(amount) "
+        "FROM transactions GROUP BY category, transaction_type",
+        "SELECT category, transaction_type, COUNT(*), SUM(amount), AVG(amount) "
+        "FROM transactions GROUP BY category, transaction_type",
+        ()
+    ),
+    (
+        "monthly trend",
+        "SELECT strftime('%Y-%m', date) as month, SUM(amount), COUNT(*) FROM transactions "
+        "GROUP BY strftime('%Y-%m', date) ORDER BY month DESC LIMIT 6",
+        "SELECT year_month as month, SUM(amount), COUNT(*) FROM transactions "
+        "GROUP BY year_month ORDER BY month DESC LIMIT 6",
+        ()
+    ),
+]
+
+def populate(conn, rows):
+    """Isi tabel dengan transaksi sintetis"""
+    start = date(2020, 1, 1)
+    random.seed(42)
+    data = []
+    for _ in range(rows):
+        category = random.choice(CATEGORIES)
+        data.append((
+            (start + timedelta(days=random.randint(0, 365 * 5))).isoformat(),
+            round(random.uniform(5000, 5000000), 2),
+            'income' if category == 'Gaji' else 'expense',
+            category,
+            f"Transaksi {category.lower()} {random.randint(1, 999)}"
+        ))
+    conn.executemany(
+        "INSERT INTO transactions (date, amount, transaction_type, category, description) VALUES (?, ?, ?, ?, ?)",
+        data
+    )
+    conn.commit()
+
+def run_queries(conn, label, use_after, repeat):
+    print(f"\n===== {label} =====")
+    for name, before_sql, after_sql, params in QUERIES:
+        sql = after_sql if use_after else before_sql
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        print(f"\n📊 {name}: {elapsed_ms:.2f} ms/query")
+        for row in plan:
+            print(f"   {row[-1]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare query plans before/after schema migrations")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.db")
+
+        upgrade(conn, target=1)
+        print(f"🧪 Generating {args.rows:,} transactions...")
+        populate(conn, args.rows)
+        run_queries(conn, "BEFORE (schema v1, no indexes)", use_after=False, repeat=args.repeat)
+
+        upgrade(conn)
+        run_queries(conn, "AFTER (latest schema)", use_after=True, repeat=args.repeat)
+        conn.close()
+
+if __name__ == "__main__":
+    main()
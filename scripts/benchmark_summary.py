@@ -0,0 +1,125 @@
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "api"))
+from src.data import rollups
+from src.data.migrations import upgrade
+from routes.analytics import query_financial_summary
+
+CATEGORIES = ['Makanan', 'Transportasi', 'Belanja', 'Hiburan', 'Kesehatan', 'Lainnya', 'Gaji', None]
+MONTH = '2025-06'
+AS_OF = date(2025, 6, 15)
+
+# Implementasi awal: dua scan tabel transactions, strftime() tidak bisa pakai index
+LEGACY_SUMMARY = """
+    SELECT
+        SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END) as total_income,
+        SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) as total_expense,
+        COUNT(*) as total_transactions,
+        COUNT(DISTINCT category) as unique_categories,
+        MIN(date) as first_transaction_date,
+        MAX(date) as last_transaction_date
+    FROM transactions
+"""
+LEGACY_MONTHLY = """
+    SELECT
+        SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END) as monthly_income,
+        SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) as monthly_expense
+    FROM transactions
+    WHERE strftime('%Y-%m', date) = ?
+"""
+
+# Sebelum endpoint ini: dua query rollup, masing-masing lewat DataFrame
+ROLLUP_SUMMARY = """
+    SELECT
+        SUM(CASE WHEN transaction_type = 'income' THEN total_amount ELSE 0 END) as total_income,
+        SUM(CASE WHEN transaction_type = 'expense' THEN total_amount ELSE 0 END) as total_expense,
+        SUM(txn_count) as total_transactions,
+        COUNT(DISTINCT NULLIF(category, '')) as unique_categories,
+        (SELECT MIN(date) FROM transactions) as first_transaction_date,
+        (SELECT MAX(date) FROM transactions) as last_transaction_date
+    FROM transaction_rollups
+"""
+ROLLUP_MONTHLY = """
+    SELECT
+        SUM(CASE WHEN transaction_type = 'income' THEN total_amount ELSE 0 END) as monthly_income,
+        SUM(CASE WHEN transaction_type = 'expense' THEN total_amount ELSE 0 END) as monthly_expense
+    FROM transaction_rollups
+    WHERE year_month = ?
+"""
+
+def populate(conn, rows):
+    """Transaksi sintetis 2020-2025 + rollups"""
+    random.seed(42)
+    values = [
+        (
+            f"20{random.randint(20, 25)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+            round(random.uniform(5000, 2000000), 2),
+            'expense' if random.random() < 0.8 else 'income',
+            random.choice(CATEGORIES),
+            'Transaksi'
+        )
+        for _ in range(rows)
+    ]
+    conn.executemany(
+        "INSERT INTO transactions (date, amount, transaction_type, category, description) VALUES (?, ?, ?, ?, ?)",
+        values
+    )
+    rollups.rebuild(conn)
+    conn.commit()
+
+def per_request_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /analytics/summary query cost per request")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    modes = {
+        'legacy (2 scans, pandas)': lambda conn: (
+            pd.read_sql_query(LEGACY_SUMMARY, conn),
+            pd.read_sql_query(LEGACY_MONTHLY, conn, params=(MONTH,))
+        ),
+        'rollups (2 queries, pandas)': lambda conn: (
+            pd.read_sql_query(ROLLUP_SUMMARY, conn),
+            pd.read_sql_query(ROLLUP_MONTHLY, conn, params=(MONTH,))
+        ),
+        'single query (cursor)': lambda conn: query_financial_summary(conn, MONTH),
+        'single query + as_of': lambda conn: query_financial_summary(conn, MONTH, AS_OF),
+    }
+
+    print(f"{'rows':>10} " + " ".join(f"{name:>28}" for name in modes))
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            conn = sqlite3.connect(Path(tmp) / f"summary_{rows}.db")
+            upgrade(conn)
+            populate(conn, rows)
+
+            timings = []
+            for name, run in modes.items():
+                # Legacy scan di 1M rows lambat, cukup beberapa kali
+                repeat = max(3, args.repeat // 5) if name.startswith('legacy') else args.repeat
+                timings.append(per_request_ms(lambda: run(conn), repeat))
+            print(f"{rows:>10,} " + " ".join(f"{timing:>26.2f}ms" for timing in timings))
+            conn.close()
+
+if __name__ == "__main__":
+    main()
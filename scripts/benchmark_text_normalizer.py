@@ -0,0 +1,65 @@
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.models.text_normalizer import TextNormalizer
+
+SAMPLES = [
+    "Makan siang di warung padang", "Gojek ke kantor", "Bayar listrik", "Isi bensin motor",
+    "Belanja di supermarket", "Nonton film di bioskop", "Beli obat di apotik", "Transfer ke BCA 123",
+    "Order dari tokopedia #INV-2024", "Langganan Netflix", "Kopi & roti", "Gaji bulan Januari",
+]
+
+def legacy_preprocess(text):
+    """preprocess_text versi lama sebagai pembanding"""
+    if not isinstance(text, str):
+        return ""
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+    indonesian_stopwords = {'di', 'ke', 'dan', 'atau', 'yang', 'untuk', 'pada', 'dengan', 'ini', 'itu'}
+    words = text.split()
+    words = [word for word in words if word not in indonesian_stopwords and len(word) > 2]
+    return ' '.join(words)
+
+def make_descriptions(rows, unique_ratio):
+    """Descriptions dengan pengulangan seperti data transaksi asli"""
+    random.seed(42)
+    unique_count = max(1, int(rows * unique_ratio))
+    pool = [f"{random.choice(SAMPLES)} {random.randint(1, 10 ** 6)}" if i >= len(SAMPLES) else SAMPLES[i]
+            for i in range(unique_count)] + [None]
+    return pd.Series([random.choice(pool) for _ in range(rows)], dtype=object)
+
+def rate(func, series):
+    start = time.perf_counter()
+    result = func(series)
+    elapsed = time.perf_counter() - start
+    return result, len(series) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark description normalization throughput")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--unique-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    series = make_descriptions(args.rows, args.unique_ratio)
+    normalizer = TextNormalizer()
+
+    legacy, legacy_rate = rate(lambda s: s.apply(legacy_preprocess), series)
+    single, single_rate = rate(lambda s: s.apply(normalizer.normalize), series)
+    batch, batch_rate = rate(normalizer.normalize_batch, series)
+
+    print(f"🧪 {args.rows:,} descriptions, {args.unique_ratio:.0%} unique")
+    print(f"   legacy apply(preprocess_text): {legacy_rate:>12,.0f} desc/s")
+    print(f"   normalize() per row:           {single_rate:>12,.0f} desc/s")
+    print(f"   normalize_batch():             {batch_rate:>12,.0f} desc/s")
+    print(f"   identical output: {legacy.equals(single) and legacy.tolist() == batch.tolist()}")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import sys
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 from config.config import DATABASE_CONFIG
+from src.data.migrations import upgrade
+from src.data import rollups
 
 def clean_training_data():
     """Clean and fix mislabeled training data"""
@@ -12,6 +14,7 @@ def clean_training_data():
     print("🧹 Cleaning training data...")
     
     conn = sqlite3.connect(DATABASE_CONFIG['path'])
+    upgrade(conn)
     cursor = conn.cursor()
     
     # Fix mislabeled transportation data
@@ -44,6 +47,8 @@ def clean_training_data():
         except Exception as e:
             print(f"❌ Error in query: {e}")
     
+    # Rollup analytics ikut disesuaikan
+    rollups.rebuild(conn)
     conn.commit()
     
     # Show cleaned data distribution
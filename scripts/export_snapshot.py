@@ -0,0 +1,36 @@
+import argparse
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from config.config import SNAPSHOT_CONFIG
+from src.data.database import get_connection
+from src.data.migrations import upgrade
+from src.data import snapshots
+
+def export_snapshot(snapshot_dir, full=False):
+    """Export tabel transactions ke Parquet, satu partition per year_month"""
+    print(f"📦 Exporting transactions snapshot to {snapshot_dir}...")
+
+    with get_connection() as conn:
+        upgrade(conn)
+        result = snapshots.export_snapshot(
+            conn, snapshot_dir, full=full, row_group_size=SNAPSHOT_CONFIG['row_group_size']
+        )
+
+    print(f"✅ {result['partitions']} partitions: {len(result['written'])} written "
+          f"({result['rows_written']:,} rows), {result['unchanged']} unchanged, "
+          f"{len(result['removed'])} removed in {result['elapsed_ms']:.0f}ms")
+    if result['written']:
+        print(f"   Written: {', '.join(result['written'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export transactions ke Parquet snapshot (incremental)")
+    parser.add_argument("--dir", type=Path, default=SNAPSHOT_CONFIG['dir'])
+    parser.add_argument("--full", action="store_true", help="Tulis ulang semua partition")
+    args = parser.parse_args()
+    export_snapshot(args.dir, full=args.full)
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import sys
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 from config.config import DATABASE_CONFIG
+from src.data.migrations import upgrade
+from src.data import rollups
 
 def generate_sample_data():
     """Generate sample transaction data untuk training model"""
@@ -120,6 +122,7 @@ def generate_sample_data():
     
     # Connect to database
     conn = sqlite3.connect(DATABASE_CONFIG['path'])
+    upgrade(conn)
     cursor = conn.cursor()
     
     # Clear existing sample data (optional)
@@ -142,6 +145,8 @@ def generate_sample_data():
             transaction['description']
         ))
     
+    # Rollup analytics ikut disesuaikan
+    rollups.rebuild(conn)
     conn.commit()
     conn.close()
     
@@ -0,0 +1,98 @@
+import argparse
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+# (method, path, json body)
+ENDPOINTS = {
+    'health': ("GET", "/health", None),
+    'transactions': ("GET", "/transactions/?limit=100", None),
+    'summary': ("GET", "/analytics/summary", None),
+    'categories': ("GET", "/analytics/categories", None),
+    'monthly-trend': ("GET", "/analytics/monthly-trend?months=6", None),
+    'categorize': ("POST", "/ai/categorize", {"description": "Makan siang di warung padang", "amount": 25000}),
+    'model-status': ("GET", "/ai/model-status", None),
+}
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_endpoint(base_url, name, concurrency, duration):
+    """Hajar satu endpoint dengan N thread selama `duration` detik"""
+    method, path, body = ENDPOINTS[name]
+    latencies = []
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        session = requests.Session()
+        local_latencies = []
+        local_errors = defaultdict(int)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path, json=body, timeout=30)
+                response.content
+                if response.status_code >= 400:
+                    local_errors[response.status_code] += 1
+            except requests.RequestException as e:
+                local_errors[type(e).__name__] += 1
+            local_latencies.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local_latencies)
+            for key, count in local_errors.items():
+                errors[key] += count
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'errors': dict(errors)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test API endpoints (RPS, p50/p99 latency)")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000/api/v1")
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Detik per endpoint")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Detik warm-up per endpoint (tidak dihitung)")
+    args = parser.parse_args()
+
+    try:
+        requests.get(args.base_url + "/health", timeout=5).raise_for_status()
+    except requests.RequestException as e:
+        print(f"❌ API not reachable at {args.base_url}: {e}")
+        return
+
+    print(f"🔥 {args.concurrency} concurrent clients, {args.duration:.0f}s per endpoint @ {args.base_url}")
+    print(f"{'endpoint':>15} {'requests':>9} {'RPS':>9} {'p50':>9} {'p99':>9} {'mean':>9}  errors")
+
+    for name in args.endpoints:
+        if args.warmup > 0:
+            run_endpoint(args.base_url, name, args.concurrency, args.warmup)
+        result = run_endpoint(args.base_url, name, args.concurrency, args.duration)
+        errors = ", ".join(f"{key}: {count}" for key, count in result['errors'].items()) or "-"
+        print(f"{name:>15} {result['requests']:>9,} {result['rps']:>9.1f} {result['p50_ms']:>7.1f}ms "
+              f"{result['p99_ms']:>7.1f}ms {result['mean_ms']:>7.1f}ms  {errors}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.data.database import get_connection
+from src.data.migrations import MIGRATIONS, LATEST_VERSION, current_version, upgrade, downgrade
+
+def show_status():
+    """Tampilkan versi schema dan migration yang tersedia"""
+    with get_connection() as conn:
+        version = current_version(conn)
+
+    print(f"📦 Schema version: {version} (latest: {LATEST_VERSION})")
+    for migration in MIGRATIONS:
+        status = "✅" if migration.version <= version else "⏳"
+        print(f"   {status} {migration.version}: {migration.description}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage database schema migrations")
+    parser.add_argument("command", choices=["status", "upgrade", "downgrade"])
+    parser.add_argument("--target", type=int, default=None, help="Target schema version")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        show_status()
+        return
+
+    with get_connection() as conn:
+        if args.command == "upgrade":
+            applied = upgrade(conn, args.target)
+            print(f"⬆️  Applied migrations: {applied or 'none'}")
+        else:
+            if args.target is None:
+                parser.error("downgrade requires --target")
+            reverted = downgrade(conn, args.target)
+            print(f"⬇️  Reverted migrations: {reverted or 'none'}")
+
+    show_status()
+
+if __name__ == "__main__":
+    main()
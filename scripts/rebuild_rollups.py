@@ -0,0 +1,27 @@
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.data.database import get_connection
+from src.data.migrations import upgrade
+from src.data import rollups
+
+def rebuild_rollups():
+    """Hitung ulang transaction_rollups dari tabel transactions"""
+    print("🔄 Rebuilding transaction rollups...")
+
+    with get_connection() as conn:
+        upgrade(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            groups = rollups.rebuild(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    print(f"✅ Rollups rebuilt: {groups} (month, type, category) groups")
+
+if __name__ == "__main__":
+    rebuild_rollups()
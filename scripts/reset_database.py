@@ -5,6 +5,8 @@ import sys
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 from config.config import DATABASE_CONFIG
+from src.data.migrations import upgrade
+from src.data import rollups
 
 def reset_database():
     """Hapus semua data transaksi dan mulai fresh"""
@@ -12,6 +14,7 @@ def reset_database():
     print("🧹 Resetting database...")
     
     conn = sqlite3.connect(DATABASE_CONFIG['path'])
+    upgrade(conn)
     cursor = conn.cursor()
     
     # Hapus semua data transaksi
@@ -20,6 +23,8 @@ def reset_database():
     # Reset auto-increment counter (optional)
     cursor.execute("DELETE FROM sqlite_sequence WHERE name='transactions'")
     
+    # Rollup analytics ikut disesuaikan
+    rollups.rebuild(conn)
     conn.commit()
     conn.close()
     
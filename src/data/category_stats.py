@@ -0,0 +1,119 @@
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# Category NULL disimpan sebagai '' (sama dengan transaction_rollups)
+NO_CATEGORY = ''
+
+CREATE_STATS_TABLE = """
+    CREATE TABLE IF NOT EXISTS category_expense_stats (
+        category TEXT PRIMARY KEY,
+        txn_count INTEGER NOT NULL DEFAULT 0,
+        total_amount REAL NOT NULL DEFAULT 0,
+        total_squared REAL NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+"""
+
+UPSERT_SQL = """
+    INSERT INTO category_expense_stats (category, txn_count, total_amount, total_squared)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (category) DO UPDATE SET
+        txn_count = txn_count + excluded.txn_count,
+        total_amount = total_amount + excluded.total_amount,
+        total_squared = total_squared + excluded.total_squared
+"""
+
+# Expense amounts urut turun lewat index (transaction_type, amount), untuk persentil
+AMOUNT_RANK_SQL = """
+    SELECT amount FROM transactions
+    WHERE transaction_type = 'expense'
+    ORDER BY amount DESC LIMIT 2 OFFSET ?
+"""
+
+
+def apply_delta(conn, rows, sign=1):
+    """
+    Tambah (sign=1) atau kurangi (sign=-1) running stats untuk expense rows.
+    rows: iterable of (amount, category). Caller yang commit.
+    """
+    groups = {}
+    for amount, category in rows:
+        key = category or NO_CATEGORY
+        group = groups.setdefault(key, [0, 0.0, 0.0])
+        group[0] += sign
+        group[1] += sign * amount
+        group[2] += sign * amount * amount
+
+    conn.executemany(UPSERT_SQL, [(key, *values) for key, values in groups.items()])
+    conn.execute("DELETE FROM category_expense_stats WHERE txn_count <= 0")
+
+
+def rebuild(conn):
+    """Hitung ulang dari tabel transactions"""
+    conn.execute("DELETE FROM category_expense_stats")
+    conn.execute("""
+        INSERT INTO category_expense_stats (category, txn_count, total_amount, total_squared)
+        SELECT COALESCE(category, ''), COUNT(*), SUM(amount), SUM(amount * amount)
+        FROM transactions
+        WHERE transaction_type = 'expense'
+        GROUP BY COALESCE(category, '')
+    """)
+    return conn.execute("SELECT COUNT(*) FROM category_expense_stats").fetchone()[0]
+
+
+def mean_amount(conn):
+    """Mean semua expense dari running totals (0 jika belum ada expense)"""
+    count, total = conn.execute(
+        "SELECT SUM(txn_count), SUM(total_amount) FROM category_expense_stats"
+    ).fetchone()
+    return total / count if count else 0.0
+
+
+def amount_quantile(conn, q, count):
+    """
+    Persentil q expense amount, sama dengan pandas Series.quantile(q) (linear interpolation).
+    Hanya membaca 2 row di sekitar posisi persentil dari index, bukan semua expense.
+    """
+    if not count:
+        return float('nan')
+
+    position = q * (count - 1)
+    lower = int(math.floor(position))
+    fraction = position - lower
+    # Offset descending dari row ke-`lower` (ascending)
+    offset = count - 1 - lower
+    rows = conn.execute(AMOUNT_RANK_SQL, (max(offset - 1, 0),)).fetchall()
+    if offset == 0:
+        return float(rows[0][0])
+    if fraction == 0:
+        return float(rows[1][0])
+
+    upper_value, lower_value = float(rows[0][0]), float(rows[1][0])
+    # Rumus interpolasi numpy (_lerp), supaya hasil identik sampai bit terakhir
+    if fraction >= 0.5:
+        return upper_value - (upper_value - lower_value) * (1 - fraction)
+    return lower_value + (upper_value - lower_value) * fraction
+
+
+def load(conn):
+    """
+    Running stats semua expense: count, mean, p90 dan mean per category.
+    Membaca satu row per category + 2 row index untuk p90.
+    """
+    rows = conn.execute(
+        "SELECT category, txn_count, total_amount FROM category_expense_stats"
+    ).fetchall()
+
+    count = sum(row[1] for row in rows)
+    total = sum(row[2] for row in rows)
+
+    return {
+        'count': count,
+        'mean': total / count if count else 0.0,
+        'p90': amount_quantile(conn, 0.9, count),
+        # Sama dengan groupby('category'): transaksi tanpa category tidak punya mean
+        'category_means': {
+            row[0]: row[2] / row[1] for row in rows if row[1] and row[0] != NO_CATEGORY
+        }
+    }
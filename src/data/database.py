@@ -0,0 +1,228 @@
+import os
+import sqlite3
+import threading
+import queue
+import time
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class ConnectionPool:
+    """Thread-safe SQLite connection pool dengan per-thread reuse"""
+
+    def __init__(self, db_path, pool_size=8, timeout=10.0, busy_timeout=5000,
+                 leak_threshold=30.0, pragmas=None):
+        self.db_path = str(db_path)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.busy_timeout = busy_timeout
+        self.leak_threshold = leak_threshold
+        self.pragmas = dict(pragmas or {})
+        self._inherited = []  # Koneksi milik parent process, tidak dipakai/di-close setelah fork
+        self._reset_state()
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._checked_out = {}  # id(conn) -> checkout timestamp
+
+        self._stats = {
+            'connections_created': 0,
+            'checkouts': 0,
+            'reused_in_thread': 0,
+            'timeouts': 0,
+            'leaks': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0
+        }
+
+    def _create_connection(self):
+        """Open a new connection and apply the configured pragmas"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout / 1000.0,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+        with self._lock:
+            self._stats['connections_created'] += 1
+        return conn
+
+    def _check_fork(self):
+        """
+        SQLite connection tidak boleh dipakai lintas fork.
+        Di child process, mulai dengan pool kosong dan simpan koneksi warisan tanpa menutupnya.
+        """
+        if self._pid == os.getpid():
+            return
+        while True:
+            try:
+                self._inherited.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        self._reset_state()
+        logger.info(f"Database pool reset after fork (pid {self._pid})")
+
+    def _acquire(self):
+        """Take a connection from the idle queue or open a new one"""
+        self._check_fork()
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PoolTimeoutError(
+                f"No database connection available after {self.timeout}s "
+                f"(pool_size={self.pool_size})"
+            )
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                conn = self._create_connection()
+            except Exception:
+                self._slots.release()
+                raise
+
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['total_wait_ms'] += wait_ms
+            self._stats['max_wait_ms'] = max(self._stats['max_wait_ms'], wait_ms)
+            self._checked_out[id(conn)] = time.monotonic()
+        return conn
+
+    def _release(self, conn):
+        """Return a connection to the idle queue"""
+        with self._lock:
+            self._checked_out.pop(id(conn), None)
+
+        if conn.in_transaction:
+            # Handler lupa commit - buang perubahan seperti conn.close() dulu
+            logger.warning("Connection returned with an open transaction, rolling back")
+            with self._lock:
+                self._stats['leaks'] += 1
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                conn.close()
+                self._slots.release()
+                return
+
+        self._idle.put(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager untuk pooled connection.
+        Nested usage di thread yang sama memakai koneksi yang sama.
+        """
+        self._check_fork()
+        local = self._local
+        if getattr(local, 'conn', None) is not None:
+            local.depth += 1
+            with self._lock:
+                self._stats['reused_in_thread'] += 1
+            try:
+                yield local.conn
+            finally:
+                local.depth -= 1
+            return
+
+        conn = self._acquire()
+        local.conn = conn
+        local.depth = 1
+        try:
+            yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            local.conn = None
+            local.depth = 0
+            self._release(conn)
+
+    def stats(self):
+        """Pool metrics untuk monitoring"""
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats)
+            held = list(self._checked_out.values())
+
+        stats['pid'] = self._pid
+        stats['pool_size'] = self.pool_size
+        stats['in_use'] = len(held)
+        stats['idle'] = self._idle.qsize()
+        stats['long_held'] = sum(1 for t in held if now - t > self.leak_threshold)
+        stats['avg_wait_ms'] = (
+            stats['total_wait_ms'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        )
+        return stats
+
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Get (atau buat) shared connection pool dari DATABASE_CONFIG"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from config.config import DATABASE_CONFIG
+                _pool = ConnectionPool(
+                    DATABASE_CONFIG['path'],
+                    pool_size=DATABASE_CONFIG.get('pool_size', 8),
+                    timeout=DATABASE_CONFIG.get('pool_timeout', 10.0),
+                    busy_timeout=DATABASE_CONFIG.get('busy_timeout', 5000),
+                    leak_threshold=DATABASE_CONFIG.get('leak_threshold', 30.0),
+                    pragmas=DATABASE_CONFIG.get('pragmas')
+                )
+                logger.info(f"Database pool initialized for {Path(_pool.db_path).name}")
+    return _pool
+
+
+def get_connection():
+    """Shortcut: `with get_connection() as conn:`"""
+    return get_pool().connection()
+
+
+def get_data_version(conn):
+    """Return (version, updated_at) dari counter data_version"""
+    row = conn.execute("SELECT version, updated_at FROM data_version WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row else (0, None)
+
+
+def bump_data_version(conn):
+    """Naikkan data_version; panggil di dalam transaction yang sama dengan write"""
+    conn.execute("""
+        UPDATE data_version
+        SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+        WHERE id = 1
+    """)
@@ -0,0 +1,122 @@
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# dtype eksplisit per kolom transactions (tidak mengandalkan type inference pandas)
+TRANSACTION_DTYPES = {
+    'id': 'int64',
+    'date': 'datetime64[ns]',
+    # float64: fitur anomaly harus sama dengan scoring per insert dan total bulanan sama dengan
+    # monthly_spending_features; float32 juga tidak exact untuk Rupiah > 16.777.216
+    'amount': 'float64',
+    'transaction_type': 'category',
+    'category': 'category',
+    'description': None,  # teks apa adanya (NULL tetap missing)
+    'created_at': 'datetime64[ns]',
+    'anomaly_score': 'float64',
+}
+
+# Kolom yang benar-benar dipakai tiap consumer
+ANOMALY_COLUMNS = ['date', 'amount', 'transaction_type', 'category', 'description']
+CATEGORY_TRAINING_COLUMNS = ['description', 'category']
+# Row yang dipakai training category model (snapshots.category_training_filter = versi Arrow)
+CATEGORY_TRAINING_WHERE = "description IS NOT NULL AND category IS NOT NULL AND LENGTH(description) > 3"
+
+SPENDING_COLUMNS = ['id', 'date', 'amount', 'transaction_type']
+
+ENGINES = ('pandas', 'arrow')
+
+
+def _arrow_type(dtype):
+    import pyarrow as pa
+
+    return {
+        'int64': pa.int64(),
+        'float32': pa.float32(),
+        'float64': pa.float64(),
+        'datetime64[ns]': pa.string(),  # ISO string, di-cast setelah semua chunk terkumpul
+        'category': pa.string(),
+        None: pa.string(),
+    }[dtype]
+
+
+def resolve_dtypes(columns, dtypes=None):
+    """TRANSACTION_DTYPES + override; raise ValueError untuk kolom yang tidak dikenal"""
+    dtypes = {**TRANSACTION_DTYPES, **(dtypes or {})}
+    unknown = [column for column in columns if column not in dtypes]
+    if unknown:
+        raise ValueError(f"Unknown transaction columns: {', '.join(unknown)}")
+    return dtypes
+
+
+def apply_dtypes(df, columns, dtypes):
+    """Cast kolom DataFrame ke dtype eksplisit (dipakai juga untuk Parquet snapshot)"""
+    for column in columns:
+        dtype = dtypes[column]
+        if dtype is None or df[column].dtype == dtype:
+            continue
+        if dtype.startswith('datetime') and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], format='ISO8601').astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def _load_pandas(conn, query, params, columns, dtypes):
+    df = pd.read_sql_query(query, conn, params=params)
+    return apply_dtypes(df, columns, dtypes)
+
+
+def _load_arrow(conn, query, params, columns, dtypes, chunk_size):
+    """
+    Kolom dibangun langsung sebagai Arrow array per chunk lalu dikonversi sekali ke pandas,
+    jadi tidak pernah ada list berisi semua row tuple di memory.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    types = [_arrow_type(dtypes[column]) for column in columns]
+    chunks = [[] for _ in columns]
+    cursor = conn.execute(query, params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for column_chunks, values, arrow_type in zip(chunks, zip(*rows), types):
+            column_chunks.append(pa.array(values, arrow_type))
+    cursor.close()
+
+    arrays = []
+    for column, column_chunks, arrow_type in zip(columns, chunks, types):
+        array = pa.chunked_array(column_chunks, arrow_type)
+        dtype = dtypes[column]
+        if dtype is not None and dtype.startswith('datetime'):
+            array = pc.cast(array, pa.timestamp('ns'))
+        elif dtype == 'category':
+            # Dictionary array -> pandas Categorical tanpa string object per row
+            array = array.dictionary_encode()
+        arrays.append(array)
+
+    return pa.table(arrays, names=columns).to_pandas()
+
+
+def load_transactions(conn, columns, where=None, params=(), dtypes=None, engine='pandas', chunk_size=10000):
+    """
+    Load hanya kolom yang diminta dari tabel transactions dengan dtype eksplisit:
+    category untuk category/transaction_type, float64 amount, date sebagai datetime.
+    engine='arrow' membangun kolom lewat pyarrow per chunk_size rows.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Available: {', '.join(ENGINES)}")
+
+    dtypes = resolve_dtypes(columns, dtypes)
+
+    query = f"SELECT {', '.join(columns)} FROM transactions"
+    if where:
+        query += f" WHERE {where}"
+
+    if engine == 'arrow':
+        return _load_arrow(conn, query, params, columns, dtypes, chunk_size)
+    return _load_pandas(conn, query, params, columns, dtypes)
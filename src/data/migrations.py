@@ -0,0 +1,258 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, List, Union
+
+from src.data import category_stats, rollups, search, spending_features
+
+logger = logging.getLogger(__name__)
+
+Step = Union[str, Callable]
+
+
+@dataclass
+class Migration:
+    """Satu langkah schema dengan upgrade dan downgrade"""
+    version: int
+    description: str
+    upgrade: List[Step] = field(default_factory=list)
+    downgrade: List[Step] = field(default_factory=list)
+
+
+def _column_exists(conn, table, column):
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_xinfo({table})"))
+
+
+def _add_year_month(conn):
+    # Generated column: tidak ada biaya tulis, nilainya disimpan di index
+    if not _column_exists(conn, 'transactions', 'year_month'):
+        conn.execute("""
+            ALTER TABLE transactions
+            ADD COLUMN year_month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) VIRTUAL
+        """)
+
+
+def _drop_year_month(conn):
+    if _column_exists(conn, 'transactions', 'year_month'):
+        conn.execute("ALTER TABLE transactions DROP COLUMN year_month")
+
+
+ANOMALY_COLUMNS = [('anomaly_score', 'REAL'), ('is_anomaly', 'INTEGER'), ('anomaly_model_version', 'TEXT')]
+
+
+def _add_anomaly_columns(conn):
+    for column, column_type in ANOMALY_COLUMNS:
+        if not _column_exists(conn, 'transactions', column):
+            conn.execute(f"ALTER TABLE transactions ADD COLUMN {column} {column_type}")
+
+
+def _drop_anomaly_columns(conn):
+    conn.execute("DROP INDEX IF EXISTS idx_transactions_anomaly")
+    for column, _ in reversed(ANOMALY_COLUMNS):
+        if _column_exists(conn, 'transactions', column):
+            conn.execute(f"ALTER TABLE transactions DROP COLUMN {column}")
+
+
+MIGRATIONS = [
+    Migration(
+        1, "create transactions table",
+        upgrade=["""
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                amount REAL NOT NULL,
+                transaction_type TEXT NOT NULL,
+                category TEXT,
+                description TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """],
+        downgrade=["DROP TABLE IF EXISTS transactions"]
+    ),
+    Migration(
+        2, "add precomputed year_month column",
+        upgrade=[_add_year_month],
+        downgrade=[_drop_year_month]
+    ),
+    Migration(
+        3, "indexes for transaction list and analytics queries",
+        upgrade=[
+            # GET /transactions: ORDER BY date DESC, id DESC (rowid ikut di index)
+            "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date)",
+            "CREATE INDEX IF NOT EXISTS idx_transactions_type_date ON transactions (transaction_type, date)",
+            "CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category, date)",
+            # Covering: /analytics/categories dan overall summary
+            "CREATE INDEX IF NOT EXISTS idx_transactions_category_type_amount "
+            "ON transactions (category, transaction_type, amount, date)",
+            # Covering: /analytics/monthly-trend dan current month summary
+            "CREATE INDEX IF NOT EXISTS idx_transactions_month_type_amount "
+            "ON transactions (year_month, transaction_type, amount)",
+            "ANALYZE transactions"
+        ],
+        downgrade=[
+            "DROP INDEX IF EXISTS idx_transactions_month_type_amount",
+            "DROP INDEX IF EXISTS idx_transactions_category_type_amount",
+            "DROP INDEX IF EXISTS idx_transactions_category_date",
+            "DROP INDEX IF EXISTS idx_transactions_type_date",
+            "DROP INDEX IF EXISTS idx_transactions_date"
+        ]
+    ),
+    Migration(
+        4, "monthly/category rollup table",
+        # data_version baru ada di migration 5, spending features di migration 7
+        upgrade=[
+            rollups.CREATE_ROLLUP_TABLE,
+            lambda conn: rollups.rebuild(conn, bump_version=False, with_features=False)
+        ],
+        downgrade=["DROP TABLE IF EXISTS transaction_rollups"]
+    ),
+    Migration(
+        5, "data version counter for cache invalidation",
+        upgrade=[
+            """
+            CREATE TABLE IF NOT EXISTS data_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)"
+        ],
+        downgrade=["DROP TABLE IF EXISTS data_version"]
+    ),
+    Migration(
+        6, "background training job history",
+        upgrade=[
+            """
+            CREATE TABLE IF NOT EXISTS training_jobs (
+                id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                message TEXT,
+                params TEXT,
+                result TEXT,
+                error TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                owner_pid INTEGER,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                started_at TEXT,
+                finished_at TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_training_jobs_created ON training_jobs (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_training_jobs_type_status ON training_jobs (job_type, status)"
+        ],
+        downgrade=["DROP TABLE IF EXISTS training_jobs"]
+    ),
+    Migration(
+        7, "monthly spending features for the spending predictor",
+        upgrade=[spending_features.CREATE_FEATURES_TABLE, spending_features.rebuild],
+        downgrade=["DROP TABLE IF EXISTS monthly_spending_features"]
+    ),
+    Migration(
+        8, "stored anomaly scores and running category expense stats",
+        upgrade=[
+            category_stats.CREATE_STATS_TABLE,
+            category_stats.rebuild,
+            _add_anomaly_columns,
+            # /ai/detect-anomalies: WHERE is_anomaly = 1 ORDER BY anomaly_score
+            "CREATE INDEX IF NOT EXISTS idx_transactions_anomaly ON transactions (is_anomaly, anomaly_score)"
+        ],
+        downgrade=[_drop_anomaly_columns, "DROP TABLE IF EXISTS category_expense_stats"]
+    ),
+    Migration(
+        9, "description full-text search and amount ordering for the transaction list",
+        upgrade=[
+            search.CREATE_FTS_TABLE,
+            *search.CREATE_FTS_TRIGGERS,
+            search.rebuild,
+            # GET /transactions?sort=amount / min_amount / max_amount (rowid ikut di index)
+            "CREATE INDEX IF NOT EXISTS idx_transactions_amount ON transactions (amount)"
+        ],
+        downgrade=["DROP INDEX IF EXISTS idx_transactions_amount", *search.DROP_FTS]
+    ),
+    Migration(
+        10, "expense amount index for anomaly reason percentile",
+        upgrade=[
+            # category_stats.amount_quantile: WHERE transaction_type = 'expense' ORDER BY amount DESC
+            "CREATE INDEX IF NOT EXISTS idx_transactions_type_amount ON transactions (transaction_type, amount)"
+        ],
+        downgrade=["DROP INDEX IF EXISTS idx_transactions_type_amount"]
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def _ensure_version_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+
+def current_version(conn):
+    """Versi schema yang sedang terpasang (0 = belum ada)"""
+    _ensure_version_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def _run_steps(conn, steps):
+    for step in steps:
+        if callable(step):
+            step(conn)
+        else:
+            conn.execute(step)
+
+
+def upgrade(conn, target=None):
+    """Apply semua migration sampai target (default: terbaru)"""
+    target = LATEST_VERSION if target is None else target
+    version = current_version(conn)
+    applied = []
+
+    for migration in MIGRATIONS:
+        if version < migration.version <= target:
+            try:
+                conn.execute("BEGIN")
+                _run_steps(conn, migration.upgrade)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (migration.version, migration.description)
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.error(f"Migration {migration.version} failed: {migration.description}")
+                raise
+            applied.append(migration.version)
+            logger.info(f"Applied migration {migration.version}: {migration.description}")
+
+    return applied
+
+
+def downgrade(conn, target):
+    """Revert migration sampai versi target"""
+    version = current_version(conn)
+    reverted = []
+
+    for migration in reversed(MIGRATIONS):
+        if target < migration.version <= version:
+            try:
+                conn.execute("BEGIN")
+                _run_steps(conn, migration.downgrade)
+                conn.execute("DELETE FROM schema_version WHERE version = ?", (migration.version,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.error(f"Downgrade of migration {migration.version} failed")
+                raise
+            reverted.append(migration.version)
+            logger.info(f"Reverted migration {migration.version}: {migration.description}")
+
+    return reverted
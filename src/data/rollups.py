@@ -0,0 +1,132 @@
+import logging
+
+from src.data.database import bump_data_version
+from src.data import category_stats, spending_features
+
+logger = logging.getLogger(__name__)
+
+# Category NULL disimpan sebagai '' supaya bisa jadi bagian primary key
+NO_CATEGORY = ''
+
+CREATE_ROLLUP_TABLE = """
+    CREATE TABLE IF NOT EXISTS transaction_rollups (
+        year_month TEXT NOT NULL,
+        transaction_type TEXT NOT NULL,
+        category TEXT NOT NULL DEFAULT '',
+        txn_count INTEGER NOT NULL DEFAULT 0,
+        total_amount REAL NOT NULL DEFAULT 0,
+        min_amount REAL,
+        max_amount REAL,
+        PRIMARY KEY (year_month, transaction_type, category)
+    ) WITHOUT ROWID
+"""
+
+UPSERT_SQL = """
+    INSERT INTO transaction_rollups
+        (year_month, transaction_type, category, txn_count, total_amount, min_amount, max_amount)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (year_month, transaction_type, category) DO UPDATE SET
+        txn_count = txn_count + excluded.txn_count,
+        total_amount = total_amount + excluded.total_amount,
+        min_amount = MIN(min_amount, excluded.min_amount),
+        max_amount = MAX(max_amount, excluded.max_amount)
+"""
+
+
+def _group_key(date_value, transaction_type, category):
+    return (str(date_value)[:7], transaction_type, category or NO_CATEGORY)
+
+
+def apply_insert(conn, rows):
+    """
+    Tambahkan rows baru ke rollup.
+    rows: iterable of (date, amount, transaction_type, category, ...)
+    Caller yang commit, supaya rollup ikut transaction yang sama dengan insert.
+    """
+    rows = list(rows)
+    groups = {}
+    for row in rows:
+        date_value, amount, transaction_type, category = row[:4]
+        key = _group_key(date_value, transaction_type, category)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [1, amount, amount, amount]
+        else:
+            group[0] += 1
+            group[1] += amount
+            group[2] = min(group[2], amount)
+            group[3] = max(group[3], amount)
+
+    conn.executemany(UPSERT_SQL, [
+        (key[0], key[1], key[2], count, total, min_amount, max_amount)
+        for key, (count, total, min_amount, max_amount) in groups.items()
+    ])
+    spending_features.refresh_months(conn, [key[0] for key in groups if key[1] == 'expense'])
+    category_stats.apply_delta(conn, [(row[1], row[3]) for row in rows if row[2] == 'expense'])
+
+
+def apply_delete(conn, row):
+    """Kurangi rollup untuk satu transaksi yang dihapus (date, amount, transaction_type, category)"""
+    date_value, amount, transaction_type, category = row[:4]
+    key = _group_key(date_value, transaction_type, category)
+
+    current = conn.execute("""
+        SELECT txn_count, min_amount, max_amount FROM transaction_rollups
+        WHERE year_month = ? AND transaction_type = ? AND category = ?
+    """, key).fetchone()
+    if current is None:
+        return
+
+    if current[0] <= 1:
+        conn.execute("""
+            DELETE FROM transaction_rollups
+            WHERE year_month = ? AND transaction_type = ? AND category = ?
+        """, key)
+        _refresh_expense_aggregates(conn, key, amount, category)
+        return
+
+    conn.execute("""
+        UPDATE transaction_rollups
+        SET txn_count = txn_count - 1, total_amount = total_amount - ?
+        WHERE year_month = ? AND transaction_type = ? AND category = ?
+    """, (amount, *key))
+
+    # Min/max tidak bisa dikurangi, hitung ulang hanya untuk group ini
+    if amount <= current[1] or amount >= current[2]:
+        conn.execute("""
+            UPDATE transaction_rollups SET
+                min_amount = (SELECT MIN(amount) FROM transactions
+                              WHERE year_month = ? AND transaction_type = ? AND COALESCE(category, '') = ?),
+                max_amount = (SELECT MAX(amount) FROM transactions
+                              WHERE year_month = ? AND transaction_type = ? AND COALESCE(category, '') = ?)
+            WHERE year_month = ? AND transaction_type = ? AND category = ?
+        """, (*key, *key, *key))
+
+    _refresh_expense_aggregates(conn, key, amount, category)
+
+
+def _refresh_expense_aggregates(conn, key, amount, category):
+    if key[1] == 'expense':
+        spending_features.refresh_months(conn, [key[0]])
+        category_stats.apply_delta(conn, [(amount, category)], sign=-1)
+
+
+def rebuild(conn, bump_version=True, with_features=True):
+    """Hitung ulang seluruh rollup (dan monthly spending features) dari tabel transactions"""
+    conn.execute("DELETE FROM transaction_rollups")
+    conn.execute("""
+        INSERT INTO transaction_rollups
+            (year_month, transaction_type, category, txn_count, total_amount, min_amount, max_amount)
+        SELECT year_month, transaction_type, COALESCE(category, ''),
+               COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+        FROM transactions
+        GROUP BY year_month, transaction_type, COALESCE(category, '')
+    """)
+    if with_features:
+        spending_features.rebuild(conn)
+        category_stats.rebuild(conn)
+    if bump_version:
+        bump_data_version(conn)
+    count = conn.execute("SELECT COUNT(*) FROM transaction_rollups").fetchone()[0]
+    logger.info(f"Rebuilt transaction rollups: {count} groups")
+    return count
@@ -0,0 +1,62 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# External content FTS5 index atas transactions.description (teks tidak disimpan dua kali).
+# Di-maintain trigger, jadi semua jalur tulis (API, bulk ingest, script) otomatis ikut.
+CREATE_FTS_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description,
+        content='transactions',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+CREATE_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);
+    END
+    """
+]
+
+DROP_FTS = [
+    "DROP TRIGGER IF EXISTS transactions_fts_update",
+    "DROP TRIGGER IF EXISTS transactions_fts_delete",
+    "DROP TRIGGER IF EXISTS transactions_fts_insert",
+    "DROP TABLE IF EXISTS transactions_fts"
+]
+
+# Filter WHERE untuk tabel transactions, parameter = match_query(...)
+SEARCH_FILTER = "id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)"
+
+
+def rebuild(conn):
+    """Index ulang semua description dari tabel transactions"""
+    conn.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+    logger.info("Rebuilt transaction description search index")
+
+
+def match_query(text):
+    """
+    Input bebas user -> FTS5 query: tiap kata jadi prefix term yang di-quote (operator/sintaks FTS5
+    di input tidak diinterpretasi), semua kata harus cocok. None jika tidak ada kata.
+    """
+    terms = [term.replace('"', '""') for term in (text or '').split()]
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+from src.data.loaders import apply_dtypes, resolve_dtypes
+
+logger = logging.getLogger(__name__)
+
+# Layout: <snapshot_dir>/year_month=YYYY-MM/part-0.parquet + _manifest.json
+# File berawalan '_' atau '.' diabaikan pyarrow.dataset (manifest dan file sementara)
+SNAPSHOT_COLUMNS = ['id', 'date', 'amount', 'transaction_type', 'category', 'description', 'created_at']
+PARTITION_KEY = 'year_month'
+PARTITION_FILE = 'part-0.parquet'
+MANIFEST_FILE = '_manifest.json'
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('id', pa.int64()),
+        ('date', pa.timestamp('s')),
+        ('amount', pa.float64()),
+        ('transaction_type', pa.dictionary(pa.int32(), pa.string())),
+        ('category', pa.dictionary(pa.int32(), pa.string())),
+        ('description', pa.string()),
+        ('created_at', pa.timestamp('s')),
+    ])
+
+
+def _partition_dir(snapshot_dir, year_month):
+    return Path(snapshot_dir) / f"{PARTITION_KEY}={year_month}"
+
+
+def read_manifest(snapshot_dir):
+    path = Path(snapshot_dir) / MANIFEST_FILE
+    if not path.exists():
+        return {'partitions': {}}
+    return json.loads(path.read_text())
+
+
+def _write_manifest(snapshot_dir, manifest):
+    path = Path(snapshot_dir) / MANIFEST_FILE
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def month_signatures(conn):
+    """
+    (row count, max id, total amount) per bulan, dari covering index (year_month, type, amount).
+    Tanpa UPDATE dan dengan id AUTOINCREMENT, insert/delete apapun di satu bulan mengubah signature-nya.
+    """
+    return {
+        year_month: [count, max_id, total]
+        for year_month, count, max_id, total in conn.execute("""
+            SELECT year_month, COUNT(*), MAX(id), SUM(amount)
+            FROM transactions GROUP BY year_month
+        """)
+    }
+
+
+def rows_to_table(rows):
+    """Row tuple SQLite (urutan SNAPSHOT_COLUMNS) -> pyarrow Table dengan schema snapshot"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    schema = _schema()
+    if not rows:
+        return schema.empty_table()
+
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if pa.types.is_timestamp(field.type):
+            array = pc.cast(pa.array(values, pa.string()), field.type)
+        elif pa.types.is_dictionary(field.type):
+            array = pa.array(values, pa.string()).dictionary_encode()
+        else:
+            array = pa.array(values, field.type)
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _write_partition(conn, snapshot_dir, year_month, row_group_size):
+    """Tulis ulang satu partition: file sementara lalu os.replace, reader tidak pernah lihat file setengah jadi"""
+    import pyarrow.parquet as pq
+
+    rows = conn.execute(f"""
+        SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM transactions
+        WHERE year_month = ? ORDER BY id
+    """, (year_month,)).fetchall()
+    table = rows_to_table(rows)
+
+    partition_dir = _partition_dir(snapshot_dir, year_month)
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = partition_dir / f".{PARTITION_FILE}.tmp"
+    pq.write_table(table, tmp_path, row_group_size=row_group_size)
+    os.replace(tmp_path, partition_dir / PARTITION_FILE)
+    return len(rows)
+
+
+def export_snapshot(conn, snapshot_dir, full=False, row_group_size=100000):
+    """
+    Export tabel transactions ke Parquet per year_month.
+    Incremental: hanya bulan yang signature-nya berubah yang ditulis ulang, bulan baru jadi partition baru.
+    Dibaca dalam satu read transaction (WAL: writer tidak ter-block).
+    """
+    start = time.perf_counter()
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = {} if full else read_manifest(snapshot_dir)['partitions']
+    written = []
+    rows_written = 0
+
+    conn.execute("BEGIN")
+    try:
+        current = month_signatures(conn)
+        for year_month, signature in sorted(current.items()):
+            if previous.get(year_month) != signature:
+                rows_written += _write_partition(conn, snapshot_dir, year_month, row_group_size)
+                written.append(year_month)
+    finally:
+        conn.rollback()
+
+    # Bulan yang sudah tidak punya transaksi (atau sisa export sebelumnya saat full)
+    removed = []
+    for partition_dir in snapshot_dir.glob(f"{PARTITION_KEY}=*"):
+        year_month = partition_dir.name.split('=', 1)[1]
+        if year_month not in current:
+            shutil.rmtree(partition_dir, ignore_errors=True)
+            removed.append(year_month)
+
+    _write_manifest(snapshot_dir, {
+        'partitions': current,
+        'columns': SNAPSHOT_COLUMNS,
+        'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+    })
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Snapshot exported to {snapshot_dir}: {len(written)} partitions written "
+        f"({rows_written} rows), {len(removed)} removed, {elapsed:.2f}s"
+    )
+    return {
+        "partitions": len(current),
+        "written": written,
+        "removed": sorted(removed),
+        "unchanged": len(current) - len(written),
+        "rows_written": rows_written,
+        "elapsed_ms": round(elapsed * 1000, 2)
+    }
+
+
+def _dataset(snapshot_dir):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(pa.schema([(PARTITION_KEY, pa.string())]), flavor='hive')
+    schema = _schema().append(pa.field(PARTITION_KEY, pa.string()))
+    return ds.dataset(Path(snapshot_dir), format='parquet', partitioning=partitioning, schema=schema)
+
+
+def read_snapshot(snapshot_dir, columns, filter=None, dtypes=None):
+    """
+    Baca snapshot dengan column projection dan predicate pushdown.
+    filter: pyarrow.dataset expression; filter pada year_month memangkas partition,
+    filter kolom lain memakai statistik row group. Dtype sama dengan loaders.load_transactions.
+    """
+    dtypes = resolve_dtypes([column for column in columns if column != PARTITION_KEY], dtypes)
+    table = _dataset(snapshot_dir).to_table(columns=columns, filter=filter)
+    df = table.to_pandas()
+    return apply_dtypes(df, [column for column in columns if column != PARTITION_KEY], dtypes)
+
+
+def expense_filter():
+    import pyarrow.dataset as ds
+
+    return ds.field('transaction_type') == 'expense'
+
+
+def category_training_filter():
+    """Sama dengan loaders.CATEGORY_TRAINING_WHERE"""
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    return (
+        ds.field('description').is_valid()
+        & ds.field('category').is_valid()
+        & (pc.utf8_length(ds.field('description')) > 3)
+    )
@@ -0,0 +1,119 @@
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = ['total_spending', 'transaction_count', 'spending_ma_3', 'spending_trend', 'month']
+
+CREATE_FEATURES_TABLE = """
+    CREATE TABLE IF NOT EXISTS monthly_spending_features (
+        year_month TEXT PRIMARY KEY,
+        total_spending REAL NOT NULL,
+        transaction_count INTEGER NOT NULL,
+        spending_ma_3 REAL NOT NULL,
+        spending_trend REAL NOT NULL,
+        month INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+
+# Window fitur: MA3 butuh 2 bulan sebelumnya, jadi perubahan di bulan M
+# mempengaruhi M dan 2 bulan (yang ada expense-nya) setelahnya
+WINDOW = 3
+
+
+def _refresh_totals(conn, year_month):
+    """Ambil total/count expense satu bulan dari transaction_rollups (beberapa row per kategori)"""
+    total, count = conn.execute("""
+        SELECT SUM(total_amount), SUM(txn_count) FROM transaction_rollups
+        WHERE year_month = ? AND transaction_type = 'expense'
+    """, (year_month,)).fetchone()
+
+    if not count:
+        conn.execute("DELETE FROM monthly_spending_features WHERE year_month = ?", (year_month,))
+        return
+
+    # MA/trend sementara, dihitung ulang di _refresh_derived
+    conn.execute("""
+        INSERT INTO monthly_spending_features
+            (year_month, total_spending, transaction_count, spending_ma_3, spending_trend, month)
+        VALUES (?, ?, ?, ?, 0, ?)
+        ON CONFLICT (year_month) DO UPDATE SET
+            total_spending = excluded.total_spending,
+            transaction_count = excluded.transaction_count
+    """, (year_month, total, count, total, int(year_month[5:7])))
+
+
+def _refresh_derived(conn, year_month):
+    """Hitung MA3 dan trend satu bulan dari maksimal 3 row terakhir"""
+    rows = conn.execute("""
+        SELECT total_spending FROM monthly_spending_features
+        WHERE year_month <= ? ORDER BY year_month DESC LIMIT ?
+    """, (year_month, WINDOW)).fetchall()
+    if not rows:
+        return
+
+    totals = [row[0] for row in rows]
+    moving_average = sum(totals) / len(totals)
+    previous = totals[1] if len(totals) > 1 else None
+    trend = (totals[0] - previous) / previous if previous else 0.0
+
+    conn.execute("""
+        UPDATE monthly_spending_features SET spending_ma_3 = ?, spending_trend = ?
+        WHERE year_month = ?
+    """, (moving_average, trend, year_month))
+
+
+def refresh_months(conn, year_months):
+    """
+    Update fitur untuk bulan yang berubah + window setelahnya.
+    Insert di bulan berjalan hanya menyentuh satu row. Caller yang commit.
+    """
+    year_months = sorted(set(year_months))
+    if not year_months:
+        return
+
+    for year_month in year_months:
+        _refresh_totals(conn, year_month)
+
+    affected = set()
+    for year_month in year_months:
+        following = conn.execute("""
+            SELECT year_month FROM monthly_spending_features
+            WHERE year_month >= ? ORDER BY year_month LIMIT ?
+        """, (year_month, WINDOW)).fetchall()
+        affected.update(row[0] for row in following)
+
+    for year_month in sorted(affected):
+        _refresh_derived(conn, year_month)
+
+
+def rebuild(conn):
+    """Hitung ulang seluruh tabel dari transaction_rollups"""
+    conn.execute("DELETE FROM monthly_spending_features")
+    months = [row[0] for row in conn.execute("""
+        SELECT DISTINCT year_month FROM transaction_rollups
+        WHERE transaction_type = 'expense' ORDER BY year_month
+    """)]
+    for year_month in months:
+        _refresh_totals(conn, year_month)
+        _refresh_derived(conn, year_month)
+    logger.info(f"Rebuilt monthly spending features: {len(months)} months")
+    return len(months)
+
+
+def latest(conn):
+    """Feature vector bulan terakhir sebagai dict, atau None jika belum ada expense"""
+    row = conn.execute(f"""
+        SELECT year_month, {', '.join(FEATURE_COLUMNS)} FROM monthly_spending_features
+        ORDER BY year_month DESC LIMIT 1
+    """).fetchone()
+    return dict(zip(['year_month'] + FEATURE_COLUMNS, row)) if row else None
+
+
+def load_all(conn):
+    """Seluruh history bulanan (urut naik) untuk training"""
+    return pd.read_sql_query(f"""
+        SELECT year_month, {', '.join(FEATURE_COLUMNS)} FROM monthly_spending_features
+        ORDER BY year_month
+    """, conn)
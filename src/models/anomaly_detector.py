@@ -5,35 +5,85 @@ from datetime import datetime, timedelta
 import logging
 
 from src.models.base_model import BaseModel
+from src.models.fast_isolation_forest import CompiledIsolationForest
 
 logger = logging.getLogger(__name__)
 
+CATEGORY_ENCODING = {
+    'Makanan': 1, 'Transportasi': 2, 'Belanja': 3, 
+    'Hiburan': 4, 'Kesehatan': 5, 'Lainnya': 6
+}
+DEFAULT_CATEGORY_CODE = 6
+# read_sql_query (pandas string dtype) membaca description NULL sebagai NaN -> str() = 'nan'
+MISSING_DESCRIPTION = 'nan'
+
 class AnomalyDetector(BaseModel):
     """ML model untuk detect anomalous transactions"""
     
     def __init__(self):
         super().__init__("anomaly_detector")
         self.feature_names = ['amount', 'description_length', 'category_encoding', 'amount_ratio']
+        # Versi array dari forest untuk scoring per insert, dibuat dari self.model (tidak disimpan)
+        self._compiled = None
+        
+    def feature_signature(self):
+        return list(self.feature_names)
+    
+    def warm_up(self):
+        if self.is_trained:
+            self.model.decision_function(np.zeros((1, len(self.feature_names))))
+            self._compiled_model()
+    
+    def _compiled_model(self):
+        if self._compiled is None:
+            self._compiled = CompiledIsolationForest(self.model)
+        return self._compiled
+    
+    def stream_features(self, rows, mean_amount):
+        """
+        Features untuk expense rows baru: rows berisi (amount, description, category).
+        amount_ratio memakai running mean semua expense, bukan mean dari DataFrame.
+        """
+        amounts = np.array([row[0] for row in rows], dtype=np.float64)
+        description_length = np.array(
+            [len(MISSING_DESCRIPTION if pd.isna(row[1]) else str(row[1])) for row in rows], dtype=np.float64
+        )
+        category_encoding = np.array([self._get_category_encoding(row[2]) for row in rows], dtype=np.float64)
+        amount_ratio = amounts / mean_amount if mean_amount > 0 else np.zeros(len(amounts))
+        return np.column_stack([amounts, description_length, category_encoding, amount_ratio])
+    
+    def score_rows(self, rows, mean_amount):
+        """Anomaly score (sama dengan decision_function, < 0 berarti anomaly) tanpa overhead sklearn per call"""
+        if not self.is_trained:
+            raise ValueError("Model not trained")
+        return self._compiled_model().decision_function(self.stream_features(rows, mean_amount))
         
     def _prepare_features(self, transactions_df):
-        """Prepare features untuk anomaly detection"""
+        """Prepare features untuk anomaly detection (vectorized, satu pass per kolom)"""
         expense_data = transactions_df[transactions_df['transaction_type'] == 'expense'].copy()
         
         if len(expense_data) == 0:
             return np.array([]), expense_data
         
-        # Feature engineering
-        features = []
-        for _, transaction in expense_data.iterrows():
-            feature_vector = [
-                transaction['amount'],
-                len(str(transaction['description'])),  # description length
-                self._get_category_encoding(transaction['category']),
-                transaction['amount'] / expense_data['amount'].mean() if expense_data['amount'].mean() > 0 else 0
-            ]
-            features.append(feature_vector)
+        amounts = expense_data['amount'].to_numpy(dtype=np.float64)
+        
+        # len(str(x)) per row, description kosong dihitung sebagai MISSING_DESCRIPTION
+        description_length = (
+            expense_data['description'].fillna(MISSING_DESCRIPTION)
+            .map(str).str.len().to_numpy(dtype=np.float64)
+        )
         
-        return np.array(features), expense_data
+        category_encoding = self._encode_categories(expense_data['category'])
+        
+        # Mean dihitung sekali, bukan per row
+        mean_amount = expense_data['amount'].mean()
+        if mean_amount > 0:
+            amount_ratio = amounts / mean_amount
+        else:
+            amount_ratio = np.zeros(len(amounts))
+        
+        features = np.column_stack([amounts, description_length, category_encoding, amount_ratio])
+        return features, expense_data
     
     def train(self, transactions_df, y=None):
         """Train anomaly detection model - match BaseModel signature"""
@@ -52,6 +102,7 @@ class AnomalyDetector(BaseModel):
             
             self.model.fit(X)
             self.is_trained = True
+            self._compiled = None
             
             # Calculate accuracy (pseudo-accuracy untuk unsupervised learning)
             scores = self.model.decision_function(X)
@@ -97,8 +148,8 @@ class AnomalyDetector(BaseModel):
             if len(expense_data) < 5:
                 return {"anomalies": [], "message": "Insufficient expense data"}
             
-            # Get predictions and scores
-            anomaly_scores = self.predict(transactions_df)
+            # Get predictions and scores (features sudah ada, tidak perlu prepare ulang)
+            anomaly_scores = self.model.decision_function(X)
             predictions = self.model.predict(X)
             
             # Get top anomalies
@@ -107,15 +158,19 @@ class AnomalyDetector(BaseModel):
             
             anomalies = expense_data[expense_data['is_anomaly']].nlargest(top_n, 'anomaly_score')
             
+            # Statistik untuk reason dihitung sekali untuk semua anomaly
+            category_means = expense_data.groupby('category', observed=True)['amount'].mean()
+            amount_p90 = expense_data['amount'].quantile(0.9)
+            
             result_anomalies = []
             for _, anomaly in anomalies.iterrows():
                 result_anomalies.append({
-                    'date': anomaly['date'],
+                    'date': self._format_date(anomaly['date']),
                     'amount': float(anomaly['amount']),
                     'category': anomaly['category'],
                     'description': anomaly['description'],
                     'anomaly_score': float(anomaly['anomaly_score']),
-                    'reason': self._get_anomaly_reason(anomaly, expense_data)
+                    'reason': self._get_anomaly_reason(anomaly, category_means, amount_p90)
                 })
             
             return {
@@ -128,22 +183,39 @@ class AnomalyDetector(BaseModel):
             logger.error(f"Error detecting anomalies: {e}")
             return {"error": str(e)}
     
+    def _encode_categories(self, categories):
+        """Vectorized _get_category_encoding; category dtype cukup di-lookup per kategori unik"""
+        if isinstance(categories.dtype, pd.CategoricalDtype):
+            lookup = np.array(
+                [self._get_category_encoding(category) for category in categories.cat.categories]
+                + [DEFAULT_CATEGORY_CODE],
+                dtype=np.float64
+            )
+            # code -1 (missing) -> elemen terakhir
+            return lookup[categories.cat.codes.to_numpy()]
+        
+        return (
+            categories.map(CATEGORY_ENCODING)
+            .fillna(DEFAULT_CATEGORY_CODE)
+            .to_numpy(dtype=np.float64)
+        )
+    
+    def _format_date(self, value):
+        """Loader typed mengembalikan datetime, response tetap 'YYYY-MM-DD'"""
+        return value.strftime('%Y-%m-%d') if isinstance(value, pd.Timestamp) else value
+    
     def _get_category_encoding(self, category):
         """Encode category to numerical value"""
-        category_map = {
-            'Makanan': 1, 'Transportasi': 2, 'Belanja': 3, 
-            'Hiburan': 4, 'Kesehatan': 5, 'Lainnya': 6
-        }
-        return category_map.get(category, 6)
+        return CATEGORY_ENCODING.get(category, DEFAULT_CATEGORY_CODE)
     
-    def _get_anomaly_reason(self, transaction, all_transactions):
-        """Generate human-readable reason for anomaly"""
+    def _get_anomaly_reason(self, transaction, category_means, amount_p90):
+        """Generate human-readable reason for anomaly dari statistik yang sudah dihitung"""
         try:
-            category_avg = all_transactions[all_transactions['category'] == transaction['category']]['amount'].mean()
+            category_avg = category_means.get(transaction['category'], np.nan)
             
             if transaction['amount'] > category_avg * 2:
                 return f"Amount 2x higher than category average (Rp {category_avg:,.0f})"
-            elif transaction['amount'] > all_transactions['amount'].quantile(0.9):
+            elif transaction['amount'] > amount_p90:
                 return "In top 10% of all transactions by amount"
             else:
                 return "Unusual spending pattern detected"
@@ -28,23 +28,27 @@ class BaseModel(ABC):
         """Save model and vectorizer"""
         model_dir.mkdir(parents=True, exist_ok=True)
         
+        # compress=0: numpy arrays disimpan raw supaya bisa di-load dengan mmap_mode
         if self.model:
-            joblib.dump(self.model, model_dir / f"{self.model_name}_model.pkl")
+            joblib.dump(self.model, model_dir / f"{self.model_name}_model.pkl", compress=0)
         if self.vectorizer:
-            joblib.dump(self.vectorizer, model_dir / f"{self.model_name}_vectorizer.pkl")
+            joblib.dump(self.vectorizer, model_dir / f"{self.model_name}_vectorizer.pkl", compress=0)
         
         logger.info(f"Model saved to {model_dir}")
     
-    def load_model(self, model_dir: Path):
-        """Load model and vectorizer"""
+    def load_model(self, model_dir: Path, mmap_mode=None):
+        """
+        Load model and vectorizer.
+        mmap_mode='r' memory-map numpy arrays dari file, page-nya di-share antar process.
+        """
         try:
             model_path = model_dir / f"{self.model_name}_model.pkl"
             vectorizer_path = model_dir / f"{self.model_name}_vectorizer.pkl"
             
             if model_path.exists():
-                self.model = joblib.load(model_path)
+                self.model = joblib.load(model_path, mmap_mode=mmap_mode)
             if vectorizer_path.exists():
-                self.vectorizer = joblib.load(vectorizer_path)
+                self.vectorizer = joblib.load(vectorizer_path, mmap_mode=mmap_mode)
             
             self.is_trained = self.model is not None
             logger.info(f"Model loaded from {model_dir}")
@@ -53,6 +57,14 @@ class BaseModel(ABC):
             logger.error(f"Error loading model: {e}")
             return False
     
+    def feature_signature(self):
+        """Daftar feature yang dipakai model, untuk feature hash di model registry"""
+        return []
+    
+    def warm_up(self):
+        """Satu prediksi dummy setelah load, supaya request pertama tidak bayar lazy init"""
+        pass
+    
     def evaluate(self, X_test, y_test):
         """Evaluate model performance"""
         from sklearn.metrics import accuracy_score, classification_report
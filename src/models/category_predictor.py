@@ -4,45 +4,55 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
-import re
 import joblib
 from pathlib import Path
 import logging
 
 from src.models.base_model import BaseModel
+from src.models.prediction_cache import PredictionCache
+from src.models.text_normalizer import default_normalizer
 
 logger = logging.getLogger(__name__)
 
 class CategoryPredictor(BaseModel):
     """ML model untuk predict transaction category berdasarkan description"""
     
-    def __init__(self):
+    def __init__(self, cache_size=10000, cache_ttl=3600, normalizer=None):
         super().__init__("category_predictor")
         self.categories = None
         self.feature_names = None
+        self.normalizer = normalizer or default_normalizer
+        # Naik setiap kali model berubah, jadi bagian dari cache key
+        self.model_version = 0
+        self.prediction_cache = PredictionCache(max_size=cache_size, ttl=cache_ttl)
+    
+    def _invalidate_prediction_cache(self):
+        """Model berubah: cache lama tidak boleh dipakai lagi"""
+        self.model_version += 1
+        self.prediction_cache.clear()
+    
+    def save_model(self, model_dir):
+        super().save_model(model_dir)
+        self._invalidate_prediction_cache()
+    
+    def load_model(self, model_dir, mmap_mode=None):
+        loaded = super().load_model(model_dir, mmap_mode=mmap_mode)
+        self._invalidate_prediction_cache()
+        return loaded
+    
+    def warm_up(self):
+        if self.is_trained:
+            # Langsung ke model, tidak mengisi prediction cache
+            self.model.predict_proba(self.prepare_features([self.preprocess_text("makan siang")]))
+        
+    def feature_signature(self):
+        if self.vectorizer is None or not hasattr(self.vectorizer, 'vocabulary_'):
+            return []
+        return list(self.vectorizer.get_feature_names_out())
         
     def preprocess_text(self, text):
         """Enhanced text preprocessing"""
-        if not isinstance(text, str):
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters and numbers, keep Indonesian characters
-        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
-        
-        # Indonesian stopwords (basic)
-        indonesian_stopwords = {'di', 'ke', 'dan', 'atau', 'yang', 'untuk', 'pada', 'dengan', 'ini', 'itu'}
-        
-        # Remove stopwords
-        words = text.split()
-        words = [word for word in words if word not in indonesian_stopwords and len(word) > 2]
-        
-        # Remove extra whitespace
-        text = ' '.join(words)
-        
-        return text
+        return self.normalizer.normalize(text)
     
     def prepare_features(self, descriptions):
         """Prepare features dari transaction descriptions"""
@@ -63,7 +73,7 @@ class CategoryPredictor(BaseModel):
         """Train model dengan transaction data"""
         try:
             # Prepare data
-            descriptions = transactions_df['description'].apply(self.preprocess_text)
+            descriptions = self.normalizer.normalize_batch(transactions_df['description'])
             categories = transactions_df['category']
             
             # Get unique categories
@@ -89,6 +99,7 @@ class CategoryPredictor(BaseModel):
             
             self.model.fit(X_train, y_train)
             self.is_trained = True
+            self._invalidate_prediction_cache()
             
             # Evaluate
             train_accuracy = accuracy_score(y_train, self.model.predict(X_train))
@@ -111,7 +122,7 @@ class CategoryPredictor(BaseModel):
             descriptions = [descriptions]
         
         # Preprocess
-        processed_descriptions = [self.preprocess_text(desc) for desc in descriptions]
+        processed_descriptions = self.normalizer.normalize_batch(descriptions)
         
         # Prepare features
         features = self.prepare_features(processed_descriptions)
@@ -126,24 +137,77 @@ class CategoryPredictor(BaseModel):
         else:
             return predictions
     
-    def predict_single(self, description, amount=0):
-        """Predict single transaction dengan confidence"""
+    def _predict_proba_cached(self, processed_descriptions):
+        """predict_proba dengan LRU cache per processed description"""
+        version = self.model_version
+        rows = [self.prediction_cache.get((text, version)) for text in processed_descriptions]
+        
+        # Hanya description yang belum di-cache yang lewat TF-IDF + random forest
+        missing = list(dict.fromkeys(
+            text for text, row in zip(processed_descriptions, rows) if row is None
+        ))
+        if missing:
+            computed = self.model.predict_proba(self.prepare_features(missing))
+            computed_by_text = dict(zip(missing, computed))
+            for text, row in computed_by_text.items():
+                self.prediction_cache.set((text, version), row)
+            rows = [computed_by_text[text] if row is None else row
+                    for text, row in zip(processed_descriptions, rows)]
+        
+        return np.vstack(rows)
+    
+    def predict_topk(self, descriptions, k=3, amounts=None, min_confidence=0.0):
+        """
+        Predict category + top-k alternatives untuk batch descriptions.
+        Preprocess, TF-IDF dan predict_proba masing-masing hanya sekali untuk seluruh batch.
+        """
         if not self.is_trained:
-            return "Lainnya", 0.0
+            raise ValueError("Model not trained")
         
-        try:
-            prediction, confidence = self.predict([description], return_confidence=True)
-            
-            # Rule-based fallback untuk amount-based categories
-            predicted_category = prediction[0]
-            final_confidence = confidence[0]
+        if isinstance(descriptions, str):
+            descriptions = [descriptions]
+        if amounts is None:
+            amounts = [0] * len(descriptions)
+        
+        processed_descriptions = self.normalizer.normalize_batch(descriptions)
+        probabilities = self._predict_proba_cached(processed_descriptions)
+        classes = self.model.classes_
+        
+        # Urutan kategori per row, confidence tertinggi dulu
+        ranked = np.argsort(-probabilities, axis=1, kind='stable')
+        
+        results = []
+        for row, order, amount in zip(probabilities, ranked, amounts):
+            predicted_category = str(classes[order[0]])
+            confidence = float(row[order[0]])
             
             # Amount-based rules (optional enhancement)
             if amount > 1000000 and predicted_category == "Lainnya":
                 predicted_category = "Belanja"
-                final_confidence = max(final_confidence, 0.7)
+                confidence = max(confidence, 0.7)
+            
+            alternatives = [
+                {"category": str(classes[idx]), "confidence": float(row[idx])}
+                for idx in order[:k]
+                if row[idx] > min_confidence
+            ]
             
-            return predicted_category, float(final_confidence)
+            results.append({
+                "predicted_category": predicted_category,
+                "confidence": confidence,
+                "alternatives": alternatives
+            })
+        
+        return results
+    
+    def predict_single(self, description, amount=0):
+        """Predict single transaction dengan confidence"""
+        if not self.is_trained:
+            return "Lainnya", 0.0
+        
+        try:
+            result = self.predict_topk([description], k=1, amounts=[amount])[0]
+            return result["predicted_category"], result["confidence"]
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
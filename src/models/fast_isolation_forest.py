@@ -0,0 +1,81 @@
+import numpy as np
+
+TREE_LEAF = -1
+
+
+def _average_path_length(n_samples):
+    """c(n) dari paper Isolation Forest, sama dengan sklearn _average_path_length"""
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros_like(n_samples)
+    mask_1 = n_samples <= 1
+    mask_2 = n_samples == 2
+    not_mask = ~(mask_1 | mask_2)
+    result[mask_2] = 1.0
+    result[not_mask] = (
+        2.0 * (np.log(n_samples[not_mask] - 1.0) + np.euler_gamma)
+        - 2.0 * (n_samples[not_mask] - 1.0) / n_samples[not_mask]
+    )
+    return result
+
+
+class CompiledIsolationForest:
+    """
+    Semua tree dari fitted IsolationForest dalam satu set numpy array (tree x node).
+    Traversal dilakukan per level untuk semua tree sekaligus, jadi scoring beberapa row
+    tidak melewati loop Python per tree seperti decision_function.
+    Hasilnya sama dengan IsolationForest.decision_function.
+    """
+
+    def __init__(self, model):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        n_trees = len(trees)
+        n_nodes = max(tree.node_count for tree in trees)
+        n_features = model.n_features_in_
+
+        self.left = np.full((n_trees, n_nodes), TREE_LEAF, dtype=np.intp)
+        self.right = np.full((n_trees, n_nodes), TREE_LEAF, dtype=np.intp)
+        self.feature = np.zeros((n_trees, n_nodes), dtype=np.intp)
+        self.threshold = np.zeros((n_trees, n_nodes), dtype=np.float64)
+        self.leaf_depth = np.zeros((n_trees, n_nodes), dtype=np.float64)
+
+        subsample_features = model._max_features != n_features
+        for i, (tree, features) in enumerate(zip(trees, model.estimators_features_)):
+            count = tree.node_count
+            self.left[i, :count] = tree.children_left
+            self.right[i, :count] = tree.children_right
+            tree_features = np.where(tree.feature >= 0, tree.feature, 0)
+            self.feature[i, :count] = np.asarray(features)[tree_features] if subsample_features else tree_features
+            self.threshold[i, :count] = tree.threshold
+            # Kontribusi leaf ke path length: depth + c(n_samples di leaf) - 1
+            self.leaf_depth[i, :count] = (
+                tree.compute_node_depths() + _average_path_length(tree.n_node_samples) - 1.0
+            )
+
+        self.is_leaf = self.left == TREE_LEAF
+        self.max_depth = max(tree.max_depth for tree in trees)
+        self.n_trees = n_trees
+        self.offset = float(model.offset_)
+        self.denominator = n_trees * float(_average_path_length([model._max_samples])[0])
+        self._tree_index = np.arange(n_trees)[:, None]
+
+    def score_samples(self, X):
+        # Sama dengan sklearn: input di-cast ke float32 sebelum dibandingkan dengan threshold
+        X = np.asarray(X, dtype=np.float32)
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)[None, :]
+        trees = self._tree_index
+        nodes = np.zeros((self.n_trees, n_samples), dtype=np.intp)
+
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[trees, nodes]]
+            go_left = values <= self.threshold[trees, nodes]
+            next_nodes = np.where(go_left, self.left[trees, nodes], self.right[trees, nodes])
+            nodes = np.where(self.is_leaf[trees, nodes], nodes, next_nodes)
+
+        depths = self.leaf_depth[trees, nodes].sum(axis=0)
+        if self.denominator == 0:
+            return -np.ones(n_samples)
+        return -(2.0 ** (-depths / self.denominator))
+
+    def decision_function(self, X):
+        return self.score_samples(X) - self.offset
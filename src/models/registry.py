@@ -0,0 +1,332 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LEGACY_VERSION = 'legacy'
+CURRENT_POINTER = 'CURRENT'
+METADATA_FILE = 'metadata.json'
+
+
+class ModelNotAvailableError(Exception):
+    """Raised when a model (version) cannot be found or loaded"""
+
+
+def feature_hash(features):
+    """Hash stabil dari daftar feature, untuk cek kompatibilitas versi"""
+    digest = hashlib.sha256('\n'.join(map(str, features)).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _atomic_write_text(path, text):
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ModelRegistry:
+    """
+    Versioned model artifacts di filesystem:
+
+        <root>/<name>/versions/<version>/   artifacts + metadata.json
+        <root>/<name>/CURRENT               versi aktif (ditulis atomik)
+
+    Artifact lama langsung di <root>/<name>/ dibaca sebagai versi 'legacy'.
+    """
+
+    def __init__(self, root_dir, keep_versions=5):
+        self.root_dir = Path(root_dir)
+        self.keep_versions = keep_versions
+
+    def _model_dir(self, name):
+        return self.root_dir / name
+
+    def _versions_dir(self, name):
+        return self._model_dir(name) / 'versions'
+
+    def version_dir(self, name, version):
+        if version == LEGACY_VERSION:
+            return self._model_dir(name)
+        return self._versions_dir(name) / version
+
+    def _has_legacy_artifacts(self, name):
+        model_dir = self._model_dir(name)
+        return model_dir.exists() and any(model_dir.glob('*_model.pkl'))
+
+    def current_version(self, name):
+        """Versi aktif dari CURRENT pointer, 'legacy', atau None"""
+        pointer = self._model_dir(name) / CURRENT_POINTER
+        try:
+            version = pointer.read_text().strip()
+        except FileNotFoundError:
+            version = None
+        if version:
+            return version
+        return LEGACY_VERSION if self._has_legacy_artifacts(name) else None
+
+    def pointer_mtime(self, name):
+        try:
+            return (self._model_dir(name) / CURRENT_POINTER).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def metadata(self, name, version):
+        if version == LEGACY_VERSION:
+            return {'version': LEGACY_VERSION, 'model_name': name}
+        try:
+            return json.loads((self.version_dir(name, version) / METADATA_FILE).read_text())
+        except FileNotFoundError:
+            raise ModelNotAvailableError(f"{name} version {version} not found")
+
+    def list_versions(self, name):
+        """Semua versi yang tersimpan, terbaru dulu"""
+        versions_dir = self._versions_dir(name)
+        versions = []
+        if versions_dir.exists():
+            for path in versions_dir.iterdir():
+                metadata_path = path / METADATA_FILE
+                if path.is_dir() and not path.name.startswith('.') and metadata_path.exists():
+                    # created_at hanya sampai detik: mtime metadata memisahkan versi di detik yang sama
+                    versions.append((self.metadata(name, path.name), metadata_path.stat().st_mtime_ns))
+        versions.sort(key=lambda item: (item[0].get('created_at', ''), item[1]), reverse=True)
+        return [meta for meta, _ in versions]
+
+    def publish(self, name, model, training_rows=None, accuracy=None, extra=None, activate=True):
+        """
+        Simpan model sebagai versi baru. Artifact ditulis ke temp dir lalu di-rename,
+        jadi reader tidak pernah melihat versi setengah jadi.
+        """
+        versions_dir = self._versions_dir(name)
+        versions_dir.mkdir(parents=True, exist_ok=True)
+
+        created_at = datetime.now()
+        version = f"{created_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        metadata = {
+            'version': version,
+            'model_name': name,
+            'model_class': type(model).__name__,
+            'created_at': created_at.isoformat(timespec='seconds'),
+            'training_rows': training_rows,
+            'accuracy': None if accuracy is None else float(accuracy),
+            'feature_hash': feature_hash(model.feature_signature()),
+            'previous_version': self.current_version(name),
+            **(extra or {})
+        }
+
+        tmp_dir = versions_dir / f".tmp-{version}"
+        try:
+            model.save_model(tmp_dir)
+            (tmp_dir / METADATA_FILE).write_text(json.dumps(metadata, indent=2))
+            os.replace(tmp_dir, versions_dir / version)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(name, version)
+        logger.info(f"Published {name} version {version}")
+        return metadata
+
+    def activate(self, name, version):
+        """Pindahkan CURRENT pointer ke versi yang sudah ada"""
+        if version != LEGACY_VERSION:
+            self.metadata(name, version)
+        elif not self._has_legacy_artifacts(name):
+            raise ModelNotAvailableError(f"{name} has no legacy artifacts")
+
+        model_dir = self._model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write_text(model_dir / CURRENT_POINTER, version)
+        self._prune(name)
+        return version
+
+    def previous_version(self, name):
+        current = self.current_version(name)
+        if current in (None, LEGACY_VERSION):
+            return None
+        return self.metadata(name, current).get('previous_version')
+
+    def rollback(self, name):
+        """Aktifkan kembali versi sebelum versi aktif"""
+        previous = self.previous_version(name)
+        if not previous:
+            raise ModelNotAvailableError(f"{name} has no previous version to roll back to")
+        return self.activate(name, previous)
+
+    def _prune(self, name):
+        """Hapus versi lama, kecuali versi aktif dan versi sebelumnya"""
+        if not self.keep_versions:
+            return
+        current = self.current_version(name)
+        protected = {current, self.previous_version(name)}
+        for meta in self.list_versions(name)[self.keep_versions:]:
+            if meta['version'] not in protected:
+                shutil.rmtree(self.version_dir(name, meta['version']), ignore_errors=True)
+
+
+class ModelHandle:
+    """
+    Read-copy-update reference ke model aktif.
+    Reader mengambil snapshot via current(); versi baru di-load ke instance terpisah
+    lalu reference-nya di-swap, jadi request yang sedang jalan tidak melihat model berubah.
+    Tanpa load() eksplisit, model di-load saat current() pertama kali dipanggil.
+    """
+
+    def __init__(self, name, factory, registry, check_interval=5.0, mmap_mode=None, warm_up=False):
+        self.name = name
+        self.factory = factory
+        self.registry = registry
+        self.check_interval = check_interval
+        self.mmap_mode = mmap_mode
+        self.warm_up = warm_up
+
+        # (model, version, metadata) - selalu diganti utuh, tidak pernah diubah
+        self._snapshot = (factory(), None, None)
+        # RLock: _initialize memegang lock selama load() pertama, caller lain menunggu di sini
+        self._swap_lock = threading.RLock()
+        self._loading = None
+        self._last_error = None
+        self._last_check = 0.0
+        self._pointer_mtime = None
+        self._initialized = False
+        self.load_ms = None
+        self.swaps = 0
+
+    def _initialize(self):
+        """Lazy load saat model pertama kali dipakai; caller lain menunggu load yang sedang jalan"""
+        with self._swap_lock:
+            if self._initialized:
+                return
+            try:
+                self.load()
+            except Exception as e:
+                logger.warning(f"{self.name} could not be loaded: {e}")
+            finally:
+                self._initialized = True
+
+    def current(self):
+        """Model aktif; cek CURRENT pointer berkala supaya versi dari process lain ikut ter-load"""
+        if not self._initialized:
+            self._initialize()
+            return self._snapshot[0]
+
+        now = time.monotonic()
+        if self.check_interval is not None and now - self._last_check >= self.check_interval:
+            self._last_check = now
+            mtime = self.registry.pointer_mtime(self.name)
+            if mtime != self._pointer_mtime and self._loading is None:
+                self.reload_async()
+        return self._snapshot[0]
+
+    @property
+    def version(self):
+        return self._snapshot[1]
+
+    def current_with_version(self):
+        """(model, version) dari snapshot yang sama"""
+        self.current()
+        model, version, _ = self._snapshot
+        return model, version
+
+    def loaded_with_version(self):
+        """
+        Seperti current_with_version() tapi tanpa lazy load: sebelum load pertama
+        return placeholder factory() yang belum trained. Untuk caller yang tidak boleh menunggu disk.
+        """
+        if self._initialized:
+            self.current()
+        model, version, _ = self._snapshot
+        return model, version
+
+    def _load(self, version):
+        model = self.factory()
+        model_dir = self.registry.version_dir(self.name, version)
+        if not model.load_model(model_dir, mmap_mode=self.mmap_mode) or not model.is_trained:
+            raise ModelNotAvailableError(f"Failed to load {self.name} version {version}")
+        if self.warm_up:
+            model.warm_up()
+        return model
+
+    def load(self, version=None):
+        """Load versi (default: CURRENT) lalu swap. Return versi yang aktif."""
+        with self._swap_lock:
+            mtime = self.registry.pointer_mtime(self.name)
+            version = version or self.registry.current_version(self.name)
+            if version is None or version == self._snapshot[1]:
+                self._pointer_mtime = mtime
+                self._initialized = True
+                return version
+
+            self._loading = version
+            start = time.perf_counter()
+            try:
+                model = self._load(version)
+                metadata = self.registry.metadata(self.name, version)
+            except Exception as e:
+                self._last_error = str(e)
+                raise
+            finally:
+                self._loading = None
+
+            self.load_ms = round((time.perf_counter() - start) * 1000, 1)
+            self._snapshot = (model, version, metadata)
+            self._pointer_mtime = mtime
+            self._last_error = None
+            self.swaps += 1
+            # Baru setelah swap: current() tidak boleh melewati load pertama yang belum selesai
+            self._initialized = True
+
+        logger.info(f"{self.name} now serving version {version}")
+        return version
+
+    def reload_async(self, version=None):
+        """Load di background thread; request tetap dilayani versi lama sampai swap"""
+        def run():
+            try:
+                self.load(version)
+            except Exception as e:
+                logger.error(f"Background reload of {self.name} failed: {e}")
+
+        thread = threading.Thread(target=run, name=f"reload-{self.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def rollback(self):
+        """Kembali ke versi sebelumnya dan swap langsung"""
+        version = self.registry.rollback(self.name)
+        return self.load(version)
+
+    def status(self):
+        model, version, metadata = self._snapshot
+        return {
+            "name": self.name,
+            "loaded": self._initialized,
+            "is_trained": model.is_trained,
+            "active_version": version,
+            "metadata": metadata,
+            "registry_version": self.registry.current_version(self.name),
+            "previous_version": self.registry.previous_version(self.name),
+            "available_versions": [meta['version'] for meta in self.registry.list_versions(self.name)],
+            "loading": self._loading,
+            "last_error": self._last_error,
+            "swaps": self.swaps,
+            "load_ms": self.load_ms,
+            "mmap_mode": self.mmap_mode
+        }
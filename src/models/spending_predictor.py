@@ -18,6 +18,20 @@ class SpendingPredictor(BaseModel):
         super().__init__("spending_predictor")
         self.feature_columns = []
         
+    def load_model(self, model_dir: Path, mmap_mode=None):
+        loaded = super().load_model(model_dir, mmap_mode=mmap_mode)
+        # feature_columns tidak ikut di-pickle; ambil dari model yang di-fit dengan DataFrame
+        if self.model is not None:
+            self.feature_columns = list(getattr(self.model, 'feature_names_in_', self.feature_columns))
+        return loaded
+
+    def feature_signature(self):
+        return list(self.feature_columns)
+
+    def warm_up(self):
+        if self.is_trained:
+            self.model.predict(pd.DataFrame([[0.0] * len(self.feature_columns)], columns=self.feature_columns))
+
     def prepare_features(self, transactions_df):
         """Prepare features untuk training dan prediction"""
         # Convert to datetime
@@ -47,9 +61,11 @@ class SpendingPredictor(BaseModel):
     
     def train(self, transactions_df, y=None):
         """Train spending prediction model - match BaseModel signature"""
+        return self.train_monthly(self.prepare_features(transactions_df))
+    
+    def train_monthly(self, monthly_data):
+        """Train dari monthly features yang sudah jadi (tabel monthly_spending_features)"""
         try:
-            monthly_data = self.prepare_features(transactions_df)
-            
             if len(monthly_data) < 3:
                 logger.warning("Not enough data for spending prediction training")
                 return 0.0
@@ -116,14 +132,32 @@ class SpendingPredictor(BaseModel):
         
         try:
             prediction = self.predict(transactions_df)
+            return self._format_prediction(prediction[0])
             
-            return {
-                "predicted_amount": float(prediction[0]),
-                "confidence": 0.7,
-                "currency": "IDR",
-                "next_month": (datetime.now() + timedelta(days=30)).strftime("%Y-%m")
-            }
+        except Exception as e:
+            logger.error(f"Error predicting next month: {e}")
+            return {"error": str(e)}
+    
+    def predict_from_features(self, features):
+        """
+        Predict next month dari feature vector bulan terakhir (dict per kolom),
+        constant time, tanpa membaca history transaksi
+        """
+        if not self.is_trained:
+            return {"error": "Model not trained"}
+        
+        try:
+            X = pd.DataFrame([[features[col] for col in self.feature_columns]], columns=self.feature_columns)
+            return self._format_prediction(self.model.predict(X)[0])
             
         except Exception as e:
             logger.error(f"Error predicting next month: {e}")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+    
+    def _format_prediction(self, predicted_amount):
+        return {
+            "predicted_amount": float(predicted_amount),
+            "confidence": 0.7,
+            "currency": "IDR",
+            "next_month": (datetime.now() + timedelta(days=30)).strftime("%Y-%m")
+        }
\ No newline at end of file
@@ -0,0 +1,90 @@
+import re
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Indonesian stopwords (basic)
+INDONESIAN_STOPWORDS = frozenset({'di', 'ke', 'dan', 'atau', 'yang', 'untuk', 'pada', 'dengan', 'ini', 'itu'})
+
+# Remove special characters and numbers, keep letters and whitespace
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+
+_PARTICLES = ('lah', 'kah', 'tah', 'pun')
+_POSSESSIVES = ('nya', 'ku', 'mu')
+_SUFFIXES = ('kan', 'an')
+_PREFIXES = ('meng', 'meny', 'men', 'mem', 'me', 'peng', 'peny', 'pen', 'pem',
+             'ber', 'ter', 'per', 'di', 'ke')
+
+
+def light_stem(word, min_stem=4):
+    """
+    Light stemmer untuk affix Bahasa Indonesia.
+    Buang particle, possessive, satu suffix dan satu prefix selama sisa kata >= min_stem.
+    """
+    for group in (_PARTICLES, _POSSESSIVES, _SUFFIXES):
+        for suffix in group:
+            if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+                word = word[:-len(suffix)]
+                break
+
+    for prefix in _PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) >= min_stem:
+            return word[len(prefix):]
+
+    return word
+
+
+class TextNormalizer:
+    """Reusable text normalization pipeline untuk transaction descriptions"""
+
+    def __init__(self, stopwords=INDONESIAN_STOPWORDS, min_length=3, stem=False, token_filters=None):
+        self.stopwords = frozenset(stopwords or ())
+        self.min_length = min_length
+        self.stem = stem
+        # Callable(token) -> token baru, atau None untuk membuang token
+        self.token_filters = list(token_filters or [])
+
+    def _filter_tokens(self, text):
+        stopwords = self.stopwords
+        min_length = self.min_length
+        words = [word for word in text.split() if word not in stopwords and len(word) >= min_length]
+
+        if self.stem:
+            words = [light_stem(word) for word in words]
+
+        for token_filter in self.token_filters:
+            words = [word for word in map(token_filter, words) if word]
+
+        return ' '.join(words)
+
+    def normalize(self, text):
+        """Normalize satu description"""
+        if not isinstance(text, str):
+            return ""
+        return self._filter_tokens(NON_ALPHA_PATTERN.sub(' ', text.lower()))
+
+    def normalize_batch(self, texts):
+        """
+        Normalize banyak descriptions sekaligus.
+        Description yang sama hanya diproses sekali (factorize), hasil berupa Series/list sesuai input.
+        """
+        series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+        if series.empty:
+            return series.astype(object) if isinstance(texts, pd.Series) else []
+
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        normalized_uniques = [self.normalize(value) for value in uniques]
+        # Sentinel -1 (NaN/None) ke "" di posisi terakhir
+        normalized_uniques.append("")
+        lookup = pd.Series(normalized_uniques, dtype=object)
+
+        result = lookup.take(codes)
+        if isinstance(texts, pd.Series):
+            result.index = texts.index
+            return result
+        return result.tolist()
+
+
+default_normalizer = TextNormalizer()
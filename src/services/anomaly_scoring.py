@@ -0,0 +1,134 @@
+import logging
+
+from config.config import ANOMALY_CONFIG
+from src.data import category_stats
+from src.data.database import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+UPDATE_SQL = """
+    UPDATE transactions SET anomaly_score = ?, is_anomaly = ?, anomaly_model_version = ?
+    WHERE id = ?
+"""
+
+
+def _score_updates(detector, version, rows, mean_amount):
+    """rows: (id, amount, description, category) -> parameter UPDATE_SQL"""
+    scores = detector.score_rows([row[1:] for row in rows], mean_amount)
+    # Sama dengan IsolationForest.predict: anomaly jika decision_function < 0
+    return [(float(score), int(score < 0), version, row[0]) for score, row in zip(scores, rows)]
+
+
+def store_scores(conn, detector, version, ids, values):
+    """
+    Score expense rows baru dan simpan score + flag di row-nya.
+    values: tuple (date, amount, type, category, description) urut sama dengan ids.
+    Dipanggil setelah rollups.apply_insert, jadi running mean sudah termasuk row baru.
+    """
+    rows = [
+        (transaction_id, value[1], value[4], value[3])
+        for transaction_id, value in zip(ids, values) if value[2] == 'expense'
+    ]
+    if not rows:
+        return 0
+
+    updates = _score_updates(detector, version, rows, category_stats.mean_amount(conn))
+    conn.executemany(UPDATE_SQL, updates)
+    return len(updates)
+
+
+def score_new_rows(conn, ids, values):
+    """
+    Hook insert (opt-in: ANOMALY_CONFIG['streaming']): score dengan model aktif di write
+    transaction yang sama; caller yang commit. Error scoring hanya di-log, insert tetap jalan.
+    Model hanya dipakai jika sudah di-load (create_app warm-up): load dari disk di sini akan
+    menahan write lock selama itu. Row yang tidak ter-score ikut rescore_all berikutnya.
+    """
+    if not ANOMALY_CONFIG['streaming']:
+        return 0
+
+    try:
+        # Import di sini: worker process training memakai module ini tanpa model handles
+        from src.services.model_service import model_handles
+
+        detector, version = model_handles['anomaly_detector'].loaded_with_version()
+        if not detector.is_trained:
+            return 0
+        return store_scores(conn, detector, version, ids, values)
+    except Exception as e:
+        logger.error(f"Error scoring new transactions: {e}")
+        return 0
+
+
+def rescore_all(conn, detector, version, chunk_size=5000, progress=None):
+    """
+    Score ulang semua expense rows (setelah model baru di-train), satu write transaction per chunk.
+    progress: optional callable(scored_rows)
+    """
+    mean_amount = category_stats.mean_amount(conn)
+    last_id = 0
+    scored = 0
+
+    while True:
+        rows = conn.execute("""
+            SELECT id, amount, description, category FROM transactions
+            WHERE transaction_type = 'expense' AND id > ?
+            ORDER BY id LIMIT ?
+        """, (last_id, chunk_size)).fetchall()
+        if not rows:
+            break
+
+        updates = _score_updates(detector, version, rows, mean_amount)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(UPDATE_SQL, updates)
+            bump_data_version(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        last_id = rows[-1][0]
+        scored += len(rows)
+        if progress:
+            progress(scored)
+
+    logger.info(f"Rescored {scored} expense transactions with anomaly_detector version {version}")
+    return scored
+
+
+def top_anomalies(conn, detector, top_n=5):
+    """
+    Versi tersimpan dari AnomalyDetector.detect_anomalies: baca index (is_anomaly, anomaly_score)
+    dan running category stats, tanpa load/score ulang seluruh tabel.
+    Urutan sama dengan batch mode: anomaly_score terbesar di antara yang ter-flag, tie -> id terkecil.
+    """
+    stats = category_stats.load(conn)
+    if stats['count'] < 5:
+        return {"anomalies": [], "message": "Insufficient expense data"}
+
+    rows = conn.execute("""
+        SELECT date, amount, category, description, anomaly_score FROM transactions
+        WHERE is_anomaly = 1
+        ORDER BY anomaly_score DESC, id LIMIT ?
+    """, (top_n,)).fetchall()
+    total_flagged = conn.execute("SELECT COUNT(*) FROM transactions WHERE is_anomaly = 1").fetchone()[0]
+
+    anomalies = []
+    for row in rows:
+        transaction = dict(zip(('date', 'amount', 'category', 'description', 'anomaly_score'), row))
+        anomalies.append({
+            'date': transaction['date'],
+            'amount': float(transaction['amount']),
+            'category': transaction['category'],
+            'description': transaction['description'],
+            'anomaly_score': float(transaction['anomaly_score']),
+            'reason': detector._get_anomaly_reason(transaction, stats['category_means'], stats['p90'])
+        })
+
+    return {
+        "anomalies": anomalies,
+        "total_analyzed": stats['count'],
+        "anomaly_count": len(anomalies),
+        "total_flagged": total_flagged
+    }
@@ -0,0 +1,50 @@
+import logging
+
+from config.config import AI_CONFIG, MODELS_DIR, MODEL_REGISTRY_CONFIG, MODEL_LOADING_CONFIG
+from src.models.category_predictor import CategoryPredictor
+from src.models.spending_predictor import SpendingPredictor
+from src.models.anomaly_detector import AnomalyDetector
+from src.models.registry import ModelRegistry, ModelHandle
+from src.services.training_jobs import get_job_manager
+
+logger = logging.getLogger(__name__)
+
+# Model aktif di-serve lewat RCU handle: setiap request ambil snapshot via .current(),
+# versi baru di-load di background lalu di-swap. Load pertama terjadi saat dipakai.
+model_registry = ModelRegistry(MODELS_DIR, keep_versions=MODEL_REGISTRY_CONFIG['keep_versions'])
+handle_options = {
+    'check_interval': MODEL_REGISTRY_CONFIG['check_interval'],
+    'mmap_mode': MODEL_LOADING_CONFIG['mmap_mode'],
+    'warm_up': MODEL_LOADING_CONFIG['warm_up']
+}
+model_handles = {
+    'category_model': ModelHandle(
+        'category_model',
+        lambda: CategoryPredictor(
+            cache_size=AI_CONFIG['prediction_cache_size'],
+            cache_ttl=AI_CONFIG['prediction_cache_ttl']
+        ),
+        model_registry,
+        **handle_options
+    ),
+    'spending_predictor': ModelHandle('spending_predictor', SpendingPredictor, model_registry, **handle_options),
+    'anomaly_detector': ModelHandle('anomaly_detector', AnomalyDetector, model_registry, **handle_options),
+}
+
+
+def init_ai_models():
+    """Load semua AI models sekarang (preload/warm-up hook, default-nya lazy)"""
+    for name, handle in model_handles.items():
+        try:
+            # Load versi aktif (atau artifact legacy)
+            if handle.load() is None:
+                logger.info(f"{name} needs training")
+        except Exception as e:
+            logger.warning(f"{name} could not be loaded: {e}")
+
+    logger.info("AI models initialization completed")
+
+
+# Training jalan di process lain; versi baru di-swap setelah job selesai
+for _name, _handle in model_handles.items():
+    get_job_manager().on_success(_name, lambda job, handle=_handle: handle.reload_async())
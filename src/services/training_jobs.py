@@ -0,0 +1,517 @@
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from src.data import snapshots, spending_features
+from src.data.loaders import (
+    load_transactions, ANOMALY_COLUMNS, CATEGORY_TRAINING_COLUMNS, CATEGORY_TRAINING_WHERE, SPENDING_COLUMNS
+)
+from src.data.database import ConnectionPool, get_connection
+from src.models.registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+JOB_COLUMNS = """
+    id, job_type, status, progress, message, params, result, error,
+    cancel_requested, owner_pid, created_at, started_at, finished_at
+"""
+
+
+class JobCancelled(Exception):
+    """Raised di worker process saat job diminta berhenti"""
+
+
+# ==================== WORKER PROCESS ====================
+
+_worker_pool = None
+
+
+def _init_worker(db_path, pragmas):
+    """Initializer process pool: koneksi sendiri ke database yang sama dengan API"""
+    global _worker_pool
+    _worker_pool = ConnectionPool(db_path, pool_size=1, pragmas=pragmas)
+
+
+class JobContext:
+    """Progress reporting dan cancellation check untuk task yang sedang jalan"""
+
+    def __init__(self, job_id, models_dir, keep_versions=5):
+        self.job_id = job_id
+        self.models_dir = Path(models_dir)
+        self.registry = ModelRegistry(models_dir, keep_versions=keep_versions)
+
+    def connection(self):
+        return _worker_pool.connection()
+
+    def _check_cancelled(self, conn):
+        row = conn.execute(
+            "SELECT cancel_requested FROM training_jobs WHERE id = ?", (self.job_id,)
+        ).fetchone()
+        if row is None or row[0]:
+            raise JobCancelled(f"Job {self.job_id} cancelled")
+
+    def start(self):
+        with self.connection() as conn:
+            self._check_cancelled(conn)
+            conn.execute("""
+                UPDATE training_jobs
+                SET status = ?, started_at = CURRENT_TIMESTAMP, message = ?
+                WHERE id = ?
+            """, (RUNNING, "Started", self.job_id))
+            conn.commit()
+
+    def progress(self, fraction, message):
+        """Simpan progress (0..1) dan berhenti jika job di-cancel"""
+        with self.connection() as conn:
+            conn.execute(
+                "UPDATE training_jobs SET progress = ?, message = ? WHERE id = ?",
+                (round(float(fraction), 3), message, self.job_id)
+            )
+            conn.commit()
+            self._check_cancelled(conn)
+
+
+def _train_category_model(ctx, params):
+    from src.models.category_predictor import CategoryPredictor
+
+    ctx.progress(0.1, "Loading training data")
+    df = _training_frame(
+        ctx, CATEGORY_TRAINING_COLUMNS,
+        where=CATEGORY_TRAINING_WHERE,
+        snapshot_filter=snapshots.category_training_filter
+    )
+
+    if len(df) < 10:
+        raise ValueError("Not enough training data. Need at least 10 transactions.")
+
+    ctx.progress(0.3, f"Training on {len(df)} transactions")
+    model = CategoryPredictor()
+    accuracy = model.train(df)
+
+    ctx.progress(0.9, "Publishing model version")
+    metadata = ctx.registry.publish('category_model', model, training_rows=len(df), accuracy=accuracy)
+
+    return {
+        "training_samples": len(df),
+        "accuracy": float(accuracy),
+        "categories": [str(category) for category in model.categories],
+        "model_saved": True,
+        "version": metadata['version']
+    }
+
+
+def _use_snapshot():
+    from config.config import SNAPSHOT_CONFIG
+
+    return SNAPSHOT_CONFIG['training_source'] == 'snapshot'
+
+
+def _training_frame(ctx, columns, where, snapshot_filter):
+    """
+    Training data dari SQLite, atau dari Parquet snapshot (SNAPSHOT_CONFIG['training_source']).
+    Snapshot dibaca dengan column projection + predicate pushdown; database hanya dibaca untuk
+    export bulan yang berubah.
+    """
+    from config.config import DATA_LOADING_CONFIG, SNAPSHOT_CONFIG
+
+    if not _use_snapshot():
+        with ctx.connection() as conn:
+            return load_transactions(
+                conn, columns, where=where, engine=DATA_LOADING_CONFIG['engine']
+            )
+
+    if SNAPSHOT_CONFIG['refresh_before_training']:
+        with ctx.connection() as conn:
+            snapshots.export_snapshot(
+                conn, SNAPSHOT_CONFIG['dir'], row_group_size=SNAPSHOT_CONFIG['row_group_size']
+            )
+    return snapshots.read_snapshot(SNAPSHOT_CONFIG['dir'], columns, filter=snapshot_filter())
+
+
+def _load_transactions(ctx):
+    # Detector hanya memakai expense
+    return _training_frame(
+        ctx, ANOMALY_COLUMNS, where="transaction_type = 'expense'",
+        snapshot_filter=snapshots.expense_filter
+    )
+
+
+def _train_spending_predictor(ctx, params):
+    from src.models.spending_predictor import SpendingPredictor
+
+    if _use_snapshot():
+        ctx.progress(0.1, "Loading expenses from snapshot")
+        expenses = _training_frame(
+            ctx, SPENDING_COLUMNS, where="transaction_type = 'expense'",
+            snapshot_filter=snapshots.expense_filter
+        )
+        monthly = SpendingPredictor().prepare_features(expenses)
+    else:
+        ctx.progress(0.1, "Loading monthly spending features")
+        with ctx.connection() as conn:
+            monthly = spending_features.load_all(conn)
+
+    ctx.progress(0.3, f"Training on {len(monthly)} months")
+    model = SpendingPredictor()
+    accuracy = model.train_monthly(monthly)
+    if not model.is_trained:
+        raise ValueError("Not enough monthly spending data. Need at least 3 months.")
+
+    ctx.progress(0.9, "Publishing model version")
+    metadata = ctx.registry.publish('spending_predictor', model, training_rows=len(monthly), accuracy=accuracy)
+
+    return {"training_samples": len(monthly), "accuracy": float(accuracy), "model_saved": True,
+            "version": metadata['version']}
+
+
+def _train_anomaly_detector(ctx, params):
+    from config.config import ANOMALY_CONFIG
+    from src.models.anomaly_detector import AnomalyDetector
+
+    ctx.progress(0.1, "Loading transactions")
+    df = _load_transactions(ctx)
+
+    ctx.progress(0.3, f"Training on {len(df)} transactions")
+    model = AnomalyDetector()
+    accuracy = model.train(df)
+    if not model.is_trained:
+        raise ValueError("Not enough expense data. Need at least 10 expense transactions.")
+
+    ctx.progress(0.8, "Publishing model version")
+    metadata = ctx.registry.publish('anomaly_detector', model, training_rows=len(df), accuracy=accuracy)
+
+    rescored = 0
+    if ANOMALY_CONFIG['streaming']:
+        # Score tersimpan harus berasal dari model baru, termasuk row sebelum streaming aktif
+        from src.services import anomaly_scoring
+
+        ctx.progress(0.85, "Rescoring stored anomaly scores")
+        with ctx.connection() as conn:
+            rescored = anomaly_scoring.rescore_all(
+                conn, model, metadata['version'],
+                chunk_size=ANOMALY_CONFIG['rescore_chunk_size']
+            )
+
+    return {"training_samples": len(df), "normal_ratio": float(accuracy), "model_saved": True,
+            "version": metadata['version'], "rescored_rows": rescored}
+
+
+# job_type -> task(ctx, params) -> dict yang bisa di-JSON
+TASKS = {
+    'category_model': _train_category_model,
+    'spending_predictor': _train_spending_predictor,
+    'anomaly_detector': _train_anomaly_detector,
+}
+
+
+def run_job(job_type, job_id, params, models_dir, keep_versions=5):
+    """Entry point di worker process"""
+    ctx = JobContext(job_id, models_dir, keep_versions)
+    ctx.start()
+    result = TASKS[job_type](ctx, params or {})
+    ctx.progress(1.0, "Completed")
+    return result
+
+
+# ==================== API PROCESS ====================
+
+def _process_alive(pid):
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        # os.kill(pid, 0) di Windows menghentikan process, anggap masih hidup
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _row_to_job(row):
+    job = dict(row)
+    for key in ('params', 'result'):
+        job[key] = json.loads(job[key]) if job[key] else None
+    job['cancel_requested'] = bool(job['cancel_requested'])
+    return job
+
+
+class JobManager:
+    """Submit training ke process pool lokal, state job disimpan di tabel training_jobs"""
+
+    def __init__(self, db_path, models_dir, max_workers=1, start_method='spawn',
+                 history_limit=200, pragmas=None, keep_versions=5):
+        self.db_path = str(db_path)
+        self.models_dir = str(models_dir)
+        self.keep_versions = keep_versions
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.history_limit = history_limit
+        self.pragmas = dict(pragmas or {})
+
+        self._executor = None
+        self._futures = {}
+        self._listeners = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(self.db_path, self.pragmas)
+                )
+            return self._executor
+
+    def on_success(self, job_type, callback):
+        """Register callback(job) setelah job_type selesai, mis. reload model"""
+        self._listeners.setdefault(job_type, []).append(callback)
+
+    def recover_interrupted(self):
+        """Tandai job aktif milik process yang sudah mati sebagai failed"""
+        with get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT id, owner_pid FROM training_jobs WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                ACTIVE_STATUSES
+            ).fetchall()
+            stale = [row['id'] for row in rows if not _process_alive(row['owner_pid'])]
+            for job_id in stale:
+                self._mark_finished(conn, job_id, FAILED, error="Interrupted: server process exited")
+            conn.commit()
+        if stale:
+            logger.warning(f"Marked {len(stale)} interrupted training job(s) as failed")
+        return stale
+
+    def get(self, job_id):
+        with get_connection() as conn:
+            row = conn.execute(
+                f"SELECT {JOB_COLUMNS} FROM training_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list_jobs(self, limit=50, job_type=None, status=None):
+        where, params = [], []
+        if job_type:
+            where.append("job_type = ?")
+            params.append(job_type)
+        if status:
+            where.append("status = ?")
+            params.append(status)
+
+        query = f"SELECT {JOB_COLUMNS} FROM training_jobs"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created_at DESC, rowid DESC LIMIT ?"
+        params.append(limit)
+
+        with get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def _find_active(self, conn, job_type):
+        row = conn.execute(f"""
+            SELECT {JOB_COLUMNS} FROM training_jobs
+            WHERE job_type = ? AND status IN (?, ?) AND cancel_requested = 0
+            ORDER BY created_at DESC, rowid DESC LIMIT 1
+        """, (job_type, *ACTIVE_STATUSES)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def _find_recent_failure(self, conn, job_type, within):
+        """Job terakhir yang selesai jika failed dalam `within` detik terakhir"""
+        row = conn.execute(f"""
+            SELECT {JOB_COLUMNS} FROM training_jobs
+            WHERE job_type = ? AND finished_at IS NOT NULL
+            ORDER BY finished_at DESC, rowid DESC LIMIT 1
+        """, (job_type,)).fetchone()
+        if row is None or row['status'] != FAILED:
+            return None
+        recent = conn.execute(
+            "SELECT ? >= datetime('now', ?)", (row['finished_at'], f"-{int(within)} seconds")
+        ).fetchone()[0]
+        return _row_to_job(row) if recent else None
+
+    def find_active(self, job_type):
+        with get_connection() as conn:
+            return self._find_active(conn, job_type)
+
+    def submit(self, job_type, params=None, reuse_active=True, retry_after=None):
+        """
+        Queue training job. Return (job, created).
+        Jika job_type yang sama masih aktif, job itu dikembalikan (created=False).
+        retry_after (detik): jika job terakhir failed dalam rentang itu, job failed tersebut
+        dikembalikan (created=False) dan tidak ada job baru.
+        """
+        if job_type not in TASKS:
+            raise ValueError(f"Unknown job type '{job_type}'. Available: {', '.join(TASKS)}")
+
+        job_id = uuid.uuid4().hex
+        with get_connection() as conn:
+            # Check + insert dalam satu write lock: worker gunicorn lain tidak bisa membuat
+            # job aktif yang sama di antaranya
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = None
+                if reuse_active:
+                    existing = self._find_active(conn, job_type)
+                if existing is None and retry_after:
+                    existing = self._find_recent_failure(conn, job_type, retry_after)
+                if existing is not None:
+                    conn.rollback()
+                    return existing, False
+
+                conn.execute("""
+                    INSERT INTO training_jobs (id, job_type, status, message, params, owner_pid)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (job_id, job_type, QUEUED, "Waiting for worker", json.dumps(params or {}), os.getpid()))
+                self._prune_history(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        try:
+            future = self._get_executor().submit(run_job, job_type, job_id, params, self.models_dir, self.keep_versions)
+        except BrokenProcessPool:
+            self._reset_executor()
+            future = self._get_executor().submit(run_job, job_type, job_id, params, self.models_dir, self.keep_versions)
+
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finish(job_id, job_type, f))
+
+        logger.info(f"Queued training job {job_id} ({job_type})")
+        return self.get(job_id), True
+
+    def cancel(self, job_id):
+        """
+        Cancel job. Job yang masih antri langsung dibatalkan,
+        job yang sedang jalan berhenti di checkpoint progress berikutnya.
+        """
+        job = self.get(job_id)
+        if job is None or job['status'] not in ACTIVE_STATUSES:
+            return job
+
+        with get_connection() as conn:
+            conn.execute("UPDATE training_jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            conn.commit()
+
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            # Berhasil hanya jika belum diambil worker; _finish menandai cancelled
+            future.cancel()
+
+        return self.get(job_id)
+
+    def _finish(self, job_id, job_type, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+        result, error = None, None
+        if future.cancelled():
+            status = CANCELLED
+        else:
+            exc = future.exception()
+            if exc is None:
+                status, result = SUCCEEDED, future.result()
+            elif isinstance(exc, JobCancelled):
+                status = CANCELLED
+            else:
+                status, error = FAILED, str(exc)
+                if isinstance(exc, BrokenProcessPool):
+                    self._reset_executor()
+
+        try:
+            with get_connection() as conn:
+                self._mark_finished(conn, job_id, status, result=result, error=error)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to record result of job {job_id}: {e}")
+            return
+
+        logger.info(f"Training job {job_id} ({job_type}) {status}")
+        if status == SUCCEEDED:
+            job = self.get(job_id)
+            for callback in self._listeners.get(job_type, []):
+                try:
+                    callback(job)
+                except Exception as e:
+                    logger.error(f"Post-training hook for {job_type} failed: {e}")
+
+    def _mark_finished(self, conn, job_id, status, result=None, error=None):
+        message = {SUCCEEDED: "Completed", CANCELLED: "Cancelled"}.get(status, "Failed")
+        conn.execute("""
+            UPDATE training_jobs
+            SET status = ?, result = ?, error = ?, message = ?,
+                progress = CASE WHEN ? = 'succeeded' THEN 1.0 ELSE progress END,
+                finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (status, json.dumps(result) if result is not None else None, error, message, status, job_id))
+
+    def _prune_history(self, conn):
+        conn.execute(f"""
+            DELETE FROM training_jobs
+            WHERE status NOT IN ({','.join('?' * len(ACTIVE_STATUSES))})
+            AND rowid NOT IN (
+                SELECT rowid FROM training_jobs ORDER BY created_at DESC, rowid DESC LIMIT ?
+            )
+        """, (*ACTIVE_STATUSES, self.history_limit))
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """Get (atau buat) shared JobManager dari JOBS_CONFIG"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                from config.config import DATABASE_CONFIG, JOBS_CONFIG, MODELS_DIR, MODEL_REGISTRY_CONFIG
+                _manager = JobManager(
+                    DATABASE_CONFIG['path'],
+                    MODELS_DIR,
+                    max_workers=JOBS_CONFIG.get('max_workers', 1),
+                    start_method=JOBS_CONFIG.get('start_method', 'spawn'),
+                    history_limit=JOBS_CONFIG.get('history_limit', 200),
+                    pragmas=DATABASE_CONFIG.get('pragmas'),
+                    keep_versions=MODEL_REGISTRY_CONFIG.get('keep_versions', 5)
+                )
+    return _manager
+
+
+def shutdown_job_manager(wait=True):
+    """Shutdown shared JobManager jika sudah ada; tidak membuat manager baru hanya untuk dimatikan"""
+    if _manager is not None:
+        _manager.shutdown(wait=wait)
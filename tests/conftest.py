@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Sama dengan api/app.py: root untuk src/config, api/ untuk routes.*
+ROOT_DIR = Path(__file__).parent.parent
+for path in (ROOT_DIR, ROOT_DIR / "api"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from config.config import DATABASE_CONFIG
+from src.data import database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Database kosong per test; shared pool (get_connection) diarahkan ke file ini"""
+    path = tmp_path / "finance.db"
+    monkeypatch.setitem(DATABASE_CONFIG, "path", path)
+    monkeypatch.setattr(database, "_pool", None)
+    yield path
+    if database._pool is not None:
+        database._pool.close_all()
+
+
+@pytest.fixture
+def migrated_db(db_path):
+    from src.data.migrations import upgrade
+
+    with database.get_connection() as conn:
+        upgrade(conn)
+    return db_path
+
+
+@pytest.fixture
+def client(db_path):
+    """Flask test client di atas database kosong yang sudah di-migrate oleh create_app"""
+    from app import create_app
+    from api.utils.response_cache import analytics_cache
+
+    # Cache key tidak memuat path database, jangan bawa entry dari test lain
+    analytics_cache.clear()
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+@pytest.fixture
+def trained_spending_predictor():
+    from src.models.spending_predictor import SpendingPredictor
+
+    monthly = pd.DataFrame({
+        "year_month": ["2025-01", "2025-02", "2025-03", "2025-04"],
+        "total_spending": [1000000.0, 1200000.0, 900000.0, 1100000.0],
+        "transaction_count": [10, 12, 9, 11],
+        "spending_ma_3": [1000000.0, 1100000.0, 1033333.3, 1066666.7],
+        "spending_trend": [0.0, 0.2, -0.25, 0.22],
+        "month": [1, 2, 3, 4],
+    })
+    model = SpendingPredictor()
+    model.train_monthly(monthly)
+    assert model.is_trained
+    return model
+
+
+
+@pytest.fixture
+def trained_anomaly_detector():
+    from src.models.anomaly_detector import AnomalyDetector
+
+    expenses = pd.DataFrame({
+        "date": [f"2025-01-{day:02d}" for day in range(1, 21)],
+        "amount": [20000.0 + 1500 * day for day in range(20)],
+        "transaction_type": ["expense"] * 20,
+        "category": ["Makanan", "Transportasi", "Belanja", None] * 5,
+        "description": [f"transaksi harian {day}" for day in range(20)],
+    })
+    model = AnomalyDetector()
+    model.train(expenses)
+    assert model.is_trained
+    return model
+
+
+@pytest.fixture
+def trained_category_predictor():
+    from src.models.category_predictor import CategoryPredictor
+
+    descriptions = {
+        "Makanan": ["makan siang warteg", "nasi goreng malam", "kopi susu pagi", "bakso dekat kantor", "sarapan bubur"],
+        "Transportasi": ["bensin motor", "ojek online kantor", "tiket kereta", "parkir mall", "tol jakarta"],
+        "Belanja": ["baju lebaran", "sepatu olahraga", "belanja bulanan", "tas kerja", "celana jeans"],
+    }
+    transactions = pd.DataFrame(
+        [(text, category) for category, texts in descriptions.items() for text in texts * 2],
+        columns=["description", "category"]
+    )
+    model = CategoryPredictor(cache_size=100)
+    model.train(transactions)
+    assert model.is_trained
+    return model
@@ -0,0 +1,19 @@
+def make_transaction(date="2025-01-15", amount=50000, type="expense", category="Makanan",
+                     description="makan siang"):
+    """Body POST /transactions/ (dan satu item /transactions/bulk)"""
+    return {"date": date, "amount": amount, "type": type, "category": category, "description": description}
+
+
+def sample_transactions():
+    """Beberapa bulan, tipe dan kategori (termasuk tanpa kategori) dengan amount berbeda-beda"""
+    rows = []
+    for i in range(24):
+        month = i % 4 + 1
+        rows.append(make_transaction(
+            date=f"2025-{month:02d}-{i % 28 + 1:02d}",
+            amount=10000 * (i + 1),
+            type="income" if i % 5 == 0 else "expense",
+            category=[None, "Makanan", "Transportasi", "Belanja"][i % 4],
+            description=f"transaksi {i}"
+        ))
+    return rows
@@ -0,0 +1,213 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from src.data.database import get_connection
+from src.models.anomaly_detector import AnomalyDetector
+from src.models.registry import ModelHandle, ModelRegistry
+from src.models.spending_predictor import SpendingPredictor
+from src.services.model_service import model_handles
+from src.services.training_jobs import FAILED, QUEUED, get_job_manager
+from tests.fixtures.transactions import make_transaction
+
+AI_URL = "/api/v1/ai"
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(tmp_path / "models")
+
+
+@pytest.fixture
+def untrained_models(registry, monkeypatch):
+    """spending_predictor dan anomaly_detector tanpa versi apa pun di registry"""
+    for name, factory in (("spending_predictor", SpendingPredictor), ("anomaly_detector", AnomalyDetector)):
+        monkeypatch.setitem(model_handles, name, ModelHandle(name, factory, registry, check_interval=None))
+
+
+class PendingExecutor:
+    """Executor yang tidak pernah menjalankan job, supaya test tidak spawn training process"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, *args):
+        self.submitted.append(args)
+        return Future()
+
+
+@pytest.fixture
+def executor(client, monkeypatch):
+    executor = PendingExecutor()
+    monkeypatch.setattr(get_job_manager(), "_get_executor", lambda: executor)
+    return executor
+
+
+def job_rows():
+    with get_connection() as conn:
+        return [tuple(row) for row in conn.execute("SELECT job_type, status FROM training_jobs ORDER BY rowid")]
+
+
+def add_expenses(client, months, per_month):
+    rows = [
+        make_transaction(date=f"2025-{month:02d}-{day + 1:02d}", amount=10000 * (day + 1))
+        for month in range(1, months + 1) for day in range(per_month)
+    ]
+    assert client.post("/api/v1/transactions/bulk", json={"transactions": rows}).status_code == 201
+
+
+# ==================== MODEL ROLLBACK ====================
+
+def test_rollback_without_previous_version_returns_409(client, registry, monkeypatch, trained_spending_predictor):
+    monkeypatch.setitem(
+        model_handles, "spending_predictor",
+        ModelHandle("spending_predictor", SpendingPredictor, registry, check_interval=None)
+    )
+    assert client.post(f"{AI_URL}/models/spending_predictor/rollback").status_code == 409
+
+    registry.publish("spending_predictor", trained_spending_predictor)
+    assert client.post(f"{AI_URL}/models/spending_predictor/rollback").status_code == 409
+
+
+def test_rollback_swaps_to_previous_version(client, registry, monkeypatch, trained_spending_predictor):
+    handle = ModelHandle("spending_predictor", SpendingPredictor, registry, check_interval=None)
+    monkeypatch.setitem(model_handles, "spending_predictor", handle)
+    first = registry.publish("spending_predictor", trained_spending_predictor)
+    registry.publish("spending_predictor", trained_spending_predictor)
+
+    response = client.post(f"{AI_URL}/models/spending_predictor/rollback")
+
+    assert response.status_code == 200
+    assert response.get_json()["data"]["active_version"] == first["version"]
+    assert registry.current_version("spending_predictor") == first["version"]
+    assert handle.version == first["version"]
+
+
+def test_rollback_unknown_model_returns_404(client):
+    assert client.post(f"{AI_URL}/models/unknown/rollback").status_code == 404
+
+
+# ==================== AUTO TRAINING ====================
+
+@pytest.mark.parametrize("endpoint", ["predict-spending", "detect-anomalies"])
+def test_untrained_model_without_data_does_not_queue_job(client, untrained_models, executor, endpoint):
+    data = client.get(f"{AI_URL}/{endpoint}").get_json()["data"]
+
+    assert "Not enough training data" in data["error"]
+    assert "training_job" not in data
+    assert job_rows() == []
+    assert executor.submitted == []
+
+
+def test_untrained_model_with_data_queues_one_job(client, untrained_models, executor):
+    add_expenses(client, months=3, per_month=4)
+
+    first = client.get(f"{AI_URL}/predict-spending").get_json()["data"]["training_job"]
+    second = client.get(f"{AI_URL}/predict-spending").get_json()["data"]["training_job"]
+
+    assert first["status"] == QUEUED
+    assert second["id"] == first["id"]
+    assert job_rows() == [("spending_predictor", QUEUED)]
+    assert len(executor.submitted) == 1
+
+
+def test_recent_failure_is_not_resubmitted(client, untrained_models, executor):
+    add_expenses(client, months=1, per_month=12)
+    with get_connection() as conn:
+        conn.execute("""
+            INSERT INTO training_jobs (id, job_type, status, error, params, owner_pid, finished_at)
+            VALUES ('failed-job', 'anomaly_detector', ?, 'boom', '{}', 1, CURRENT_TIMESTAMP)
+        """, (FAILED,))
+        conn.commit()
+
+    data = client.get(f"{AI_URL}/detect-anomalies").get_json()["data"]
+
+    assert data["training_job"]["id"] == "failed-job"
+    assert "boom" in data["error"]
+    assert executor.submitted == []
+
+    # Setelah jendela retry lewat, job baru boleh dibuat lagi
+    with get_connection() as conn:
+        conn.execute("UPDATE training_jobs SET finished_at = datetime('now', '-1 day')")
+        conn.commit()
+    data = client.get(f"{AI_URL}/detect-anomalies").get_json()["data"]
+    assert data["training_job"]["status"] == QUEUED
+    assert len(executor.submitted) == 1
+
+
+def test_short_descriptions_do_not_count_as_category_training_data(client, executor):
+    # Category training membuang description <= 3 karakter; pre-check harus memakai filter yang sama
+    rows = [make_transaction(description="kopi") for _ in range(9)] + [make_transaction(description="es") for _ in range(5)]
+    assert client.post("/api/v1/transactions/bulk", json={"transactions": rows}).status_code == 201
+
+    response = client.post(f"{AI_URL}/train-category-model")
+
+    assert response.status_code == 400
+    assert job_rows() == []
+    assert executor.submitted == []
+
+
+def test_concurrent_submit_creates_one_active_job(client, executor):
+    manager = get_job_manager()
+    results = []
+    start = threading.Barrier(8)
+
+    def submit():
+        start.wait()
+        results.append(manager.submit("anomaly_detector"))
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(created for _, created in results) == 1
+    assert len({job["id"] for job, _ in results}) == 1
+    assert job_rows() == [("anomaly_detector", QUEUED)]
+
+
+# ==================== CATEGORIZATION ====================
+
+def test_batch_with_non_string_description_returns_400(client):
+    response = client.post(f"{AI_URL}/categorize/batch", json={
+        "transactions": [{"description": "makan siang"}, {"description": 42}]
+    })
+
+    assert response.status_code == 400
+    assert "transactions[1]" in response.get_json()["message"]
+
+
+def test_batch_with_non_numeric_amount_returns_400(client):
+    response = client.post(f"{AI_URL}/categorize/batch", json={
+        "transactions": [{"description": "makan siang", "amount": 50000}, {"description": "bensin", "amount": "abc"}]
+    })
+
+    assert response.status_code == 400
+    assert "transactions[1].amount" in response.get_json()["message"]
+
+
+@pytest.mark.parametrize("k", ["abc", None, 0, 11, 2.5, True])
+def test_batch_with_invalid_k_returns_400(client, k):
+    response = client.post(f"{AI_URL}/categorize/batch", json={
+        "transactions": [{"description": "makan siang"}], "k": k
+    })
+
+    assert response.status_code == 400
+    assert "k must be" in response.get_json()["message"]
+
+
+def test_batch_returns_one_result_per_item(client):
+    response = client.post(f"{AI_URL}/categorize/batch", json={
+        "transactions": [{"description": "makan siang", "amount": None}, {"description": "bensin motor"}], "k": 2
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()["data"]["count"] == 2
+
+
+def test_single_with_non_numeric_amount_returns_400(client):
+    response = client.post(f"{AI_URL}/categorize", json={"description": "makan siang", "amount": "abc"})
+
+    assert response.status_code == 400
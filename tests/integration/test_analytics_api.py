@@ -0,0 +1,91 @@
+import pytest
+
+from src.data.database import get_connection
+from tests.fixtures.transactions import make_transaction, sample_transactions
+
+SUMMARY_URL = "/api/v1/analytics/summary"
+
+
+@pytest.fixture
+def seeded(client):
+    assert client.post("/api/v1/transactions/bulk", json={"transactions": sample_transactions()}).status_code == 201
+
+
+def test_matching_if_none_match_returns_304(client, seeded):
+    first = client.get(SUMMARY_URL)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+
+    cached = client.get(SUMMARY_URL, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+    assert cached.headers["ETag"] == etag
+    assert cached.headers["X-Cache"] == "HIT"
+
+
+def test_other_etag_returns_full_body(client, seeded):
+    first = client.get(SUMMARY_URL)
+
+    response = client.get(SUMMARY_URL, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.get_data() == first.get_data()
+
+
+def test_write_invalidates_etag(client, seeded):
+    etag = client.get(SUMMARY_URL).headers["ETag"]
+    before = client.get(SUMMARY_URL).get_json()["data"]["overall"]["total_expense"]
+
+    assert client.post("/api/v1/transactions/", json=make_transaction(amount=12345)).status_code == 201
+
+    response = client.get(SUMMARY_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["data"]["overall"]["total_expense"] == before + 12345
+
+
+def test_query_string_is_part_of_cache_key(client, seeded):
+    six = client.get("/api/v1/analytics/monthly-trend?months=6")
+    two = client.get("/api/v1/analytics/monthly-trend?months=2", headers={"If-None-Match": six.headers["ETag"]})
+
+    assert two.status_code == 200
+    assert two.headers["ETag"] != six.headers["ETag"]
+
+
+def raw_summary(as_of="9999-12-31", month=None):
+    """Summary langsung dari tabel transactions, sebagai referensi"""
+    with get_connection() as conn:
+        return tuple(conn.execute("""
+            SELECT SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END),
+                   SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END),
+                   COUNT(*), COUNT(DISTINCT category), MIN(date), MAX(date),
+                   SUM(CASE WHEN year_month = :month AND transaction_type = 'income' THEN amount ELSE 0 END),
+                   SUM(CASE WHEN year_month = :month AND transaction_type = 'expense' THEN amount ELSE 0 END)
+            FROM transactions WHERE date <= :as_of
+        """, {"as_of": as_of, "month": month}).fetchone())
+
+
+def summary_tuple(data):
+    overall, current = data["overall"], data["current_month"]
+    return (overall["total_income"], overall["total_expense"], overall["total_transactions"],
+            overall["unique_categories"], overall["first_transaction_date"], overall["last_transaction_date"],
+            current["income"], current["expense"])
+
+
+@pytest.mark.parametrize("params, as_of, month", [
+    ({"month": "2025-02"}, "9999-12-31", "2025-02"),
+    ({"as_of": "2025-03-10"}, "2025-03-10", "2025-03"),
+    ({"as_of": "2025-03-10", "month": "2025-01"}, "2025-03-10", "2025-01"),
+    ({"as_of": "2025-02-28", "month": "2025-03"}, "2025-02-28", "2025-03"),
+])
+def test_summary_period_matches_raw_query(client, seeded, params, as_of, month):
+    data = client.get(SUMMARY_URL, query_string=params).get_json()["data"]
+
+    assert summary_tuple(data) == raw_summary(as_of, month)
+    assert data["current_month"]["month"] == month
+    assert data["overall"]["as_of"] == params.get("as_of")
+
+
+@pytest.mark.parametrize("params", [{"month": "2025-13"}, {"month": "Feb"}, {"as_of": "2025-02-30"}])
+def test_invalid_summary_period_returns_400(client, params):
+    assert client.get(SUMMARY_URL, query_string=params).status_code == 400
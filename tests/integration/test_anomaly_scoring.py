@@ -0,0 +1,106 @@
+import pytest
+
+from src.services import anomaly_scoring
+
+from src.data.database import get_connection
+from src.models.anomaly_detector import AnomalyDetector
+from src.models.registry import ModelHandle, ModelRegistry
+from src.services.model_service import model_handles
+from tests.fixtures.transactions import make_transaction, sample_transactions
+
+URL = "/api/v1/transactions/"
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    from config.config import ANOMALY_CONFIG
+
+    monkeypatch.setitem(ANOMALY_CONFIG, "streaming", True)
+
+
+@pytest.fixture
+def anomaly_handle(tmp_path, monkeypatch, trained_anomaly_detector):
+    registry = ModelRegistry(tmp_path / "models")
+    registry.publish("anomaly_detector", trained_anomaly_detector)
+    handle = ModelHandle("anomaly_detector", AnomalyDetector, registry, check_interval=None)
+    monkeypatch.setitem(model_handles, "anomaly_detector", handle)
+    return handle
+
+
+def stored_scores():
+    with get_connection() as conn:
+        return [tuple(row) for row in conn.execute(
+            "SELECT anomaly_score, anomaly_model_version FROM transactions ORDER BY id"
+        )]
+
+
+def test_insert_does_not_load_model_in_write_transaction(client, streaming, anomaly_handle):
+    assert client.post(URL, json=make_transaction()).status_code == 201
+
+    assert anomaly_handle.swaps == 0
+    assert stored_scores() == [(None, None)]
+
+
+def test_insert_scores_with_loaded_model(client, streaming, anomaly_handle):
+    anomaly_handle.load()
+
+    assert client.post(URL, json=make_transaction()).status_code == 201
+    score, version = stored_scores()[0]
+    assert score is not None
+    assert version == anomaly_handle.version
+
+
+def test_create_app_warms_handle_when_streaming(streaming, anomaly_handle, client):
+    assert anomaly_handle.swaps == 1
+
+    assert client.post(URL, json=make_transaction()).status_code == 201
+    assert stored_scores()[0][1] == anomaly_handle.version
+
+
+def seed_with_outliers(client):
+    rows = sample_transactions() + [
+        make_transaction(date="2025-03-05", amount=9500000, category="Belanja", description="laptop baru"),
+        make_transaction(date="2025-04-11", amount=4200000, category="Makanan", description="katering acara kantor"),
+    ]
+    # Satu chunk: running mean saat scoring sama dengan mean akhir
+    assert client.post(URL + "bulk", json={"transactions": rows}).status_code == 201
+
+
+def expense_scores():
+    with get_connection() as conn:
+        return [tuple(row) for row in conn.execute("""
+            SELECT id, anomaly_score, is_anomaly FROM transactions
+            WHERE transaction_type = 'expense' ORDER BY id
+        """)]
+
+
+def test_streaming_scores_match_rescore_all(streaming, anomaly_handle, client):
+    seed_with_outliers(client)
+    streamed = expense_scores()
+    assert all(score is not None for _, score, _ in streamed)
+
+    detector, version = anomaly_handle.current_with_version()
+    with get_connection() as conn:
+        assert anomaly_scoring.rescore_all(conn, detector, version, chunk_size=7) == len(streamed)
+    rescored = expense_scores()
+
+    assert [row[0] for row in rescored] == [row[0] for row in streamed]
+    assert [row[1] for row in rescored] == pytest.approx([row[1] for row in streamed], abs=1e-12)
+    assert [row[2] for row in rescored] == [row[2] for row in streamed]
+
+
+def test_stored_anomalies_match_batch_detection(streaming, anomaly_handle, client, monkeypatch):
+    from config.config import ANOMALY_CONFIG
+
+    seed_with_outliers(client)
+    stored = client.get("/api/v1/ai/detect-anomalies").get_json()["data"]
+
+    monkeypatch.setitem(ANOMALY_CONFIG, "streaming", False)
+    batch = client.get("/api/v1/ai/detect-anomalies").get_json()["data"]
+
+    assert stored["total_analyzed"] == batch["total_analyzed"]
+    assert stored["anomaly_count"] == batch["anomaly_count"] > 0
+    for mine, theirs in zip(stored["anomalies"], batch["anomalies"]):
+        assert (mine["description"], mine["amount"], mine["reason"]) == \
+            (theirs["description"], theirs["amount"], theirs["reason"])
+        assert mine["anomaly_score"] == pytest.approx(theirs["anomaly_score"], abs=1e-12)
@@ -0,0 +1,52 @@
+import pytest
+
+from tests.fixtures.transactions import make_transaction, sample_transactions
+
+DASHBOARD_URL = "/api/v1/dashboard/"
+
+
+@pytest.fixture
+def seeded(client):
+    assert client.post("/api/v1/transactions/bulk", json={"transactions": sample_transactions()}).status_code == 201
+
+
+def analytics_data(client, path, **params):
+    return client.get(f"/api/v1/analytics/{path}", query_string=params).get_json()["data"]
+
+
+def test_dashboard_matches_analytics_endpoints(client, seeded):
+    params = {"month": "2025-02", "months": 3}
+    data = client.get(DASHBOARD_URL, query_string=params).get_json()["data"]
+
+    assert list(data) == ["summary", "categories", "trend"]
+    assert data["summary"] == analytics_data(client, "summary", month="2025-02")
+    assert data["categories"] == analytics_data(client, "categories")
+    assert data["trend"] == analytics_data(client, "monthly-trend", months=3)
+
+
+@pytest.mark.parametrize("fields, expected", [
+    ("trend", ["trend"]),
+    ("trend, summary", ["summary", "trend"]),
+    ("categories,,categories", ["categories"]),
+])
+def test_fields_selects_datasets(client, seeded, fields, expected):
+    data = client.get(DASHBOARD_URL, query_string={"fields": fields}).get_json()["data"]
+
+    assert list(data) == expected
+
+
+def test_unknown_field_returns_400(client):
+    response = client.get(DASHBOARD_URL, query_string={"fields": "summary,budget"})
+
+    assert response.status_code == 400
+    assert "budget" in response.get_json()["message"]
+
+
+def test_write_invalidates_cached_dashboard(client, seeded):
+    before = client.get(DASHBOARD_URL, query_string={"fields": "summary"})
+    assert client.post("/api/v1/transactions/", json=make_transaction(amount=12345)).status_code == 201
+
+    after = client.get(DASHBOARD_URL, query_string={"fields": "summary"}, headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert (after.get_json()["data"]["summary"]["overall"]["total_expense"]
+            == before.get_json()["data"]["summary"]["overall"]["total_expense"] + 12345)
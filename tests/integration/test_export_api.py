@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+
+import pytest
+
+from src.data.database import get_connection
+from tests.fixtures.transactions import sample_transactions
+
+EXPORT_URL = "/api/v1/transactions/export"
+
+
+@pytest.fixture
+def seeded(client):
+    assert client.post("/api/v1/transactions/bulk", json={"transactions": sample_transactions()}).status_code == 201
+
+
+def expected_rows(where="1=1"):
+    with get_connection() as conn:
+        return [
+            (row[0], row[1], row[2], row[3])
+            for row in conn.execute(f"""
+                SELECT id, amount, transaction_type, category FROM transactions
+                WHERE {where} ORDER BY date DESC, id DESC
+            """)
+        ]
+
+
+def read_export(export_format, body):
+    if export_format == "csv":
+        rows = list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+        return [(int(r["id"]), float(r["amount"]), r["transaction_type"], r["category"] or None) for r in rows]
+    if export_format == "ndjson":
+        rows = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    elif export_format == "parquet":
+        import pyarrow.parquet as pq
+        rows = pq.read_table(io.BytesIO(body)).to_pylist()
+    else:
+        from openpyxl import load_workbook
+        sheet = load_workbook(io.BytesIO(body), read_only=True)["transactions"]
+        values = list(sheet.values)
+        rows = [dict(zip(values[0], row)) for row in values[1:]]
+    return [(r["id"], float(r["amount"]), r["transaction_type"], r["category"]) for r in rows]
+
+
+@pytest.mark.parametrize("export_format", ["csv", "ndjson", "parquet", "xlsx"])
+def test_export_round_trip(client, seeded, export_format):
+    # chunk_size kecil: beberapa chunk / row group harus tetap jadi satu file valid
+    response = client.get(EXPORT_URL, query_string={"format": export_format, "chunk_size": 5})
+
+    assert response.status_code == 200
+    assert "attachment" in response.headers["Content-Disposition"]
+    assert read_export(export_format, response.get_data()) == expected_rows()
+
+
+def test_export_applies_filters(client, seeded):
+    response = client.get(EXPORT_URL, query_string={"format": "ndjson", "type": "income", "min_amount": 50000})
+
+    assert read_export("ndjson", response.get_data()) == expected_rows(
+        "transaction_type = 'income' AND amount >= 50000"
+    )
+
+
+def test_unknown_format_returns_400(client):
+    assert client.get(EXPORT_URL, query_string={"format": "pdf"}).status_code == 400
+
+
+def test_xlsx_over_row_limit_returns_400(client, seeded, monkeypatch):
+    from config.config import EXPORT_CONFIG
+
+    monkeypatch.setitem(EXPORT_CONFIG, "xlsx_max_rows", 10)
+    assert client.get(EXPORT_URL, query_string={"format": "xlsx"}).status_code == 400
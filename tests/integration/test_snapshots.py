@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from src.data import snapshots
+from src.data.database import get_connection
+from src.data.loaders import CATEGORY_TRAINING_COLUMNS, CATEGORY_TRAINING_WHERE, SPENDING_COLUMNS, load_transactions
+from tests.fixtures.transactions import make_transaction, sample_transactions
+
+URL = "/api/v1/transactions/"
+
+
+@pytest.fixture
+def seeded(client):
+    rows = sample_transactions() + [make_transaction(date="2025-04-02", description="es"),
+                                    make_transaction(date="2025-04-03", description=None)]
+    response = client.post(URL + "bulk", json={"transactions": rows})
+    assert response.status_code == 201
+    return response.get_json()["data"]["created_ids"]
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    # Bukan tmp_path langsung: database test juga ada di sana
+    return tmp_path / "snapshot"
+
+
+def export(snapshot_dir):
+    with get_connection() as conn:
+        return snapshots.export_snapshot(conn, snapshot_dir)
+
+
+def test_manifest_matches_month_signatures(client, seeded, snapshot_dir):
+    result = export(snapshot_dir)
+
+    assert result["written"] == ["2025-01", "2025-02", "2025-03", "2025-04"]
+    with get_connection() as conn:
+        signatures = snapshots.month_signatures(conn)
+    assert snapshots.read_manifest(snapshot_dir)["partitions"] == signatures
+    assert export(snapshot_dir)["written"] == []
+
+
+def test_only_changed_months_are_rewritten(client, seeded, snapshot_dir):
+    export(snapshot_dir)
+    untouched = (snapshot_dir / "year_month=2025-01" / snapshots.PARTITION_FILE).stat().st_mtime_ns
+
+    assert client.post(URL, json=make_transaction(date="2025-03-09")).status_code == 201
+    assert client.post(URL, json=make_transaction(date="2025-05-01")).status_code == 201
+    assert client.delete(f"{URL}{seeded[1]}").status_code == 200  # 2025-02
+    result = export(snapshot_dir)
+
+    assert result["written"] == ["2025-02", "2025-03", "2025-05"]
+    assert result["unchanged"] == 2
+    assert (snapshot_dir / "year_month=2025-01" / snapshots.PARTITION_FILE).stat().st_mtime_ns == untouched
+
+
+def test_empty_month_partition_is_removed(client, seeded, snapshot_dir):
+    assert client.post(URL, json=make_transaction(date="2025-06-01")).status_code == 201
+    created = client.get(URL, query_string={"sort": "-date", "limit": 1}).get_json()["data"][0]["id"]
+    export(snapshot_dir)
+
+    assert client.delete(f"{URL}{created}").status_code == 200
+    assert export(snapshot_dir)["removed"] == ["2025-06"]
+    assert not (snapshot_dir / "year_month=2025-06").exists()
+
+
+@pytest.mark.parametrize("columns, where, snapshot_filter", [
+    (SPENDING_COLUMNS, "transaction_type = 'expense'", snapshots.expense_filter),
+    (CATEGORY_TRAINING_COLUMNS, CATEGORY_TRAINING_WHERE, snapshots.category_training_filter),
+])
+def test_snapshot_reads_match_sqlite(client, seeded, snapshot_dir, columns, where, snapshot_filter):
+    export(snapshot_dir)
+
+    with get_connection() as conn:
+        expected = load_transactions(conn, columns, where=where)
+    result = snapshots.read_snapshot(snapshot_dir, columns, filter=snapshot_filter())
+
+    sort = columns[0] if columns[0] == "id" else columns
+    pd.testing.assert_frame_equal(
+        result.sort_values(sort).reset_index(drop=True).astype(str),
+        expected.sort_values(sort).reset_index(drop=True).astype(str)
+    )
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from src.data import spending_features
+from src.data.database import get_connection
+from src.models.spending_predictor import SpendingPredictor
+from tests.fixtures.transactions import make_transaction, sample_transactions
+
+URL = "/api/v1/transactions/"
+COLUMNS = ["year_month"] + spending_features.FEATURE_COLUMNS
+
+
+def full_recompute(conn):
+    """Fitur dari seluruh tabel transactions, seperti sebelum tabel incremental"""
+    raw = pd.read_sql_query("SELECT id, date, amount, transaction_type FROM transactions", conn)
+    return SpendingPredictor().prepare_features(raw)[COLUMNS]
+
+
+def assert_features_match_recompute():
+    with get_connection() as conn:
+        stored = spending_features.load_all(conn)[COLUMNS]
+        expected = full_recompute(conn)
+    pd.testing.assert_frame_equal(stored, expected, check_dtype=False)
+
+
+@pytest.fixture
+def seeded(client):
+    assert client.post(URL + "bulk", json={"transactions": sample_transactions()}).status_code == 201
+
+
+def test_features_follow_inserts_and_deletes(client, seeded):
+    assert_features_match_recompute()
+
+    # Bulan baru di akhir, bulan baru di tengah window, dan bulan yang sudah ada
+    created = []
+    for date, amount in (("2025-06-10", 70000), ("2025-05-02", 15000), ("2025-02-20", 33000)):
+        response = client.post(URL, json=make_transaction(date=date, amount=amount))
+        assert response.status_code == 201
+        created.append(response.get_json()["data"]["id"])
+        assert_features_match_recompute()
+
+    # Hapus bulan yang hanya punya satu expense: bulan setelahnya ikut dihitung ulang
+    for transaction_id in created[1:2] + created[:1]:
+        assert client.delete(f"{URL}{transaction_id}").status_code == 200
+        assert_features_match_recompute()
+
+
+def test_income_does_not_change_features(client, seeded):
+    with get_connection() as conn:
+        before = spending_features.load_all(conn)
+
+    assert client.post(URL, json=make_transaction(type="income", date="2025-07-01")).status_code == 201
+
+    with get_connection() as conn:
+        pd.testing.assert_frame_equal(spending_features.load_all(conn), before)
+
+
+def test_rebuild_matches_incremental(client, seeded):
+    with get_connection() as conn:
+        incremental = spending_features.load_all(conn)
+        spending_features.rebuild(conn)
+        conn.commit()
+        pd.testing.assert_frame_equal(spending_features.load_all(conn), incremental)
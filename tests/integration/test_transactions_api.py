@@ -0,0 +1,285 @@
+import json
+
+import pytest
+
+from src.data.database import get_connection
+from tests.fixtures.transactions import make_transaction, sample_transactions
+
+URL = "/api/v1/transactions/"
+
+
+@pytest.fixture
+def seeded(client):
+    response = client.post(URL + "bulk", json={"transactions": sample_transactions()})
+    assert response.status_code == 201
+    return response.get_json()["data"]["created_ids"]
+
+
+def fetch_all_pages(client, limit, **params):
+    """Ikuti next_cursor sampai habis, return (ids, jumlah halaman)"""
+    ids, pages, cursor = [], 0, None
+    while True:
+        query = {**params, "limit": limit}
+        if cursor:
+            query["cursor"] = cursor
+        body = client.get(URL, query_string=query).get_json()
+        assert body["status"] == "success"
+        ids += [row["id"] for row in body["data"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def expected_ids(order_by, where="1=1"):
+    with get_connection() as conn:
+        return [row[0] for row in conn.execute(f"SELECT id FROM transactions WHERE {where} ORDER BY {order_by}")]
+
+
+# ==================== CURSOR PAGING ====================
+
+@pytest.mark.parametrize("sort, order_by", [
+    (None, "date DESC, id DESC"),
+    ("date", "date ASC, id ASC"),
+    ("-amount", "amount DESC, id DESC"),
+    ("id", "id ASC"),
+])
+def test_cursor_paging_visits_every_row_once(client, seeded, sort, order_by):
+    params = {"sort": sort} if sort else {}
+    ids, pages = fetch_all_pages(client, limit=5, **params)
+
+    assert ids == expected_ids(order_by)
+    assert pages == 5
+
+
+def test_cursor_paging_with_filters(client, seeded):
+    ids, _ = fetch_all_pages(client, limit=3, type="expense", category="Makanan", sort="amount")
+
+    assert ids == expected_ids("amount ASC, id ASC", "transaction_type = 'expense' AND category = 'Makanan'")
+
+
+def test_stream_matches_paged_result(client, seeded):
+    response = client.get(URL, query_string={"stream": "true", "limit": 7})
+    body = json.loads(response.get_data())
+
+    assert [row["id"] for row in body["data"]] == expected_ids("date DESC, id DESC")[:7]
+    assert body["next_cursor"]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJ4Il0"])
+def test_invalid_cursor_returns_400(client, seeded, cursor):
+    response = client.get(URL, query_string={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_cursor_for_other_sort_returns_400(client, seeded):
+    cursor = client.get(URL, query_string={"limit": 2, "sort": "amount"}).get_json()["next_cursor"]
+
+    response = client.get(URL, query_string={"limit": 2, "sort": "date", "cursor": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [0, -2])
+@pytest.mark.parametrize("stream", ["false", "true"])
+def test_non_positive_limit_returns_400(client, seeded, limit, stream):
+    response = client.get(URL, query_string={"limit": limit, "stream": stream})
+
+    assert response.status_code == 400
+
+
+def test_limit_is_capped(client, seeded, monkeypatch):
+    from config.config import PAGINATION_CONFIG
+
+    monkeypatch.setitem(PAGINATION_CONFIG, "max_limit", 4)
+    body = client.get(URL, query_string={"limit": 100}).get_json()
+
+    assert body["count"] == 4
+    assert body["next_cursor"]
+
+
+# ==================== BULK INGEST ====================
+
+def test_bulk_partial_failure_inserts_valid_rows(client):
+    rows = [
+        make_transaction(description="valid 1"),
+        make_transaction(amount=-5, description="negatif"),
+        make_transaction(description="valid 2"),
+        make_transaction(type="transfer", description="tipe salah"),
+        "bukan object",
+        make_transaction(description="valid 3"),
+    ]
+    response = client.post(URL + "bulk?chunk_size=2", json={"transactions": rows})
+    body = response.get_json()
+
+    assert response.status_code == 201
+    assert body["status"] == "partial"
+    data = body["data"]
+    assert (data["received"], data["inserted"], data["failed"]) == (6, 3, 3)
+    assert [error["row"] for error in data["errors"]] == [2, 4, 5]
+    assert data["errors"][0]["errors"][0]["field"] == "amount"
+
+    with get_connection() as conn:
+        descriptions = [row[0] for row in conn.execute("SELECT description FROM transactions ORDER BY id")]
+    assert descriptions == ["valid 1", "valid 2", "valid 3"]
+    assert data["created_ids"] == expected_ids("id")
+
+
+def test_bulk_all_invalid_returns_400(client):
+    response = client.post(URL + "bulk", json={"transactions": [make_transaction(amount=0)]})
+
+    assert response.status_code == 400
+    assert expected_ids("id") == []
+
+
+def test_bulk_ndjson_reports_bad_lines(client):
+    lines = [json.dumps(make_transaction()), "{rusak", json.dumps(make_transaction(description="kedua"))]
+    response = client.post(URL + "bulk", data="\n".join(lines), content_type="application/x-ndjson")
+    data = response.get_json()["data"]
+
+    assert (data["inserted"], data["failed"]) == (2, 1)
+    assert data["errors"][0]["row"] == 2
+
+
+def test_bulk_error_details_are_truncated(client, monkeypatch):
+    from config.config import BULK_INGEST_CONFIG
+
+    monkeypatch.setitem(BULK_INGEST_CONFIG, "max_reported_errors", 2)
+    rows = [make_transaction(amount=-1)] * 5 + [make_transaction()]
+    data = client.post(URL + "bulk", json={"transactions": rows}).get_json()["data"]
+
+    assert data["failed"] == 5
+    assert len(data["errors"]) == 2
+    assert data["errors_truncated"] is True
+
+
+# ==================== ROLLUPS ====================
+
+def rollup_groups(conn):
+    return [tuple(row) for row in conn.execute("""
+        SELECT year_month, transaction_type, category, txn_count, total_amount, min_amount, max_amount
+        FROM transaction_rollups ORDER BY 1, 2, 3
+    """)]
+
+
+def raw_groups(conn):
+    return [tuple(row) for row in conn.execute("""
+        SELECT year_month, transaction_type, COALESCE(category, ''),
+               COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+        FROM transactions GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+    """)]
+
+
+def assert_rollups_consistent():
+    with get_connection() as conn:
+        assert rollup_groups(conn) == raw_groups(conn)
+        stats = conn.execute("SELECT SUM(txn_count), SUM(total_amount) FROM category_expense_stats").fetchone()
+        expense = conn.execute(
+            "SELECT COUNT(*), SUM(amount) FROM transactions WHERE transaction_type = 'expense'"
+        ).fetchone()
+        assert tuple(stats) == tuple(expense) or (expense[0] == 0 and stats[0] is None)
+
+
+def test_rollups_follow_inserts_and_deletes(client, seeded):
+    assert_rollups_consistent()
+
+    created = client.post(URL, json=make_transaction(date="2025-02-03", amount=55500, category="Belanja"))
+    assert created.status_code == 201
+    assert_rollups_consistent()
+
+    # Hapus min, max dan satu-satunya row di group, lalu sisanya
+    with get_connection() as conn:
+        extremes = [row[0] for row in conn.execute("""
+            SELECT id FROM transactions WHERE amount IN (SELECT MIN(amount) FROM transactions)
+            UNION SELECT id FROM transactions WHERE amount IN (SELECT MAX(amount) FROM transactions)
+        """)]
+    for transaction_id in extremes + [created.get_json()["data"]["id"]]:
+        assert client.delete(f"{URL}{transaction_id}").status_code == 200
+        assert_rollups_consistent()
+
+    for transaction_id in expected_ids("id"):
+        client.delete(f"{URL}{transaction_id}")
+    assert_rollups_consistent()
+    with get_connection() as conn:
+        assert rollup_groups(conn) == []
+
+
+def test_summary_matches_raw_totals(client, seeded):
+    client.delete(f"{URL}{seeded[3]}")
+    data = client.get("/api/v1/analytics/summary").get_json()["data"]
+
+    with get_connection() as conn:
+        income, expense = conn.execute("""
+            SELECT SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END),
+                   SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END)
+            FROM transactions
+        """).fetchone()
+    assert data["overall"]["total_income"] == income
+    assert data["overall"]["total_expense"] == expense
+
+
+# ==================== SEARCH, AMOUNT RANGE, TOTALS ====================
+
+@pytest.fixture
+def described(client):
+    rows = [
+        make_transaction(description="Kopi susu di Café Kenangan", amount=25000),
+        make_transaction(description="bensin motor", amount=30000, category="Transportasi"),
+        make_transaction(description="kopi bubuk untuk kantor", amount=80000),
+        make_transaction(description="Gaji bulanan", amount=5000000, type="income", category="Gaji"),
+        make_transaction(description='promo "AND" OR NOT*', amount=15000),
+    ]
+    return client.post(URL + "bulk", json={"transactions": rows}).get_json()["data"]["created_ids"]
+
+
+def search_ids(client, **params):
+    ids, _ = fetch_all_pages(client, limit=2, sort="id", **params)
+    return ids
+
+
+@pytest.mark.parametrize("text, positions", [
+    ("kopi", [0, 2]),
+    ("KOPI susu", [0]),
+    ("kop", [0, 2]),
+    ("cafe", [0]),
+    ("bulan", [3]),
+    ('"AND" OR', [4]),
+    ("teh", []),
+])
+def test_search_matches_description_words(client, described, text, positions):
+    assert search_ids(client, search=text) == [described[i] for i in positions]
+
+
+def test_search_follows_deletes(client, described):
+    assert client.delete(f"{URL}{described[0]}").status_code == 200
+
+    assert search_ids(client, search="kopi") == [described[2]]
+
+
+def test_amount_range_and_filters_combine(client, described):
+    assert search_ids(client, min_amount=25000, max_amount=80000) == described[:3]
+    assert search_ids(client, min_amount=25000, max_amount=80000, search="kopi", category="Makanan") == [
+        described[0], described[2]
+    ]
+
+
+@pytest.mark.parametrize("params", [{"min_amount": "abc"}, {"max_amount": "1e"}, {"sort": "category"}])
+def test_invalid_filter_or_sort_returns_400(client, params):
+    assert client.get(URL, query_string=params).status_code == 400
+
+
+def test_totals_cover_all_pages(client, seeded):
+    first = client.get(URL, query_string={"limit": 3, "type": "expense", "include_totals": "true"}).get_json()
+    second = client.get(URL, query_string={
+        "limit": 3, "type": "expense", "include_totals": "true", "cursor": first["next_cursor"]
+    }).get_json()
+
+    with get_connection() as conn:
+        count, total = conn.execute(
+            "SELECT COUNT(*), SUM(amount) FROM transactions WHERE transaction_type = 'expense'"
+        ).fetchone()
+    assert first["totals"] == second["totals"]
+    assert first["totals"]["count"] == count
+    assert first["totals"]["total_expense"] == total
+    assert first["totals"]["total_income"] == 0
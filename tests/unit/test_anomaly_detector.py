@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.anomaly_detector import AnomalyDetector
+
+
+def iterrows_features(detector, transactions_df):
+    """Implementasi per-row sebelum vectorization, sebagai referensi"""
+    expense_data = transactions_df[transactions_df['transaction_type'] == 'expense'].copy()
+    features = []
+    for _, transaction in expense_data.iterrows():
+        features.append([
+            transaction['amount'],
+            len(str(transaction['description'])),
+            detector._get_category_encoding(transaction['category']),
+            transaction['amount'] / expense_data['amount'].mean() if expense_data['amount'].mean() > 0 else 0
+        ])
+    return np.array(features)
+
+
+@pytest.fixture
+def transactions():
+    return pd.DataFrame({
+        "amount": [25000.0, 1500000.0, 32000.0, 7000000.0, 12500.0, 80000.0, 45000.0],
+        "transaction_type": ["expense", "income", "expense", "expense", "expense", "expense", "expense"],
+        "category": ["Makanan", "Gaji", None, "Belanja", "Kategori Baru", "Hiburan", "Kesehatan"],
+        "description": ["makan siang", "gaji bulanan", None, "laptop", "x", "bioskop", np.nan],
+    })
+
+
+@pytest.mark.parametrize("category_dtype", ["object", "category"])
+def test_vectorized_features_match_iterrows(transactions, category_dtype):
+    detector = AnomalyDetector()
+    expected = iterrows_features(detector, transactions)
+
+    features, expense_data = detector._prepare_features(transactions.astype({"category": category_dtype}))
+
+    np.testing.assert_array_equal(features, expected)
+    assert list(expense_data.index) == [0, 2, 3, 4, 5, 6]
+
+
+def test_zero_mean_gives_zero_ratio():
+    detector = AnomalyDetector()
+    transactions = pd.DataFrame({
+        "amount": [0.0, 0.0], "transaction_type": ["expense", "expense"],
+        "category": ["Makanan", None], "description": ["a", "b"],
+    })
+
+    features, _ = detector._prepare_features(transactions)
+    np.testing.assert_array_equal(features, iterrows_features(detector, transactions))
+
+
+def test_no_expenses_returns_empty(transactions):
+    features, expense_data = AnomalyDetector()._prepare_features(transactions[transactions["transaction_type"] == "income"])
+
+    assert len(features) == 0
+    assert expense_data.empty
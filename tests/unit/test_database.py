@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from src.data.database import ConnectionPool, PoolTimeoutError
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", pool_size=2, timeout=0.2)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.commit()
+    yield pool
+    pool.close_all()
+
+
+def count_items(pool):
+    with pool.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+
+def test_idle_connection_is_reused(pool):
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert pool.stats()["connections_created"] == 1
+    assert pool.stats()["in_use"] == 0
+
+
+def test_nested_usage_shares_thread_connection(pool):
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+        assert pool.stats()["in_use"] == 1
+
+    assert pool.stats()["reused_in_thread"] == 1
+
+
+def test_uncommitted_transaction_rolled_back_on_release(pool):
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('lupa commit')")
+        assert conn.in_transaction
+
+    assert count_items(pool) == 0
+    assert pool.stats()["leaks"] == 1
+
+
+def test_exception_rolls_back_and_releases(pool):
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('gagal')")
+            raise RuntimeError("handler error")
+
+    assert count_items(pool) == 0
+    assert pool.stats()["in_use"] == 0
+
+
+def test_committed_changes_survive_release(pool):
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('ok')")
+        conn.commit()
+
+    assert count_items(pool) == 1
+
+
+def test_timeout_when_pool_exhausted(tmp_path):
+    pool = ConnectionPool(tmp_path / "small.db", pool_size=1, timeout=0.05)
+    acquired, done = threading.Event(), threading.Event()
+
+    def hold():
+        with pool.connection():
+            acquired.set()
+            done.wait(5)
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    try:
+        assert acquired.wait(5)
+        with pytest.raises(PoolTimeoutError):
+            with pool.connection():
+                pass
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        done.set()
+        worker.join()
+        pool.close_all()
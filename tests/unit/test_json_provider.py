@@ -0,0 +1,85 @@
+import json
+import sqlite3
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from api.utils.json_provider import FastJSONProvider, fetch_records, make_dumps
+
+NATIVE_PAYLOAD = {
+    "status": "success",
+    "data": {
+        "total_income": 1500000.5,
+        "count": 42,
+        "ratio": 0.1 + 0.2,
+        "big": 123456789012,
+        "empty": None,
+        "flags": [True, False],
+        "category": "Makanan & Minuman",
+        "unicode": "kopi ☕ Rp 25.000 — é",
+        "nested": [{"a": 1}, {"b": [1.5, -2, None]}],
+    },
+}
+
+ENCODERS = ["orjson", "json"]
+
+
+def jsonify_body(provider_class, payload, **provider_kwargs):
+    app = Flask(__name__)
+    app.json = provider_class(app, **provider_kwargs)
+    with app.app_context():
+        response = jsonify(payload)
+    return response.mimetype, json.loads(response.get_data())
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_native_payload_matches_stdlib_jsonify(encoder):
+    expected = jsonify_body(DefaultJSONProvider, NATIVE_PAYLOAD)
+
+    assert jsonify_body(FastJSONProvider, NATIVE_PAYLOAD, encoder=encoder) == expected
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_numpy_and_pandas_values_serialize_as_native(encoder):
+    payload = {
+        "int": np.int64(7), "float": np.float64(2.5), "bool": np.bool_(True),
+        "array": np.array([1, 2, 3]), "series": pd.Series([1.5, 2.5]),
+        "frame": pd.DataFrame({"month": ["2025-01"], "total": [np.float64(10.0)]}),
+        "date": date(2025, 1, 31), "datetime": datetime(2025, 1, 31, 8, 30), "nat": pd.NaT,
+    }
+    native = {
+        "int": 7, "float": 2.5, "bool": True, "array": [1, 2, 3], "series": [1.5, 2.5],
+        "frame": [{"month": "2025-01", "total": 10.0}],
+        "date": "2025-01-31", "datetime": "2025-01-31T08:30:00", "nat": None,
+    }
+
+    _, body = jsonify_body(FastJSONProvider, payload, encoder=encoder)
+    assert body == jsonify_body(DefaultJSONProvider, native)[1]
+
+
+def test_encoders_produce_same_document():
+    orjson_dumps, json_dumps = make_dumps("orjson"), make_dumps("json")
+
+    assert json.loads(orjson_dumps(NATIVE_PAYLOAD)) == json.loads(json_dumps(NATIVE_PAYLOAD))
+
+
+def test_unknown_encoder_raises():
+    with pytest.raises(ValueError):
+        make_dumps("ujson")
+
+
+def test_fetch_records_matches_read_sql():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (month TEXT, income REAL, expense REAL, n INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?, ?)", [("2025-01", 10.5, 3.0, 2), ("2025-02", None, 7.25, 1)])
+
+    query = "SELECT month, income, expense, n FROM t ORDER BY month"
+    records = fetch_records(conn, query)
+    expected = pd.read_sql_query(query, conn).astype(object).where(lambda df: df.notna(), None).to_dict("records")
+
+    assert records == expected
+    assert isinstance(records[0]["n"], int)
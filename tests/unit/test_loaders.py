@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from src.data.database import get_connection
+from src.data.loaders import ANOMALY_COLUMNS, SPENDING_COLUMNS, load_transactions
+
+ROWS = [
+    ("2025-01-03", 123456789.5, "expense", "Belanja", "mobil bekas"),
+    ("2025-01-04", 25000.0, "expense", None, None),
+    ("2025-02-01", 5000000.0, "income", "Gaji", "gaji"),
+    ("2025-02-07", 17500.25, "expense", "Makanan", "kopi"),
+]
+
+
+@pytest.fixture
+def conn(migrated_db):
+    with get_connection() as conn:
+        conn.executemany("""
+            INSERT INTO transactions (date, amount, transaction_type, category, description)
+            VALUES (?, ?, ?, ?, ?)
+        """, ROWS)
+        conn.commit()
+        yield conn
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_columns_and_dtypes(conn, engine):
+    # Tanpa ORDER BY: urutkan per date (unik) sebelum dibandingkan
+    df = load_transactions(conn, ANOMALY_COLUMNS, engine=engine, chunk_size=3).sort_values("date")
+
+    assert list(df.columns) == ANOMALY_COLUMNS
+    assert df["date"].dtype == "datetime64[ns]"
+    assert df["amount"].dtype == "float64"
+    assert isinstance(df["transaction_type"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+    # float64: amount besar tetap exact
+    assert df["amount"].tolist() == [row[1] for row in ROWS]
+    assert df["category"].isna().tolist() == [False, True, False, False]
+    assert df["description"].isna().tolist() == [False, True, False, False]
+
+
+def test_engines_return_same_frame(conn):
+    pandas_df = load_transactions(conn, ANOMALY_COLUMNS, engine="pandas")
+    arrow_df = load_transactions(conn, ANOMALY_COLUMNS, engine="arrow", chunk_size=2)
+
+    pd.testing.assert_frame_equal(
+        arrow_df.astype({"transaction_type": str, "category": object}),
+        pandas_df.astype({"transaction_type": str, "category": object}),
+        check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_where_and_dtype_override(conn, engine):
+    df = load_transactions(
+        conn, SPENDING_COLUMNS, where="transaction_type = ? AND amount < ?", params=("expense", 100000),
+        dtypes={"amount": "float32"}, engine=engine
+    )
+
+    assert df["amount"].dtype == "float32"
+    assert sorted(df["id"]) == [2, 4]
+
+
+def test_unknown_column_and_engine_raise(conn):
+    with pytest.raises(ValueError, match="Unknown transaction columns"):
+        load_transactions(conn, ["amount", "not_a_column"])
+    with pytest.raises(ValueError, match="Unknown engine"):
+        load_transactions(conn, ["amount"], engine="polars")
@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+from src.data.migrations import LATEST_VERSION, current_version, downgrade, upgrade
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "schema.db")
+    yield conn
+    conn.close()
+
+
+def schema(conn):
+    """Semua object selain schema_version, sebagai {(type, name): sql}"""
+    rows = conn.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE name NOT LIKE 'sqlite_%' AND name != 'schema_version'
+    """).fetchall()
+    return {(row[0], row[1]): row[2] for row in rows}
+
+
+def test_upgrade_creates_latest_schema(conn):
+    applied = upgrade(conn)
+
+    assert applied == list(range(1, LATEST_VERSION + 1))
+    assert current_version(conn) == LATEST_VERSION
+    objects = schema(conn)
+    for name in ("transactions", "transaction_rollups", "data_version", "training_jobs", "transactions_fts"):
+        assert ("table", name) in objects
+    assert ("index", "idx_transactions_amount") in objects
+
+
+def test_upgrade_is_idempotent(conn):
+    upgrade(conn)
+
+    assert upgrade(conn) == []
+    assert current_version(conn) == LATEST_VERSION
+
+
+def test_downgrade_to_zero_and_upgrade_again(conn):
+    upgrade(conn)
+    latest_schema = schema(conn)
+
+    reverted = downgrade(conn, 0)
+    assert reverted == list(range(LATEST_VERSION, 0, -1))
+    assert current_version(conn) == 0
+    assert schema(conn) == {}
+
+    upgrade(conn)
+    assert current_version(conn) == LATEST_VERSION
+    assert schema(conn) == latest_schema
+
+
+def test_partial_upgrade_then_rest(conn):
+    assert upgrade(conn, target=2) == [1, 2]
+    assert current_version(conn) == 2
+
+    assert upgrade(conn) == list(range(3, LATEST_VERSION + 1))
+    conn.execute("INSERT INTO transactions (date, amount, transaction_type) VALUES ('2025-03-01', 1, 'expense')")
+    assert conn.execute("SELECT year_month FROM transactions").fetchone()[0] == "2025-03"
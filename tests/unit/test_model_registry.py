@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from src.models.registry import LEGACY_VERSION, ModelHandle, ModelNotAvailableError, ModelRegistry
+from src.models.spending_predictor import SpendingPredictor
+
+NAME = "spending_predictor"
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(tmp_path / "models", keep_versions=5)
+
+
+def test_publish_activates_new_version(registry, trained_spending_predictor):
+    metadata = registry.publish(NAME, trained_spending_predictor, training_rows=4, accuracy=0.7)
+
+    assert registry.current_version(NAME) == metadata["version"]
+    assert metadata["previous_version"] is None
+    assert metadata["training_rows"] == 4
+    assert [meta["version"] for meta in registry.list_versions(NAME)] == [metadata["version"]]
+    # Tidak ada temp dir yang tertinggal
+    assert not any(path.name.startswith(".tmp-") for path in (registry.root_dir / NAME / "versions").iterdir())
+
+
+def test_publish_without_activate_keeps_current(registry, trained_spending_predictor):
+    first = registry.publish(NAME, trained_spending_predictor)
+    second = registry.publish(NAME, trained_spending_predictor, activate=False)
+
+    assert registry.current_version(NAME) == first["version"]
+    assert len(registry.list_versions(NAME)) == 2
+    assert second["previous_version"] == first["version"]
+
+
+def test_rollback_restores_previous_version(registry, trained_spending_predictor):
+    first = registry.publish(NAME, trained_spending_predictor)
+    second = registry.publish(NAME, trained_spending_predictor)
+    assert second["previous_version"] == first["version"]
+
+    assert registry.rollback(NAME) == first["version"]
+    assert registry.current_version(NAME) == first["version"]
+
+
+def test_rollback_without_previous_version_raises(registry, trained_spending_predictor):
+    with pytest.raises(ModelNotAvailableError):
+        registry.rollback(NAME)
+
+    registry.publish(NAME, trained_spending_predictor)
+    with pytest.raises(ModelNotAvailableError):
+        registry.rollback(NAME)
+
+
+def test_activate_unknown_version_raises(registry):
+    with pytest.raises(ModelNotAvailableError):
+        registry.activate(NAME, "does-not-exist")
+    with pytest.raises(ModelNotAvailableError):
+        registry.activate(NAME, LEGACY_VERSION)
+
+
+def test_prune_keeps_active_and_previous(tmp_path, trained_spending_predictor):
+    registry = ModelRegistry(tmp_path / "models", keep_versions=1)
+    published = [registry.publish(NAME, trained_spending_predictor)["version"] for _ in range(3)]
+
+    remaining = {meta["version"] for meta in registry.list_versions(NAME)}
+    assert remaining == set(published[-2:])
+
+
+def test_handle_swaps_on_load_and_rollback(registry, trained_spending_predictor):
+    first = registry.publish(NAME, trained_spending_predictor)
+    handle = ModelHandle(NAME, SpendingPredictor, registry, check_interval=None)
+
+    assert handle.current().is_trained
+    assert handle.version == first["version"]
+
+    second = registry.publish(NAME, trained_spending_predictor)
+    assert handle.load() == second["version"]
+    old_model = handle.current()
+
+    assert handle.rollback() == first["version"]
+    assert handle.version == first["version"]
+    assert handle.current() is not old_model
+    assert handle.swaps == 3
+
+
+class SlowSpendingPredictor(SpendingPredictor):
+    def load_model(self, *args, **kwargs):
+        time.sleep(0.3)
+        return super().load_model(*args, **kwargs)
+
+
+def test_concurrent_first_access_waits_for_lazy_load(registry, trained_spending_predictor):
+    registry.publish(NAME, trained_spending_predictor)
+    handle = ModelHandle(NAME, SlowSpendingPredictor, registry, check_interval=None)
+    start = threading.Barrier(4)
+    models = []
+
+    def first_access():
+        start.wait()
+        models.append(handle.current())
+
+    threads = [threading.Thread(target=first_access) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [model.is_trained for model in models] == [True] * 4
+    assert handle.swaps == 1
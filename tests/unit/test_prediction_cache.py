@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from src.models import prediction_cache
+from src.models.prediction_cache import PredictionCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" sekarang paling lama tidak dipakai
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_size=10, ttl=5)
+    cache.set("a", 1)
+
+    clock[0] += 4
+    assert cache.get("a") == 1
+    clock[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_zero_size_disables_cache():
+    cache = PredictionCache(max_size=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_cached_predictions_match_model(trained_category_predictor):
+    model = trained_category_predictor
+    descriptions = ["makan siang", "bensin motor", "Makan   siang!!", "sepatu baru"]
+
+    first = model.predict_topk(descriptions, k=3)
+    stats = model.prediction_cache.stats()
+    # "Makan   siang!!" dinormalisasi sama dengan "makan siang": hanya 3 row lewat model
+    assert (stats["hits"], stats["size"]) == (0, 3)
+
+    second = model.predict_topk(descriptions, k=3)
+    assert second == first
+    assert model.prediction_cache.stats()["hits"] == 4
+
+    expected = model.model.predict_proba(model.prepare_features(model.normalizer.normalize_batch(descriptions)))
+    np.testing.assert_allclose(
+        [result["confidence"] for result in first], expected.max(axis=1)
+    )
+
+
+def test_retrain_and_load_invalidate_cache(trained_category_predictor, tmp_path):
+    model = trained_category_predictor
+    model.predict_topk(["makan siang"])
+    version = model.model_version
+
+    model.save_model(tmp_path)
+    assert model.model_version == version + 1
+    assert model.prediction_cache.stats()["size"] == 0
+
+    model.predict_topk(["makan siang"])
+    assert model.load_model(tmp_path)
+    assert model.model_version == version + 2
+    assert model.prediction_cache.stats()["size"] == 0
@@ -0,0 +1,70 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.text_normalizer import TextNormalizer, default_normalizer, light_stem
+
+
+def legacy_preprocess_text(text):
+    """CategoryPredictor.preprocess_text sebelum TextNormalizer, sebagai referensi"""
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text.lower())
+    indonesian_stopwords = {'di', 'ke', 'dan', 'atau', 'yang', 'untuk', 'pada', 'dengan', 'ini', 'itu'}
+    words = [word for word in text.split() if word not in indonesian_stopwords and len(word) > 2]
+    return ' '.join(words)
+
+
+DESCRIPTIONS = [
+    "Makan siang di Warteg",
+    "BENSIN motor 2x, tol & parkir!!",
+    "belanja untuk ini itu dan yang lain",
+    "Café latte ☕ 25rb",
+    "  spasi   berlebih\tdan\nbaris ",
+    "ab cd efg",
+    "",
+    "makan siang di warteg",
+    "Makan siang di Warteg",
+]
+
+
+def test_normalize_matches_legacy_preprocess():
+    for text in DESCRIPTIONS + [None, 42, np.nan]:
+        assert default_normalizer.normalize(text) == legacy_preprocess_text(text)
+
+
+def test_normalize_batch_matches_legacy_for_list_and_series():
+    texts = DESCRIPTIONS + [None, np.nan]
+    expected = [legacy_preprocess_text(text) for text in texts]
+
+    assert default_normalizer.normalize_batch(texts) == expected
+
+    series = pd.Series(texts, index=range(100, 100 + len(texts)))
+    result = default_normalizer.normalize_batch(series)
+    assert result.tolist() == expected
+    assert list(result.index) == list(series.index)
+
+
+def test_normalize_batch_empty_input():
+    assert default_normalizer.normalize_batch([]) == []
+    assert default_normalizer.normalize_batch(pd.Series([], dtype=object)).empty
+
+
+@pytest.mark.parametrize("word, stem", [
+    ("makanan", "makan"),
+    ("bukunya", "buku"),
+    ("membeli", "beli"),
+    ("diantarkan", "antar"),
+    ("kopi", "kopi"),
+])
+def test_light_stem(word, stem):
+    assert light_stem(word) == stem
+
+
+def test_stemming_and_token_filters_are_opt_in():
+    normalizer = TextNormalizer(stem=True, token_filters=[lambda word: None if word == "beli" else word])
+
+    assert normalizer.normalize("Membeli makanan dan minuman") == "makan minum"
+    assert default_normalizer.normalize("Membeli makanan") == "membeli makanan"
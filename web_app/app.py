@@ -9,8 +9,9 @@ import sys
 # Add parent directory to path untuk import utils
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config.config import APP_CONFIG
+from config.config import APP_CONFIG, CATEGORIES
 from web_app.utils.api_client import api_client
+from web_app.utils import cached_api
 
 # ===============================================
 # PAGE CONFIGURATION
@@ -22,6 +23,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ===============================================
+# TRANSACTION LIST OPTIONS
+# ===============================================
+TYPE_LABELS = {"income": "💰 Pemasukan", "expense": "💸 Pengeluaran"}
+SORT_OPTIONS = {
+    "Terbaru": "-date",
+    "Terlama": "date",
+    "Jumlah terbesar": "-amount",
+    "Jumlah terkecil": "amount"
+}
+PAGE_SIZE = 50
+
 # ===============================================
 # DATABASE FUNCTIONS
 # ===============================================
@@ -39,7 +52,7 @@ def render_sidebar():
         st.markdown("---")
         
         # API Status Indicator
-        if api_client.health_check():
+        if cached_api.health_check():
             st.success("✅ API Connected")
         else:
             st.error("❌ API Disconnected")
@@ -57,7 +70,7 @@ def render_sidebar():
         
         # Show quick stats from API
         try:
-            summary_data = api_client.get_financial_summary()
+            summary_data = (cached_api.get_dashboard() or {}).get("summary")
             if summary_data:
                 overall = summary_data.get("overall", {})
                 balance = overall.get("balance", 0)
@@ -81,16 +94,17 @@ def render_dashboard():
     st.header("📊 Financial Dashboard")
     
     # Check API connection
-    if not api_client.health_check():
+    if not cached_api.health_check():
         st.error("🚨 Cannot connect to API server. Please make sure the Flask API is running on port 5000.")
         st.info("💡 Run this command in another terminal: `python api/app.py`")
         return
     
     try:
-        # Get data from API
-        summary_data = api_client.get_financial_summary()
-        category_data = api_client.get_category_breakdown()
-        trend_data = api_client.get_monthly_trend(months=6)
+        # Get data from API (satu request /dashboard, cache entry sama dengan sidebar)
+        dashboard_data = cached_api.get_dashboard() or {}
+        summary_data = dashboard_data.get("summary")
+        category_data = dashboard_data.get("categories")
+        trend_data = dashboard_data.get("trend")
         
         if not summary_data:
             st.warning("📝 Belum ada data transaksi. Silakan input transaksi terlebih dahulu.")
@@ -221,7 +235,7 @@ def render_transaction_form():
     st.header("💳 Input Transaksi Baru")
     
     # Check API connection
-    if not api_client.health_check():
+    if not cached_api.health_check():
         st.error("🚨 Cannot connect to API server. Please start the Flask API first.")
         return
     
@@ -253,7 +267,7 @@ def render_transaction_form():
     # AI Prediction Button - DI LUAR FORM
     if ai_description and st.button("🎯 Dapatkan Kategori AI", type="primary", key="ai_predict_btn"):
         with st.spinner("🤖 Menganalisis..."):
-            ai_result = api_client.ai_categorize(ai_description, ai_amount)
+            ai_result = cached_api.ai_categorize(ai_description, ai_amount)
             if ai_result:
                 predicted_category = ai_result.get("predicted_category")
                 confidence = ai_result.get("confidence", 0)
@@ -348,7 +362,7 @@ def render_transaction_form():
             
             # Save via API
             try:
-                result = api_client.create_transaction(transaction_data)
+                result = cached_api.create_transaction(transaction_data)
                 if result:
                     st.success("✅ Transaksi berhasil disimpan!")
                     
@@ -411,53 +425,106 @@ def render_transaction_list():
     st.header("📋 Data Transaksi")
     
     # Check API connection
-    if not api_client.health_check():
+    if not cached_api.health_check():
         st.error("🚨 Cannot connect to API server. Please start the Flask API first.")
         return
     
+    # ==================== FILTERS ====================
+    col_filter1, col_filter2, col_filter3 = st.columns(3)
+    
+    with col_filter1:
+        search = st.text_input("🔍 Cari deskripsi", placeholder="mis. makan siang")
+        transaction_type = st.selectbox(
+            "Tipe", ["", "expense", "income"],
+            format_func=lambda x: TYPE_LABELS.get(x, "Semua")
+        )
+    
+    with col_filter2:
+        all_categories = sorted(set(CATEGORIES['income'] + CATEGORIES['expense']))
+        category = st.selectbox("Kategori", [""] + all_categories, format_func=lambda x: x or "Semua")
+        sort_label = st.selectbox("Urutkan", list(SORT_OPTIONS))
+    
+    with col_filter3:
+        min_amount = st.number_input("Jumlah minimum (Rp)", min_value=0, value=0, step=10000)
+        max_amount = st.number_input("Jumlah maksimum (Rp, 0 = tanpa batas)", min_value=0, value=0, step=10000)
+    
+    filters = {
+        key: value for key, value in {
+            "search": search.strip(),
+            "type": transaction_type,
+            "category": category,
+            "min_amount": min_amount,
+            "max_amount": max_amount
+        }.items() if value
+    }
+    params = {**filters, "sort": SORT_OPTIONS[sort_label], "limit": PAGE_SIZE}
+    
+    # Cursor stack (halaman yang sudah dibuka); kembali ke halaman 1 kalau filter/sort berubah
+    signature = sorted(params.items())
+    if st.session_state.get("transaction_list_params") != signature:
+        st.session_state.transaction_list_params = signature
+        st.session_state.transaction_list_cursors = [None]
+    cursors = st.session_state.transaction_list_cursors
+    
     try:
-        # Get transactions from API
-        transactions = api_client.get_transactions()
+        # Halaman ini saja dari API; totals dihitung server atas semua hasil filter
+        page_params = {**params, "cursor": cursors[-1]} if cursors[-1] else params
+        page = cached_api.get_transaction_page(page_params)
+        totals = cached_api.get_transaction_totals(filters)
         
-        if not transactions:
-            st.warning("Belum ada data transaksi")
+        if not page or not page.get("data"):
+            st.warning("Belum ada data transaksi" if not filters else "Tidak ada transaksi yang cocok dengan filter")
             return
         
-        df = pd.DataFrame(transactions)
-        
         # Show summary
-        total_income = df[df['transaction_type'] == 'income']['amount'].sum()
-        total_expense = df[df['transaction_type'] == 'expense']['amount'].sum()
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.info(f"Total Pemasukan: **Rp {total_income:,.0f}**")
-        with col2:
-            st.info(f"Total Pengeluaran: **Rp {total_expense:,.0f}**")
+        col1, col2, col3 = st.columns(3)
+        if totals:
+            with col1:
+                st.info(f"Total Pemasukan: **Rp {totals['total_income']:,.0f}**")
+            with col2:
+                st.info(f"Total Pengeluaran: **Rp {totals['total_expense']:,.0f}**")
+            with col3:
+                st.info(f"Balance: **Rp {totals['balance']:,.0f}**")
         
         # Show data
-        st.subheader(f"Data Transaksi ({len(df)} records)")
+        total_count = totals['count'] if totals else page['count']
+        first_row = (len(cursors) - 1) * PAGE_SIZE + 1
+        st.subheader(f"Data Transaksi ({first_row}-{first_row + page['count'] - 1} dari {total_count} records)")
         
-        # Format the dataframe for display
-        display_df = df.copy()
-        display_df['amount'] = display_df['amount'].apply(lambda x: f"Rp {x:,.0f}")
-        display_df['transaction_type'] = display_df['transaction_type'].apply(
-            lambda x: "💰 Pemasukan" if x == "income" else "💸 Pengeluaran"
-        )
+        df = pd.DataFrame(page["data"])
+        df['transaction_type'] = df['transaction_type'].map(TYPE_LABELS)
         
         st.dataframe(
-            display_df[['date', 'amount', 'transaction_type', 'category', 'description']],
-            use_container_width=True
+            df[['date', 'amount', 'transaction_type', 'category', 'description']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                # Format angka di browser, bukan string per row di Python
+                "amount": st.column_config.NumberColumn("Jumlah (Rp)", format="localized")
+            }
         )
         
-        # Export option
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Export ke CSV",
-            data=csv,
-            file_name=f"transactions_{date.today()}.csv",
-            mime="text/csv"
-        )
+        # Pagination: halaman berikutnya baru di-load saat diminta
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("⬅️ Sebelumnya", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+        with col_page:
+            st.caption(f"Halaman {len(cursors)}")
+        with col_next:
+            if st.button("Berikutnya ➡️", disabled=not page.get("next_cursor")):
+                cursors.append(page["next_cursor"])
+                st.rerun()
+        
+        # Export option: semua transaksi yang cocok dengan filter, di-stream dari API
+        export_columns = st.columns(4)
+        for column, (export_format, label) in zip(export_columns, [
+            ("csv", "📥 Export CSV"), ("xlsx", "📥 Export Excel"),
+            ("parquet", "📥 Export Parquet"), ("ndjson", "📥 Export NDJSON")
+        ]):
+            with column:
+                st.link_button(label, api_client.export_url(export_format, filters))
         
     except Exception as e:
         st.error(f"Error loading transactions: {str(e)}")
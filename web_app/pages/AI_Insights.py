@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
 from web_app.utils.api_client import api_client
+from web_app.utils import cached_api
 
 def main():
     st.set_page_config(page_title="AI Insights", page_icon="🤖", layout="wide")
@@ -13,13 +14,12 @@ def main():
     st.markdown("Smart analytics and predictions powered by Machine Learning")
     
     # Check API connection
-    if not api_client.health_check():
+    if not cached_api.health_check():
         st.error("🚨 Cannot connect to API server.")
         return
     
     # Check if AI endpoints are available
-    ai_test = api_client._make_request("GET", "/ai/test")
-    if not ai_test:
+    if not cached_api.ai_available():
         st.error("🚨 AI endpoints are not available. Please check API server.")
         st.info("💡 Make sure the AI routes are properly registered in Flask")
         return
@@ -49,7 +49,7 @@ def render_spending_predictions():
     
     try:
         with st.spinner("🤖 Analyzing your spending patterns..."):
-            prediction_data = api_client._make_request("GET", "/ai/predict-spending")
+            prediction_data = cached_api.get_ai_result("predict-spending")
         
         if prediction_data and prediction_data.get("status") == "success":
             data = prediction_data.get("data", {})
@@ -105,7 +105,7 @@ def render_anomaly_detection():
     
     try:
         with st.spinner("🔍 Scanning for unusual transactions..."):
-            anomaly_data = api_client._make_request("GET", "/ai/detect-anomalies")
+            anomaly_data = cached_api.get_ai_result("detect-anomalies")
         
         if anomaly_data and anomaly_data.get("status") == "success":
             data = anomaly_data.get("data", {})
@@ -168,7 +168,7 @@ def render_financial_insights():
     
     try:
         with st.spinner("💡 Generating personalized insights..."):
-            insights_data = api_client._make_request("GET", "/ai/financial-insights")
+            insights_data = cached_api.get_ai_result("financial-insights")
         
         if insights_data and insights_data.get("status") == "success":
             data = insights_data.get("data", {})
@@ -237,7 +237,7 @@ def render_smart_categorization():
     st.header("🎯 Smart Transaction Categorization")
     
     try:
-        model_status = api_client._make_request("GET", "/ai/model-status")
+        model_status = cached_api.get_ai_result("model-status")
         
         if model_status and model_status.get("status") == "success":
             status_data = model_status.get("data", {})
@@ -250,6 +250,20 @@ def render_smart_categorization():
         st.error(f"❌ Error: {str(e)}")
         render_categorization_ui({})
 
+def wait_for_training_job(job, timeout=120, interval=1.0):
+    """Poll background training job sambil menampilkan progress"""
+    import time
+    
+    progress_bar = st.progress(0.0, text=job.get("message") or "Waiting for worker")
+    deadline = time.time() + timeout
+    
+    while job and job.get("status") in ["queued", "running"] and time.time() < deadline:
+        time.sleep(interval)
+        job = cached_api.get_training_job(job["id"]) or job
+        progress_bar.progress(min(float(job.get("progress") or 0), 1.0), text=job.get("message") or "")
+    
+    return job
+
 def render_categorization_ui(status_data):
     """Render categorization UI dengan atau tanpa model status"""
     col1, col2 = st.columns([2, 1])
@@ -277,13 +291,18 @@ def render_categorization_ui(status_data):
         # Training button
         if status_data.get("training_ready"):
             if st.button("🔄 Train/Retrain Category Model", type="primary"):
-                with st.spinner("Training AI model..."):
-                    result = api_client._make_request("POST", "/ai/train-category-model")
-                    if result and result.get("status") == "success":
+                result = api_client._make_request("POST", "/ai/train-category-model")
+                if result and result.get("status") == "accepted":
+                    job = wait_for_training_job(result["data"])
+                    if job and job.get("status") == "succeeded":
                         st.success("✅ Model trained successfully!")
                         st.rerun()
+                    elif job and job.get("status") in ["queued", "running"]:
+                        st.info("⏳ Training is still running in the background. Check back later.")
                     else:
-                        st.error("❌ Training failed")
+                        st.error(f"❌ Training failed: {(job or {}).get('error') or 'unknown error'}")
+                else:
+                    st.error("❌ Training failed")
         else:
             st.info("ℹ️ Need at least 10 categorized transactions to train model")
         
@@ -300,7 +319,7 @@ def render_categorization_ui(status_data):
         
         if test_description:
             with st.spinner("Analyzing..."):
-                result = api_client.ai_categorize(test_description, test_amount)
+                result = cached_api.ai_categorize(test_description, test_amount)
                 
             if result:
                 st.write("**Prediction Results:**")
@@ -405,7 +424,7 @@ def show_fallback_insights():
 
 def create_spending_trend_chart():
     """Create spending trend chart"""
-    trend_data = api_client.get_monthly_trend(months=6)
+    trend_data = (cached_api.get_dashboard() or {}).get("trend")
     
     if trend_data and trend_data.get("trend"):
         df = pd.DataFrame(trend_data["trend"])
@@ -434,7 +453,7 @@ def create_spending_trend_chart():
 
 def create_category_chart():
     """Create spending by category chart"""
-    category_data = api_client.get_category_breakdown()
+    category_data = (cached_api.get_dashboard() or {}).get("categories")
     
     if category_data and category_data.get("breakdown"):
         df = pd.DataFrame(category_data["breakdown"])
@@ -1,31 +1,56 @@
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, List
 import logging
 
+from config.config import API_CLIENT_CONFIG
+
 logger = logging.getLogger(__name__)
 
 class APIClient:
-    def __init__(self, base_url: str = "http://127.0.0.1:5000/api/v1"):
-        self.base_url = base_url
-        self.timeout = 10
+    def __init__(self, base_url: str = None, config: Dict = None):
+        self.config = {**API_CLIENT_CONFIG, **(config or {})}
+        self.base_url = base_url or self.config['base_url']
+        self.timeout = self.config['timeout']
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """Session dengan connection pool keep-alive dan retry + backoff untuk method idempotent"""
+        retry = Retry(
+            total=self.config['max_retries'],
+            backoff_factor=self.config['backoff_factor'],
+            status_forcelist=self.config['retry_statuses'],
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # Tanpa POST
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize'],
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
         """Generic method to make API requests"""
         url = f"{self.base_url}{endpoint}"
         
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
                 timeout=self.timeout,
                 **kwargs
             )
             
-            print(f"🔍 API Request: {method} {url} -> Status: {response.status_code}")
+            logger.debug(f"API Request: {method} {url} -> Status: {response.status_code}")
             
             # ✅ FIX: Handle 201 (Created) sebagai success juga
-            if response.status_code in [200, 201]:  # 200 OK dan 201 Created
+            if response.status_code in [200, 201, 202]:  # 200 OK, 201 Created, 202 Accepted (background job)
                 return response.json()
             else:
                 st.error(f"API Error: {response.status_code} - {response.text}")
@@ -52,6 +77,18 @@ class APIClient:
         result = self._make_request("GET", "/transactions/", params=params)
         return result.get("data") if result else None
     
+    def get_transaction_page(self, params: Dict = None) -> Optional[Dict]:
+        """
+        Satu halaman GET /transactions/ (data, next_cursor, filters, sort, totals jika include_totals).
+        params: filter (type, category, start_date, end_date, search, min_amount, max_amount), sort, limit, cursor
+        """
+        return self._make_request("GET", "/transactions/", params=params or {})
+    
+    def get_transaction_totals(self, filters: Dict = None) -> Optional[Dict]:
+        """Count + total income/expense atas semua transaksi yang cocok dengan filter"""
+        result = self.get_transaction_page({**(filters or {}), "limit": 1, "include_totals": "true"})
+        return result.get("totals") if result else None
+    
     def create_transaction(self, transaction_data: Dict) -> Optional[Dict]:
         """Create a new transaction"""
         result = self._make_request(
@@ -83,6 +120,19 @@ class APIClient:
         )
         return result.get("data") if result else None
     
+    def get_dashboard(self, fields: List[str] = None, months: int = 6) -> Optional[Dict]:
+        """Summary, category breakdown dan trend dalam satu request"""
+        params = {"months": months}
+        if fields:
+            params["fields"] = ",".join(fields)
+        result = self._make_request("GET", "/dashboard/", params=params)
+        return result.get("data") if result else None
+    
+    def export_url(self, export_format: str = "csv", filters: Dict = None) -> str:
+        """URL /transactions/export, file di-stream API langsung ke browser (tidak lewat Streamlit)"""
+        params = {**(filters or {}), "format": export_format}
+        return requests.Request("GET", f"{self.base_url}/transactions/export", params=params).prepare().url
+    
     def ai_categorize(self, description: str, amount: float = 0) -> Optional[Dict]:
         """AI categorization for transaction"""
         result = self._make_request(
@@ -92,5 +142,15 @@ class APIClient:
         )
         return result.get("data") if result else None
 
-# Global API client instance
-api_client = APIClient()
\ No newline at end of file
+    def start_training_job(self, job_type: str) -> Optional[Dict]:
+        """Start background training job"""
+        result = self._make_request("POST", "/ai/jobs", json={"type": job_type})
+        return result.get("data") if result else None
+    
+    def get_training_job(self, job_id: str) -> Optional[Dict]:
+        """Get status dan progress training job"""
+        result = self._make_request("GET", f"/ai/jobs/{job_id}")
+        return result.get("data") if result else None
+
+# Global API client instance (session dan connection pool dipakai ulang antar Streamlit rerun)
+api_client = APIClient()
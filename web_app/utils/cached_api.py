@@ -0,0 +1,107 @@
+import streamlit as st
+from functools import wraps
+from typing import Optional, Dict
+import logging
+
+from config.config import WEB_CACHE_CONFIG
+from web_app.utils.api_client import api_client
+
+logger = logging.getLogger(__name__)
+
+class _NotCached(Exception):
+    """Request gagal: exception tidak di-cache st.cache_data, jadi rerun berikutnya coba lagi"""
+
+def _required(result):
+    if result is None:
+        raise _NotCached()
+    return result
+
+def _none_on_failure(cached):
+    """Bungkus fungsi st.cache_data: None untuk request gagal, .clear() tetap tersedia"""
+    @wraps(cached)
+    def wrapper(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except _NotCached:
+            return None
+    wrapper.clear = cached.clear
+    return wrapper
+
+# ==================== HEALTH ====================
+
+@st.cache_data(ttl=WEB_CACHE_CONFIG['health_ttl'], show_spinner=False)
+def health_check() -> bool:
+    """Status API, termasuk False (API mati tidak di-cek ulang tiap widget interaction)"""
+    return api_client.health_check()
+
+@st.cache_data(ttl=WEB_CACHE_CONFIG['health_ttl'], show_spinner=False)
+def ai_available() -> bool:
+    return api_client._make_request("GET", "/ai/test") is not None
+
+# ==================== TRANSACTIONS & ANALYTICS ====================
+
+@_none_on_failure
+@st.cache_data(ttl=WEB_CACHE_CONFIG['data_ttl'], show_spinner=False)
+def get_transaction_page(params: Dict = None) -> Optional[Dict]:
+    return _required(api_client.get_transaction_page(params))
+
+@_none_on_failure
+@st.cache_data(ttl=WEB_CACHE_CONFIG['data_ttl'], show_spinner=False)
+def get_transaction_totals(filters: Dict = None) -> Optional[Dict]:
+    """Satu cache entry per kombinasi filter, dipakai ulang saat pindah halaman"""
+    return _required(api_client.get_transaction_totals(filters))
+
+@_none_on_failure
+@st.cache_data(ttl=WEB_CACHE_CONFIG['data_ttl'], show_spinner=False)
+def get_dashboard(fields: tuple = None, months: int = 6) -> Optional[Dict]:
+    """Satu cache entry untuk sidebar, dashboard dan chart AI Insights (fields default semua)"""
+    return _required(api_client.get_dashboard(list(fields) if fields else None, months))
+
+# ==================== AI ====================
+
+@_none_on_failure
+@st.cache_data(ttl=WEB_CACHE_CONFIG['ai_ttl'], show_spinner=False)
+def get_ai_result(endpoint: str) -> Optional[Dict]:
+    """Full response GET /ai/<endpoint> (predict-spending, detect-anomalies, financial-insights, model-status)"""
+    return _required(api_client._make_request("GET", f"/ai/{endpoint}"))
+
+@_none_on_failure
+@st.cache_data(ttl=WEB_CACHE_CONFIG['ai_ttl'], show_spinner=False)
+def ai_categorize(description: str, amount: float = 0) -> Optional[Dict]:
+    return _required(api_client.ai_categorize(description, amount))
+
+# ==================== INVALIDATION ====================
+
+# Semua yang dihitung dari tabel transactions
+DATA_CACHES = [get_transaction_page, get_transaction_totals, get_dashboard, get_ai_result]
+# Semua yang bergantung pada model yang sedang aktif
+MODEL_CACHES = [get_ai_result, ai_categorize]
+
+def clear_data_caches():
+    for cached in DATA_CACHES:
+        cached.clear()
+
+def clear_model_caches():
+    for cached in MODEL_CACHES:
+        cached.clear()
+
+def create_transaction(transaction_data: Dict) -> Optional[Dict]:
+    """api_client.create_transaction + clear cache data yang sudah basi"""
+    result = api_client.create_transaction(transaction_data)
+    if result:
+        clear_data_caches()
+    return result
+
+def get_training_job(job_id: str) -> Optional[Dict]:
+    """
+    Poll training job (tidak di-cache); model baru aktif saat job succeeded.
+    Cache model di-clear sekali per job, bukan di tiap poll setelahnya.
+    """
+    job = api_client.get_training_job(job_id)
+    if job and job.get("status") == "succeeded":
+        handled = st.session_state.setdefault("handled_training_jobs", set())
+        if job_id not in handled:
+            handled.add(job_id)
+            logger.info(f"Training job {job_id} succeeded, clearing model caches")
+            clear_model_caches()
+    return job